@@ -0,0 +1,181 @@
+"""
+Online backups of the hackathon database to persistent storage.
+
+The working copy of the database lives on the container's local disk, which is
+wiped on every redeploy. Snapshots are copied with SQLite's online backup API in
+small page steps onto the persistent mount, a rotating set of them is kept, and
+the newest good one is restored when the database file is missing at startup.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from settings import env
+
+ARCHIVE_SUFFIX = ".archive.db"
+
+
+def configured_backup_dir() -> str:
+    """DB_BACKUP_DIR; empty disables backups and restores."""
+    return env("DB_BACKUP_DIR", "")
+
+
+def _stem(db_path: str) -> str:
+    return os.path.splitext(os.path.basename(db_path))[0]
+
+
+def list_snapshots(backup_dir: str, db_path: str) -> List[str]:
+    """Snapshot paths of `db_path` in `backup_dir`, newest first."""
+    if not backup_dir or not os.path.isdir(backup_dir):
+        return []
+    prefix = f"{_stem(db_path)}-"
+    names = [
+        name for name in os.listdir(backup_dir)
+        if name.startswith(prefix) and name.endswith(".db") and not name.endswith(ARCHIVE_SUFFIX)
+    ]
+    # Timestamps in the names sort chronologically
+    return [os.path.join(backup_dir, name) for name in sorted(names, reverse=True)]
+
+
+def archive_snapshot_path(snapshot_path: str) -> str:
+    """Path of the archive file saved alongside a snapshot."""
+    return snapshot_path[:-len(".db")] + ARCHIVE_SUFFIX
+
+
+def is_valid_snapshot(path: str) -> bool:
+    """Cheap structural check of a snapshot before trusting it for a restore."""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logging.warning(f"Snapshot {path} is unreadable: {e}")
+        return False
+
+
+def backup_file(source_path: str, dest_path: str, pages: Optional[int] = None,
+                sleep: Optional[float] = None) -> Dict:
+    """Copy a live database to `dest_path` with the online backup API.
+
+    The copy is taken from one read transaction on the source. In WAL mode
+    readers never block writers, and pinning the snapshot keeps concurrent
+    commits from restarting the backup between steps. The copy is written
+    next to the destination and renamed into place once complete, so a
+    crash never leaves a half-written snapshot behind. `pages` copied per step
+    and the `sleep` between steps default to DB_BACKUP_PAGES and DB_BACKUP_SLEEP.
+    """
+    pages = env("DB_BACKUP_PAGES", 256, int) if pages is None else pages
+    sleep = env("DB_BACKUP_SLEEP", 0.005, float) if sleep is None else sleep
+    start = time.perf_counter()
+    partial_path = f"{dest_path}.partial"
+    steps = 0
+
+    def progress(status, remaining, total):
+        nonlocal steps
+        steps += 1
+
+    source = sqlite3.connect(source_path, isolation_level=None)
+    dest = sqlite3.connect(partial_path)
+    try:
+        source.execute("BEGIN")
+        source.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()  # start the read snapshot
+        source.backup(dest, pages=pages, progress=progress, sleep=sleep)
+        source.execute("COMMIT")
+        page_count = dest.execute("PRAGMA page_count").fetchone()[0]
+        page_size = dest.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        dest.close()
+        source.close()
+
+    os.replace(partial_path, dest_path)
+    return {
+        "path": dest_path,
+        "bytes": page_count * page_size,
+        "pages": page_count,
+        "steps": steps,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def create_snapshot(db_path: str, backup_dir: Optional[str] = None, archive_path: Optional[str] = None,
+                    keep: Optional[int] = None, pages: Optional[int] = None,
+                    sleep: Optional[float] = None) -> Dict:
+    """Snapshot the database (and its archive file) into `backup_dir` and keep the `keep` newest (DB_BACKUP_KEEP)."""
+    backup_dir = configured_backup_dir() if backup_dir is None else backup_dir
+    keep = env("DB_BACKUP_KEEP", 5, int) if keep is None else keep
+    if not backup_dir:
+        raise ValueError("No backup directory configured (set DB_BACKUP_DIR)")
+    os.makedirs(backup_dir, exist_ok=True)
+
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+    snapshot_path = os.path.join(backup_dir, f"{_stem(db_path)}-{timestamp}.db")
+
+    # Main goes first. Maintenance copies rows into the archive before deleting them from main, so
+    # the later archive snapshot holds every row the main snapshot no longer has. The other order
+    # loses rows archived between the two copies.
+    result = backup_file(db_path, snapshot_path, pages, sleep)
+    archive = None
+    if archive_path and os.path.exists(archive_path):
+        archive = backup_file(archive_path, archive_snapshot_path(snapshot_path), pages, sleep)
+
+    removed = []
+    for old_path in list_snapshots(backup_dir, db_path)[keep:]:
+        for path in (old_path, archive_snapshot_path(old_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        removed.append(old_path)
+
+    result["archive_bytes"] = archive["bytes"] if archive else 0
+    result["elapsed_seconds"] = round(result["elapsed_seconds"] + (archive["elapsed_seconds"] if archive else 0), 3)
+    result["rotated_out"] = removed
+    logging.info(
+        f"Backed up {db_path} to {snapshot_path}: {result['bytes'] / 1024:.0f} KiB in {result['steps']} steps, "
+        f"{result['elapsed_seconds']:.2f}s ({len(removed)} old snapshots removed)"
+    )
+    return result
+
+
+def _restore_copy(snapshot_path: str, dest_path: str) -> None:
+    """Copy a snapshot over to `dest_path` through the backup API, renaming into place."""
+    backup_file(snapshot_path, dest_path, pages=-1, sleep=0)
+    for suffix in ("-wal", "-shm"):
+        # A stale WAL from an earlier file would be replayed onto the restored pages
+        if os.path.exists(dest_path + suffix):
+            os.remove(dest_path + suffix)
+
+
+def restore_latest(db_path: str, backup_dir: Optional[str] = None,
+                   archive_path: Optional[str] = None) -> Optional[str]:
+    """Restore the newest valid snapshot when `db_path` does not exist yet.
+
+    Snapshots that fail the integrity check are skipped in favour of older
+    ones. Returns the snapshot restored from, or None when nothing was done.
+    """
+    backup_dir = configured_backup_dir() if backup_dir is None else backup_dir
+    if not backup_dir or os.path.exists(db_path):
+        return None
+
+    for snapshot_path in list_snapshots(backup_dir, db_path):
+        if not is_valid_snapshot(snapshot_path):
+            logging.warning(f"Skipping corrupt snapshot {snapshot_path}")
+            continue
+
+        start = time.perf_counter()
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        archive_snapshot = archive_snapshot_path(snapshot_path)
+        if archive_path and not os.path.exists(archive_path) and os.path.exists(archive_snapshot):
+            _restore_copy(archive_snapshot, archive_path)
+        _restore_copy(snapshot_path, db_path)
+
+        logging.info(f"Restored {db_path} from {snapshot_path} in {time.perf_counter() - start:.2f}s")
+        return snapshot_path
+
+    return None
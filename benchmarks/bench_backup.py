@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Backup benchmark - online snapshot time by database size, and write latency while it runs
+
+A writer thread keeps inserting through Database.add_hackathon; its latency is
+measured once with no backup running and once during a snapshot.
+
+Usage: python benchmarks/bench_backup.py [rows ...]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup import create_snapshot, restore_latest
+from database import Database
+from models import Hackathon
+
+DESCRIPTION = "Build something useful in 48 hours. Prizes, mentors and swag for every track. " * 6
+
+
+def measure_writes(db, run_for, start_at):
+    """Insert rows for `run_for` seconds; return per-insert latencies in ms."""
+    latencies = []
+    deadline = time.perf_counter() + run_for
+    i = start_at
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db.add_hackathon(f"Live write {i}", f"https://example.com/live/{i}", "", DESCRIPTION)
+        latencies.append((time.perf_counter() - start) * 1000)
+        i += 1
+        time.sleep(0.002)
+    return latencies
+
+
+def summarize(label, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if len(latencies) >= 100 else latencies[-1]
+    print(f"  {label:<26} n={len(latencies):5d}  p50 {statistics.median(latencies):6.2f} ms  "
+          f"p99 {p99:6.2f} ms  max {latencies[-1]:6.2f} ms")
+
+
+def bench_size(rows, pages=256, sleep=0.005):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "live", "hackathons.db")
+        backup_dir = os.path.join(tmp, "backups")
+        os.makedirs(os.path.dirname(db_path))
+        db = Database(db_path, dedup_filter=False, near_dup_threshold=0)
+        db.add_hackathons(
+            Hackathon(f"Hackathon {i}", f"https://example.com/{i}", description=DESCRIPTION)
+            for i in range(rows)
+        )
+        db.get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_mb = os.path.getsize(db_path) / 1024 / 1024
+        print(f"Backup benchmark ({rows} rows, {size_mb:.1f} MB, {pages} pages/step)")
+
+        baseline = measure_writes(db, 1.0, 0)
+
+        result = {}
+        backup_thread = threading.Thread(
+            target=lambda: result.update(create_snapshot(db_path, backup_dir, db.archive_path, pages=pages, sleep=sleep))
+        )
+        during = []
+        backup_thread.start()
+        while backup_thread.is_alive():
+            during.extend(measure_writes(db, 0.2, 1_000_000 + len(during)))
+        backup_thread.join()
+
+        print(f"  snapshot                   {result['elapsed_seconds']:6.2f} s  ({result['steps']} steps, "
+              f"{size_mb / result['elapsed_seconds']:.0f} MB/s)")
+        summarize("writes, no backup", baseline)
+        summarize("writes during backup", during)
+
+        db.close()
+        os.remove(db_path)
+        start = time.perf_counter()
+        assert restore_latest(db_path, backup_dir, db.archive_path)
+        print(f"  restore                    {time.perf_counter() - start:6.2f} s")
+        restored = Database(db_path, dedup_filter=False, near_dup_threshold=0)
+        assert restored.get_stats()['total_hackathons'] >= rows
+        assert restored.check_counters()
+        restored.close()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000]
+    for size in sizes:
+        bench_size(size)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Conditional GET benchmark - repeat scrapes of unchanged listing pages
+
+Every registered source scrapes its page from local mock sites
+(benchmarks/mock_sites.py) that answer If-None-Match / If-Modified-Since with
+304. The first run downloads and parses everything and stores validators and
+results in the database. The second run finds nothing changed. The third
+changes one page; the fourth uses a changed parser for one source, whose
+cached result must not be reused.
+
+Usage: python benchmarks/bench_conditional_get.py [listings_per_page]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from mock_sites import MockSites, listing_page
+from sources import SOURCES, FetchStats, make_session, run_sources
+
+# Real listing pages carry far more markup than listings (scripts, styles, navigation)
+PADDING = "<script>" + "var x = 1; " * 20000 + "</script>"
+
+
+def page(name, items, extra=""):
+    return listing_page(name, items).replace("<main>", f"<main>{extra}") + PADDING
+
+
+def scrape(sites, db, sources=None):
+    session, stats = make_session(), FetchStats()
+    instances = [cls(session, urls=[sites.url(f"/{name}")], validators=db, stats=stats)
+                 for name, cls in (sources or SOURCES).items()]
+    sites.reset_counters()
+    report = asyncio.run(run_sources(instances))
+    print(f"    {stats.summary()}")
+    print(f"    server: {sites.requests} requests, {sites.not_modified} answered 304, "
+          f"{sites.bytes_sent / 1024:.0f} KiB of bodies sent")
+    return report, stats
+
+
+def main(items=200):
+    sites = MockSites({f"/{name}": (page(name, items), 0.0) for name in SOURCES}).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "conditional.db"), dedup_filter=False, near_dup_threshold=0)
+        print(f"Conditional GET benchmark ({len(SOURCES)} sources, {items} listings per page)")
+
+        print("  cold run")
+        cold, stats = scrape(sites, db)
+        assert stats.not_modified == 0 and stats.pages == len(SOURCES)
+
+        print("  nothing changed")
+        warm, stats = scrape(sites, db)
+        assert stats.not_modified == len(SOURCES) and sites.bytes_sent == 0
+        assert warm.counts() == cold.counts()
+        assert sorted(h.url for h in warm.hackathons) == sorted(h.url for h in cold.hackathons)
+        assert {h.url: h for h in warm.hackathons} == {h.url: h for h in cold.hackathons}
+
+        print("  one page changed")
+        sites.set_page("/mlh", page("mlh", items, '<div class="event"><a href="/new"><h3>Brand New Hackathon</h3></a></div>'))
+        changed, stats = scrape(sites, db)
+        assert stats.not_modified == len(SOURCES) - 1
+        assert any(h.title == "Brand New Hackathon" for h in changed.hackathons)
+
+        print("  one parser changed")
+
+        class ShorterDevPost(SOURCES["devpost"]):
+            max_items = 4
+
+        reparsed, stats = scrape(sites, db, {**SOURCES, "devpost": ShorterDevPost})
+        assert stats.not_modified == len(SOURCES) - 1
+        assert reparsed.counts()["DevPost"] == 4
+
+        db.close()
+    sites.stop()
+    print("  OK: unchanged pages are neither downloaded nor parsed, and give the same result")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
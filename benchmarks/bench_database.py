@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Database benchmarks - pooled WAL connection vs. the old connect-per-call behaviour
+
+Usage: python benchmarks/bench_database.py [rows]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+import hashlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, DedupKeyFilter, dedup_key
+from models import Hackathon
+
+# The hackathons table as it was before the dedup_key migration
+LEGACY_SCHEMA = '''
+    CREATE TABLE hackathons (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        url TEXT NOT NULL UNIQUE,
+        date_info TEXT,
+        description TEXT,
+        hash TEXT UNIQUE NOT NULL,
+        posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_posted BOOLEAN DEFAULT FALSE
+    )
+'''
+
+
+def create_legacy_db(db_path, journal_mode="DELETE"):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        conn.execute(LEGACY_SCHEMA)
+
+
+def legacy_add_hackathon(db_path, title, url):
+    """Insert the way database.py used to: duplicate check and insert on fresh connections."""
+    hash_value = hashlib.md5(f"{title.strip().lower()}|{url.strip()}".encode()).hexdigest()
+    with sqlite3.connect(db_path) as conn:
+        if conn.execute("SELECT id FROM hackathons WHERE hash = ?", (hash_value,)).fetchone():
+            return False
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO hackathons (title, url, date_info, description, hash) VALUES (?, ?, ?, ?, ?)",
+            (title, url, "", "", hash_value)
+        )
+        conn.commit()
+    return True
+
+
+def legacy_is_duplicate(db_path, title, url):
+    hash_value = hashlib.md5(f"{title.strip().lower()}|{url.strip()}".encode()).hexdigest()
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT id FROM hackathons WHERE hash = ?", (hash_value,)).fetchone() is not None
+
+
+def make_rows(count, prefix="Hackathon"):
+    return [(f"{prefix} {i} 2025", f"https://example.com/{prefix.lower()}/{i}") for i in range(count)]
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float("inf")
+    print(f"  {label:<28} {elapsed:8.3f}s  {rate:10.0f} ops/sec")
+    return rate
+
+
+def bench_connections(rows=2000):
+    """Compare inserts/sec and lookups/sec for per-call connects and the pooled connection."""
+    print(f"Connection benchmark ({rows} inserts, {rows} lookups)")
+    rows_data = make_rows(rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Legacy: default rollback journal, new connection per call
+        legacy_path = os.path.join(tmp, "legacy.db")
+        create_legacy_db(legacy_path)
+        legacy_insert = timed("legacy inserts", rows, lambda: [legacy_add_hackathon(legacy_path, t, u) for t, u in rows_data])
+        legacy_lookup = timed("legacy lookups", rows, lambda: [legacy_is_duplicate(legacy_path, t, u) for t, u in rows_data])
+
+        # Pooled: one WAL connection with tuned pragmas
+        db = Database(os.path.join(tmp, "pooled.db"), near_dup_threshold=0)
+        pooled_insert = timed("pooled inserts", rows, lambda: [db.add_hackathon(t, u) for t, u in rows_data])
+        pooled_lookup = timed("pooled lookups", rows, lambda: [db.is_duplicate(t, u) for t, u in rows_data])
+        db.close()
+
+    print(f"  insert speedup: {pooled_insert / legacy_insert:.1f}x, lookup speedup: {pooled_lookup / legacy_lookup:.1f}x")
+
+
+def bench_dedup_filter(rows=300000, probes=50000):
+    """Size the in-memory dedup filter and compare its lookups with SQL lookups."""
+    print(f"Dedup filter benchmark ({rows} stored hashes, {probes} probes)")
+    keys = [dedup_key(f"Hackathon {i}", f"https://example.com/{i}") for i in range(rows)]
+    hex_hashes = [hashlib.md5(f"hackathon-{i}".encode()).hexdigest() for i in range(rows)]
+
+    start = time.perf_counter()
+    dedup = DedupKeyFilter(keys)
+    print(f"  warm-up                      {time.perf_counter() - start:8.3f}s")
+
+    set_bytes = sys.getsizeof(set(hex_hashes)) + sum(sys.getsizeof(h) for h in hex_hashes)
+    stats = dedup.stats()
+    print(f"  filter memory                {stats['memory_bytes'] / 1024 / 1024:8.2f} MB ({stats['bytes_per_entry']} B/entry)")
+    print(f"  set-of-hex-strings memory    {set_bytes / 1024 / 1024:8.2f} MB")
+
+    known = keys[:probes // 2]
+    unknown = [dedup_key(f"Unseen {i}", f"https://example.com/unseen/{i}") for i in range(probes // 2)]
+    timed("filter lookups", probes, lambda: [k in dedup for k in known + unknown])
+    print(f"  hit rate {dedup.stats()['hit_rate']:.2%} (expected 50%)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "filter.db"), dedup_filter=False)
+        with db.get_connection() as conn:
+            conn.executemany(
+                "INSERT INTO hackathons (title, url, dedup_key) VALUES (?, ?, ?)",
+                ((f"Hackathon {i}", f"https://example.com/{i}", k) for i, k in enumerate(keys))
+            )
+        with db.get_connection() as conn:
+            timed("sql lookups", probes, lambda: [
+                conn.execute("SELECT id FROM hackathons WHERE dedup_key = ?", (k,)).fetchone() for k in known + unknown
+            ])
+        db.close()
+
+
+def bench_dedup_key(rows=200000, batch=1000):
+    """Compare file size and insert throughput of md5-hex + UNIQUE url against the 64-bit key."""
+    print(f"Dedup key benchmark ({rows} rows, batches of {batch})")
+    data = [(f"Hackathon {i} 2025", f"https://devpost.com/hackathons/hackathon-{i}-2025") for i in range(rows)]
+
+    legacy_rows = [(t, u, hashlib.md5(f"{t.strip().lower()}|{u.strip()}".encode()).hexdigest()) for t, u in data]
+    keyed_rows = [(t, u, dedup_key(t, u)) for t, u in data]
+
+    def insert_batches(conn, sql, rows_data):
+        for start in range(0, rows, batch):
+            with conn:
+                conn.executemany(sql, rows_data[start:start + batch])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        create_legacy_db(legacy_path, journal_mode="WAL")
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        timed("md5 hex + UNIQUE url", rows, lambda: insert_batches(
+            conn, "INSERT OR IGNORE INTO hackathons (title, url, hash) VALUES (?, ?, ?)", legacy_rows
+        ))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+
+        db = Database(os.path.join(tmp, "keyed.db"), dedup_filter=False, near_dup_threshold=0)
+        conn = db.get_connection()
+        # Measure the key alone: no counter, full-text or outbox trigger fires in the timed loop
+        for (trigger,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'hackathons'"
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {trigger}")
+        timed("64-bit dedup_key", rows, lambda: insert_batches(
+            conn, "INSERT OR IGNORE INTO hackathons (title, url, dedup_key) VALUES (?, ?, ?)", keyed_rows
+        ))
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        legacy_size = os.path.getsize(legacy_path)
+        keyed_size = os.path.getsize(db.db_path)
+        print(f"  file size: {legacy_size / 1024 / 1024:.1f} MB -> {keyed_size / 1024 / 1024:.1f} MB "
+              f"({1 - keyed_size / legacy_size:.0%} smaller)")
+        db.close()
+
+
+def legacy_get_stats(conn):
+    total = conn.execute("SELECT COUNT(*) FROM hackathons").fetchone()[0]
+    posted = conn.execute("SELECT COUNT(*) FROM hackathons WHERE is_posted = TRUE").fetchone()[0]
+    return total, posted
+
+
+def bench_stats(rows=150000, calls=200):
+    """Compare counter-backed get_stats with the old COUNT(*) scans."""
+    print(f"Stats benchmark ({rows} rows, {calls} calls)")
+    sources = ["DevPost", "Unstop", "Devfolio", "MLH", "HackerEarth"]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "stats.db"), dedup_filter=False, near_dup_threshold=0)
+        timed("insert with counter triggers", rows, lambda: db.add_hackathons(
+            Hackathon(t, u, source=sources[i % len(sources)]) for i, (t, u) in enumerate(make_rows(rows))
+        ))
+        db.mark_many_as_posted(range(1, rows // 3))
+
+        conn = db.get_connection()
+        legacy = timed("legacy COUNT(*) stats", calls, lambda: [legacy_get_stats(conn) for _ in range(calls)])
+        counters = timed("counter get_stats", calls, lambda: [db.get_stats() for _ in range(calls)])
+        print(f"  speedup: {counters / legacy:.0f}x")
+
+        stats = db.get_stats()
+        assert (stats['total_hackathons'], stats['posted_hackathons']) == legacy_get_stats(conn)
+        start = time.perf_counter()
+        assert db.check_counters()
+        print(f"  consistency check            {time.perf_counter() - start:8.3f}s")
+        db.close()
+
+
+def bench_maintenance(rows=50000, expired_share=0.6):
+    """Archive a share of old rows and report what a maintenance pass reclaims."""
+    print(f"Maintenance benchmark ({rows} rows, {expired_share:.0%} past retention)")
+    expired = int(rows * expired_share)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "maintenance.db"), dedup_filter=False, near_dup_threshold=0)
+        db.add_hackathons(
+            Hackathon(t, u, description="Prize pool, tracks and rules. " * 20) for t, u in make_rows(rows)
+        )
+        db.mark_many_as_posted((i, "2020-01-01 00:00:00") for i in range(1, expired + 1))
+        for _ in range(1000):
+            db.log_scraping_session(50, 5)
+        with db.get_connection() as conn:
+            conn.execute("UPDATE scraping_log SET scraped_at = '2020-01-01 00:00:00' WHERE id <= 900")
+
+        # Unposted rows expire once their event is over; created_at only decides for rows with no date
+        with db.get_connection() as conn:
+            conn.executemany("UPDATE hackathons SET ends_at = ?, deadline = ?, created_at = ? WHERE id = ?", [
+                ("2020-03-01", None, "2030-01-01 00:00:00", expired + 1),  # ended, recently scraped
+                (None, "2020-02-01", "2030-01-01 00:00:00", expired + 2),  # deadline passed
+                ("2999-01-01", "2020-02-01", "2020-01-01 00:00:00", expired + 3),  # long queued, not over yet
+                (None, None, "2020-01-01 00:00:00", expired + 4),  # no date, past UNPOSTED_RETENTION_DAYS
+            ])
+
+        result = db.run_maintenance()
+        print(f"  archived {result['archived_posted']} posted rows and {result['archived_expired']} expired "
+              f"unposted ones, deleted {result['log_rows_deleted']} log rows")
+        print(f"  main file {result['file_bytes_before'] / 1024 / 1024:.1f} MB -> "
+              f"{result['file_bytes_after'] / 1024 / 1024:.1f} MB "
+              f"(reclaimed {result['reclaimed_bytes'] / 1024 / 1024:.1f} MB, archive {result['archive_bytes'] / 1024 / 1024:.1f} MB)")
+        print(f"  pass took {result['elapsed_seconds']:.3f}s")
+        assert db.is_duplicate(*make_rows(1)[0]), "archived rows must still deduplicate"
+        assert result['archived_posted'] == expired and result['archived_expired'] == 3
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT 1 FROM hackathons WHERE id = ?", (expired + 3,)).fetchone()
+        assert db.check_counters()
+        db.close()
+
+
+def check_query_plans():
+    """EXPLAIN the queue and stats queries and fail unless they use the migration indexes."""
+    print("Query plan check")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "plans.db"))
+        checks = [
+            ("unposted queue",
+             "SELECT id, title, url, date_info, description FROM hackathons WHERE is_posted = FALSE ORDER BY id ASC",
+             "idx_hackathons_unposted"),
+            ("unposted keyset page",
+             "SELECT id, title, url, date_info, description FROM hackathons "
+             "WHERE is_posted = FALSE AND id > 0 ORDER BY id ASC LIMIT 100",
+             "idx_hackathons_unposted"),
+            ("recent sessions",
+             "SELECT scraped_at, hackathons_found, new_hackathons FROM scraping_log ORDER BY scraped_at DESC LIMIT 5",
+             "idx_scraping_log_scraped_at"),
+        ]
+        for label, query, index in checks:
+            plan = db.query_plan(query)
+            assert any(index in step for step in plan), f"{label} does not use {index}: {plan}"
+            print(f"  {label:<28} {'; '.join(plan)}")
+        db.close()
+
+
+if __name__ == "__main__":
+    check_query_plans()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    bench_connections(count)
+    bench_dedup_filter()
+    bench_dedup_key()
+    bench_stats()
+    bench_maintenance()
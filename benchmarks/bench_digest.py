@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Digest benchmark - one message per hackathon vs. digests packed under 4096 chars
+
+Drains the same backlog against the local mock Bot API both ways and counts
+the API calls. The limiter is opened up for that run, so the wall time
+shown for the API is the posting path alone. The time Telegram's limits add
+is then computed for the same call counts, on a virtual clock with the
+default limiter (20/min per chat after a burst of 5). For comparison, the old
+loop slept 2 s after every post.
+
+Usage: python benchmarks/bench_digest.py [backlog]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_rate_limiter import VirtualClock
+from database import Database
+from mock_bot_api import MockBotAPI
+from models import Hackathon
+from rate_limiter import TelegramRateLimiter
+from telegram_bot import MESSAGE_LIMIT, TelegramBot, telegram_length
+
+CHAT = "@hackathons"
+
+
+def make_backlog(count):
+    return [
+        Hackathon(
+            title=f"Global AI_Hack {i}: build *agents* for climate",
+            url=f"https://devpost.com/hackathons/global-ai-hack-{i}",
+            date_info="September 15, 2025",
+            description="Build something useful in 48 hours with mentors and prizes.",
+            source="DevPost",
+            organization="Google Developer Groups",
+            deadline="2025-09-15",
+            prize="$10,000 in prizes",
+        )
+        for i in range(count)
+    ]
+
+
+def paced_seconds(calls):
+    """How long the default limiter spaces `calls` sends to one chat."""
+    clock = VirtualClock()
+    limiter = TelegramRateLimiter(clock=clock, sleep=clock.sleep)
+
+    async def send_all():
+        for _ in range(calls):
+            await limiter.acquire(CHAT)
+
+    asyncio.run(clock.run(send_all()))
+    return clock.now
+
+
+def run(tmp, backlog, digest):
+    api = MockBotAPI(latency=0.04).start()
+    db = Database(os.path.join(tmp, f"digest-{digest}.db"), dedup_filter=False, near_dup_threshold=0)
+    db.add_hackathons(make_backlog(backlog))
+    limiter = TelegramRateLimiter(global_rate=1000, chat_rate_per_minute=60000, chat_burst=1)
+    bot = TelegramBot("123:TOKEN", CHAT, db, rate_limiter=limiter, base_url=api.api_url)
+
+    start = time.perf_counter()
+    result = asyncio.run(bot.post_hackathons(max_posts=backlog, digest=digest))
+    elapsed = time.perf_counter() - start
+
+    calls = len(api.messages)
+    assert result["posted"] == backlog and db.get_stats()["posted_hackathons"] == backlog
+    assert calls == result["by_chat"][CHAT]["messages"]
+    assert all(telegram_length(text) <= MESSAGE_LIMIT for _, text, _ in api.messages)
+    bot.adb.close()
+    db.close()
+    api.stop()
+    return calls, elapsed
+
+
+def main(backlog=40):
+    print(f"Digest benchmark ({backlog} pending hackathons, one chat)")
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = {}
+        for label, digest in (("one per hackathon", False), ("digest", True)):
+            calls, elapsed = run(tmp, backlog, digest)
+            rows[label] = calls
+            print(f"  {label:<18} {calls:3d} API calls  {elapsed:6.2f}s against the mock  "
+                  f"{paced_seconds(calls):7.1f}s with default pacing")
+        print(f"  old loop (2 s sleep per post): {backlog} API calls, {2 * (backlog - 1):.0f}s of sleeps")
+        single, digest = rows["one per hackathon"], rows["digest"]
+        print(f"  saved {single - digest} API calls ({1 - digest / single:.0%})")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.ERROR)
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Fan-out benchmark - posting to several chats one after another vs. concurrently
+
+Runs TelegramBot against a local mock Bot API (benchmarks/mock_bot_api.py)
+with every chat's outbox filled. The rate limiter is opened up so the numbers
+show the posting path itself; with Telegram's real 20/min per chat, fan-out
+keeps every chat at its own limit instead of dividing one limit among them.
+A second run adds a slow chat and one that rejects every message, and reports
+when each chat finished.
+
+Usage: python benchmarks/bench_fanout.py [messages_per_chat] [chats]
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from mock_bot_api import MockBotAPI
+from models import Hackathon
+from rate_limiter import TelegramRateLimiter
+from telegram_bot import TelegramBot
+
+LATENCY = 0.04  # seconds per sendMessage, roughly a round trip to api.telegram.org
+
+
+def make_bot(tmp, name, chats, api, count):
+    db = Database(os.path.join(tmp, f"{name}.db"), dedup_filter=False, near_dup_threshold=0)
+    db.add_hackathons(Hackathon(f"Hackathon {i}", f"https://example.com/{name}/{i}", source="DevPost")
+                      for i in range(count))
+    limiter = TelegramRateLimiter(global_rate=1000, chat_rate_per_minute=60000, chat_burst=1)
+    return TelegramBot("123:TOKEN", ",".join(chats), db, rate_limiter=limiter, base_url=api.api_url)
+
+
+def finish_times(api, start):
+    finished = {}
+    for chat_id, _, accepted_at in api.messages:
+        finished[chat_id] = max(finished.get(chat_id, 0), accepted_at - start)
+    return finished
+
+
+async def sequential(bot, count):
+    """The old shape: one chat at a time."""
+    await bot.adb.sync_channels(bot.channel_ids)
+    for chat_id in bot.channel_ids:
+        await bot._post_to_chat(chat_id, count, 10)
+
+
+def bench_throughput(tmp, count, chat_count):
+    chats = [f"@topic_{i}" for i in range(chat_count)]
+    print(f"Fan-out benchmark ({chat_count} chats x {count} messages, {LATENCY * 1000:.0f} ms per API call)")
+    for label, concurrent in (("one chat at a time", False), ("concurrent fan-out", True)):
+        api = MockBotAPI(latency=LATENCY).start()
+        bot = make_bot(tmp, f"throughput-{concurrent}", chats, api, count)
+        start = time.perf_counter()
+        asyncio.run(bot.post_hackathons(max_posts=count, digest=False) if concurrent else sequential(bot, count))
+        elapsed = time.perf_counter() - start
+        sent = len(api.messages)
+        print(f"  {label:<20} {elapsed:6.2f}s  {sent / elapsed:6.1f} msg/s  "
+              f"({sent} sent, {api.connections} connections)")
+        assert sent == count * chat_count
+        assert bot.db.get_stats()["posted_hackathons"] == count
+        bot.adb.close()
+        bot.db.close()
+        api.stop()
+
+
+def bench_isolation(tmp, count):
+    chats = ["@healthy_1", "@healthy_2", "@slow", "@broken"]
+    print(f"Fault isolation ({count} messages per chat; @slow answers in 300 ms, @broken rejects everything)")
+    api = MockBotAPI(latency=LATENCY, chat_latency={"@slow": 0.3}, failing_chats={"@broken"}).start()
+    bot = make_bot(tmp, "isolation", chats, api, count)
+    start = time.perf_counter()
+    result = asyncio.run(bot.post_hackathons(max_posts=count, digest=False))
+    elapsed = time.perf_counter() - start
+    finished = finish_times(api, start)
+    for chat_id in chats:
+        outcome = result["by_chat"][chat_id]
+        done = f"last message at {finished[chat_id]:5.2f}s" if chat_id in finished else "nothing accepted"
+        print(f"  {chat_id:<11} posted {outcome['posted']:3d}  failed {outcome['failed']:3d}  {done}")
+    print(f"  run finished at {elapsed:.2f}s (@broken retries with backoff); "
+          f"outbox: {bot.db.get_outbox_stats(by_chat=True)['@broken']}")
+    assert finished["@healthy_1"] < 1.0 and finished["@healthy_2"] < 1.0
+    bot.adb.close()
+    bot.db.close()
+    api.stop()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.ERROR)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    chat_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_throughput(tmp, count, chat_count)
+        bench_isolation(tmp, 5)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Response cache benchmark - back-to-back scrapes through http_cache.py
+
+Every registered source scrapes its page from local mock sites
+(benchmarks/mock_sites.py) that answer slowly, through a CachedSession and
+with conditional GETs on, as the scrapers run. The first run fills the cache.
+A run straight after it (start-up run, then the first scheduled one) must not
+reach the sites at all, nor parse pages whose result is already stored. A run
+with one source's selectors changed re-parses its page from the cache. Then
+the clock moves past HTTP_CACHE_TTL but not MLH's own TTL, and finally a small
+byte budget forces LRU evictions.
+
+Usage: python benchmarks/bench_http_cache.py [listings_per_page] [delay_seconds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from http_cache import ResponseCache
+from mock_sites import MockSites, listing_page
+from sources import SOURCES, FetchStats, make_session, run_sources
+
+# Real listing pages carry far more markup than listings (scripts, styles, navigation)
+PADDING = "<script>" + "var x = 1; " * 20000 + "</script>"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def scrape(sites, db, cache, sources=None):
+    session, stats = make_session(cache), FetchStats()
+    instances = [cls(session, urls=[sites.url(f"/{name}")], validators=db, stats=stats)
+                 for name, cls in (sources or SOURCES).items()]
+    sites.reset_counters()
+    start = time.perf_counter()
+    report = asyncio.run(run_sources(instances))
+    elapsed = time.perf_counter() - start
+    print(f"    {elapsed * 1000:7.1f} ms  {stats.summary()}")
+    print(f"               server: {sites.requests} requests, {sites.bytes_sent / 1024:.0f} KiB of bodies sent; "
+          f"cache: {cache.summary()}")
+    return report, stats, elapsed
+
+
+def main(items=200, delay=0.3):
+    sites = MockSites({f"/{name}": (listing_page(name, items) + PADDING, delay) for name in SOURCES}).start()
+    count = len(SOURCES)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "validators.db"), dedup_filter=False, near_dup_threshold=0)
+        clock = FakeClock()
+        cache = ResponseCache(os.path.join(tmp, "http_cache.db"), default_ttl=900, clock=clock)
+        print(f"Response cache benchmark ({count} sources, {items} listings per page, {delay * 1000:.0f} ms per page)")
+
+        print("  cold run")
+        cold, stats, cold_elapsed = scrape(sites, db, cache)
+        assert sites.requests == count and cache.stores == count and cache.hits == 0
+
+        print("  back-to-back run")
+        warm, stats, warm_elapsed = scrape(sites, db, cache)
+        assert sites.requests == 0 and stats.cache_hits == count and stats.not_modified == count
+        assert {h.url: h for h in warm.hackathons} == {h.url: h for h in cold.hackathons}
+
+        print("  one source's selectors changed")
+
+        class ShorterDevPost(SOURCES["devpost"]):
+            max_items = 4
+
+        reparsed, stats, _ = scrape(sites, db, cache, {**SOURCES, "devpost": ShorterDevPost})
+        assert sites.requests == 0 and stats.cache_hits == count
+        assert stats.not_modified == count - 1 and reparsed.counts()["DevPost"] == 4
+
+        print("  HTTP_CACHE_TTL passed (MLH keeps its pages an hour)")
+        clock.now += 1000
+        expired_before = cache.expired
+        _, stats, _ = scrape(sites, db, cache)
+        assert cache.expired - expired_before == count - 1 and stats.cache_hits == 1
+        # DevPost's stored result came from the changed selectors, so its page is downloaded again
+        assert sites.requests == count - 1 and sites.not_modified == count - 2 and stats.not_modified == count - 1
+
+        print("  byte budget of three pages")
+        small = ResponseCache(os.path.join(tmp, "small_cache.db"), default_ttl=900, clock=clock)
+        scrape(sites, None, small)
+        small.max_bytes = small.stats()["bytes"] // count * 3
+        small.clear()
+        scrape(sites, None, small)
+        stats = small.stats()
+        assert stats["evictions"] >= count - 3 and stats["entries"] == count - stats["evictions"]
+        assert stats["bytes"] <= stats["max_bytes"]
+
+        print(f"  back-to-back run {cold_elapsed / warm_elapsed:.1f}x faster than cold "
+              f"({cold_elapsed * 1000:.0f} ms -> {warm_elapsed * 1000:.0f} ms)")
+        small.close()
+        cache.close()
+        db.close()
+    sites.stop()
+    print("  OK: fresh pages come from disk, stale ones are revalidated, the budget holds")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]), *(float(arg) for arg in sys.argv[2:3]))
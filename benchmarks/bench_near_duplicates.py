@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate benchmark - precision/recall and lookup latency of the LSH index
+
+Builds a synthetic corpus of distinct hackathon titles, then probes it with
+cross-source style variants (positives) and unseen titles (negatives).
+
+Usage: python benchmarks/bench_near_duplicates.py [corpus_size]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, dedup_key
+from models import Hackathon
+from near_duplicates import NearDuplicateIndex, brute_force_match
+
+PREFIXES = ["Global", "Smart", "Open", "Future", "Code", "Hack", "Build", "Green", "Quantum", "Cyber",
+            "Campus", "National", "Urban", "Deep", "Bright", "Rapid", "Nova", "Pixel", "Cloud", "Data"]
+THEMES = ["AI", "Climate", "FinTech", "HealthTech", "Web3", "EdTech", "Robotics", "Security", "IoT", "Space",
+          "AgriTech", "Mobility", "Gaming", "Open Source", "AR/VR", "Energy", "Water", "Retail", "Media", "Civic"]
+KINDS = ["Hackathon", "Challenge", "Buildathon", "Sprint", "Jam", "Summit Hack", "Innovation Challenge", "Hack Week"]
+PLACES = ["Delhi", "Bangalore", "Boston", "Berlin", "Lagos", "Tokyo", "Toronto", "Pune", "London", "Austin",
+          "Paris", "Seoul", "Nairobi", "Madrid", "Sydney", "Chennai", "Dublin", "Lisbon", "Denver", "Oslo"]
+
+
+def make_corpus(size, rng):
+    titles = set()
+    while len(titles) < size:
+        title = f"{rng.choice(PREFIXES)} {rng.choice(THEMES)} {rng.choice(KINDS)} {rng.choice(PLACES)} {rng.randint(1, 999)}"
+        titles.add(title)
+    return sorted(titles)
+
+
+def make_variant(title, rng):
+    """Perturb a title the way another listing site might show it."""
+    choice = rng.randrange(5)
+    if choice == 0:
+        return title.upper()
+    if choice == 1:
+        return f"The {title} (Online)"
+    if choice == 2:
+        return title.replace(" ", " - ", 1) + "!"
+    if choice == 3:
+        return f"{title} 2025"
+    return title + " Official Edition"
+
+
+def check_distinct_events(tmp):
+    """Yearly editions and other pages of the same site are kept; cross-site listings are merged."""
+    db = Database(os.path.join(tmp, "editions.db"), dedup_filter=False, near_dup_threshold=0.8)
+    first = db.add_hackathons([Hackathon("Smart India Hackathon 2025", "https://sih.gov.in/2025"),
+                               Hackathon("Google Solution Challenge 2025", "https://developers.google.com/sc/2025")])
+    next_year = db.add_hackathons([Hackathon("Smart India Hackathon 2026", "https://sih.gov.in/2026"),
+                                   Hackathon("Google Solution Challenge 2026", "https://developers.google.com/sc/2026")])
+    other_page = db.add_hackathons([Hackathon("Smart India Hackathon 2025!", "https://sih.gov.in/finale")])
+    other_dates = db.add_hackathons([Hackathon("Climate Code Sprint", "https://unstop.com/climate-sprint",
+                                               starts_at="2025-06-01"),
+                                     Hackathon("Climate Code Sprint", "https://devfolio.co/climate-sprint",
+                                               starts_at="2025-11-01")])
+    cross_site = db.add_hackathons([Hackathon("The Smart India Hackathon 2025 (Online)", "https://unstop.com/sih-2025")])
+    assert (len(first), len(next_year), len(other_page), len(other_dates), len(cross_site)) == (2, 2, 1, 2, 0)
+    db.close()
+
+
+def main(size=20000, probes=1000, seed=7):
+    rng = random.Random(seed)
+    corpus = make_corpus(size + probes, rng)
+    stored, unseen = corpus[:size], corpus[size:]
+    positives = [make_variant(title, rng) for title in rng.sample(stored, probes)]
+
+    index = NearDuplicateIndex()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "near_dup.db"), dedup_filter=False, near_dup_threshold=0)
+        conn = db.get_connection()
+
+        start = time.perf_counter()
+        signatures = []
+        with conn:
+            conn.executemany(
+                "INSERT INTO hackathons (title, url, dedup_key) VALUES (?, ?, ?)",
+                ((title, f"https://example.com/{i}", dedup_key(title, f"https://example.com/{i}"))
+                 for i, title in enumerate(stored))
+            )
+            for hackathon_id, title in conn.execute("SELECT id, title FROM hackathons").fetchall():
+                signature = index.signature(title)
+                index.add(conn, hackathon_id, signature)
+                signatures.append(signature)
+        print(f"Indexed {size} titles in {time.perf_counter() - start:.2f}s")
+
+        def run(queries, use_lsh):
+            found = 0
+            start = time.perf_counter()
+            for title in queries:
+                signature = index.signature(title)
+                if use_lsh:
+                    found += index.find_match(conn, signature) is not None
+                else:
+                    found += brute_force_match(signature, signatures, index.threshold)
+            return found, (time.perf_counter() - start) / len(queries) * 1000
+
+        true_pos, lsh_ms = run(positives, True)
+        false_pos, _ = run(unseen, True)
+        brute_found, brute_ms = run(positives[:100], False)
+
+        precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 1.0
+        recall = true_pos / len(positives)
+        print(f"  precision {precision:.3f}  recall {recall:.3f}  ({true_pos}/{len(positives)} variants, "
+              f"{false_pos}/{len(unseen)} false matches)")
+        print(f"  LSH lookup        {lsh_ms:8.3f} ms/query")
+        print(f"  brute force       {brute_ms:8.3f} ms/query ({brute_found}/100 found)")
+        print(f"  speedup           {brute_ms / lsh_ms:8.1f}x")
+        db.close()
+
+        check_distinct_events(tmp)
+        print("  OK: yearly editions, other pages of one site and other dates are not merged")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Adaptive pacing benchmark - fixed per-chat rate vs. AIMD on RetryAfter, on a virtual clock
+
+A mock Telegram enforces a hidden per-chat limit (a sliding 60 s window) and
+answers with RetryAfter when it is exceeded. A backlog is drained through
+TelegramRateLimiter the way TelegramBot.send_message does it, once with the
+rate fixed at the configured 20/min and once adapting. A second adaptive run
+starts from the rate the first one learned, as it would after a restart.
+
+Usage: python benchmarks/bench_pacer.py [messages]
+"""
+
+import asyncio
+import math
+import os
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_rate_limiter import VirtualClock
+from rate_limiter import TelegramRateLimiter
+
+CHAT = "@channel"
+
+
+class MockTelegram:
+    """Accepts at most `limit` messages per chat in any 60 s; otherwise returns the RetryAfter seconds."""
+
+    def __init__(self, clock, limit):
+        self.clock = clock
+        self.limit = limit
+        self.sent = deque()
+
+    def send(self):
+        now = self.clock()
+        while self.sent and now - self.sent[0] >= 60:
+            self.sent.popleft()
+        if len(self.sent) >= self.limit:
+            return math.ceil(60 - (now - self.sent[0]))
+        self.sent.append(now)
+        return None
+
+
+async def drain(clock, limiter, telegram, count):
+    retry_afters = 0
+    for _ in range(count):
+        while True:
+            await limiter.acquire(CHAT)
+            retry_after = telegram.send()
+            if retry_after is None:
+                limiter.on_success(CHAT)
+                break
+            retry_afters += 1
+            limiter.on_retry_after(CHAT, retry_after + 1)
+    return retry_afters
+
+
+def run(limit, count, adaptive, start_rate=None):
+    clock = VirtualClock()
+    options = {} if adaptive else {"rate_increase": 0, "rate_decrease": 1}
+    limiter = TelegramRateLimiter(clock=clock, sleep=clock.sleep, chat_rate_per_minute=20, chat_burst=5, **options)
+    if start_rate is not None:
+        limiter.set_chat_rate(CHAT, start_rate)
+    retry_afters, = asyncio.run(clock.run(drain(clock, limiter, MockTelegram(clock, limit), count)))
+    return clock.now, retry_afters, limiter.chat_rate_per_minute(CHAT)
+
+
+def main(count=300):
+    print(f"Adaptive pacing benchmark ({count} messages to one chat, configured rate 20/min)")
+    for limit in (12, 20, 45):
+        print(f"  Telegram accepts {limit}/min")
+        learned = None
+        for label, adaptive, start in (("fixed 20/min", False, None), ("AIMD", True, None),
+                                       ("AIMD, restarted", True, "learned")):
+            elapsed, retry_afters, rate = run(limit, count, adaptive, learned if start else None)
+            if adaptive and start is None:
+                learned = rate
+            print(f"    {label:<16} {elapsed / 60:6.1f} min  {count / elapsed * 60:5.1f} msg/min  "
+                  f"{retry_afters:4d} RetryAfter  final rate {rate:5.1f}/min")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
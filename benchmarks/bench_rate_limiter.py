@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Rate limiter check - token-bucket pacing vs. the old fixed-window loop, on a virtual clock
+
+Sends are mocked and time is simulated, so the run is instant and the send
+times are exact. Checks that the limiter keeps to the global budget (30/s, no
+burst) and the per-chat one (20/min after a burst of 5, so at most 5 + 20 in
+any minute), and compares total drain time with the old
+post_hackathons loop (a 30-per-minute window counter plus a 2 s sleep after
+every post, one counter per bot).
+
+Usage: python benchmarks/bench_rate_limiter.py
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import TelegramRateLimiter
+
+GLOBAL_RATE, GLOBAL_BURST = 30, 1  # per second
+CHAT_RATE, CHAT_BURST = 20, 5  # per minute
+
+
+class VirtualClock:
+    """Simulated time: sleep() parks the caller until run() advances the clock past its wake time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._order = itertools.count()
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + max(0.0, delay), next(self._order), future))
+        await future
+
+    async def run(self, *coros):
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        while not all(task.done() for task in tasks):
+            for _ in range(20):  # let every runnable task reach its next sleep
+                await asyncio.sleep(0)
+            if self._sleepers:
+                self.now, _, future = heapq.heappop(self._sleepers)
+                future.set_result(None)
+        return [task.result() for task in tasks]
+
+
+async def old_loop(clock, chat_id, count, sent):
+    """post_hackathons as it was: 30/minute window counter, then sleep(2) after each post."""
+    message_count, start_time = 0, clock()
+    for i in range(count):
+        if clock() - start_time >= 60:
+            message_count, start_time = 0, clock()
+        if message_count >= 30:
+            await clock.sleep(60 - (clock() - start_time))
+            message_count, start_time = 0, clock()
+        sent.append((clock(), chat_id))
+        message_count += 1
+        if i < count - 1:
+            await clock.sleep(2)
+
+
+async def new_loop(clock, limiter, chat_id, count, sent):
+    for _ in range(count):
+        await limiter.acquire(chat_id)
+        sent.append((clock(), chat_id))
+
+
+def max_in_window(times, window):
+    times = sorted(times)
+    best, start = 0, 0
+    for end, t in enumerate(times):
+        while t - times[start] >= window - 1e-9:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def simulate(chats, count, new):
+    clock = VirtualClock()
+    sent = []
+    if new:
+        limiter = TelegramRateLimiter(GLOBAL_RATE, GLOBAL_BURST, CHAT_RATE, CHAT_BURST, clock=clock, sleep=clock.sleep)
+        coros = [new_loop(clock, limiter, chat, count, sent) for chat in range(chats)]
+    else:
+        coros = [old_loop(clock, chat, count, sent) for chat in range(chats)]
+    asyncio.run(clock.run(*coros))
+    return sent
+
+
+def report(label, chats, count):
+    """Drain time and peak rates; the old loop's peaks above 30/s or 20/min would draw RetryAfter."""
+    print(f"{label} ({chats} chat{'s' if chats > 1 else ''} x {count} messages)")
+    for name, new in (("old loop", False), ("token bucket", True)):
+        sent = simulate(chats, count, new)
+        times = [t for t, _ in sent]
+        per_chat = max(max_in_window([t for t, c in sent if c == chat], 60) for chat in range(chats))
+        print(f"  {name:<13} done at {max(times):7.1f}s   peak {max_in_window(times, 1):2d}/s overall, "
+              f"{per_chat:2d}/min per chat")
+        if new:
+            assert max_in_window(times, 1) <= GLOBAL_RATE + GLOBAL_BURST - 1, "global budget exceeded"
+            assert per_chat <= CHAT_RATE + CHAT_BURST - 1, "per-chat budget exceeded"
+
+
+def check_exact_pacing():
+    """One chat: a burst of 5 (paced by the global 30/s), then exactly one message every 3 s."""
+    times = [t for t, _ in simulate(1, 11, True)]
+    expected = [k / 30 for k in range(5)] + [3.0 * k for k in range(1, 7)]
+    assert len(times) == len(expected) and all(abs(a - b) < 1e-9 for a, b in zip(times, expected)), times
+    # Many chats at once: one message every 1/30 s
+    times = sorted(t for t, _ in simulate(10, 5, True))
+    expected = [k / 30 for k in range(50)]
+    assert len(times) == len(expected) and all(abs(a - b) < 1e-9 for a, b in zip(times, expected)), times
+    print("Exact pacing: OK (per chat: burst of 5, then 3.000 s apart; across chats: 33.3 ms apart)\n")
+
+
+if __name__ == "__main__":
+    check_exact_pacing()
+    report("Scheduled run", 1, 5)
+    report("Backlog", 1, 60)
+    report("Fan-out", 5, 20)
+    report("Fan-out", 50, 20)
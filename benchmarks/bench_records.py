@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Record benchmark - slotted Hackathon records vs. per-row dicts
+
+Compares the memory held by 100k records, the cost of building them from
+SQLite rows (row factory vs. dict(zip(columns, row))) and field access.
+
+Usage: python benchmarks/bench_records.py [records]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import HACKATHON_COLUMNS, Hackathon, hackathon_row_factory
+
+
+def make_table(count):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE hackathons (id INTEGER PRIMARY KEY, title TEXT, url TEXT, date_info TEXT, "
+                 "description TEXT, source TEXT, organization TEXT, starts_at TEXT, ends_at TEXT, "
+                 "deadline TEXT, prize TEXT)")
+    conn.executemany(
+        "INSERT INTO hackathons (id, title, url, date_info, description, source, organization, starts_at, ends_at, "
+        "deadline, prize) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((i, f"Hackathon {i}", f"https://example.com/{i}", "March 1 - 3, 2025", "Live from DevPost.com", "DevPost",
+          "DevPost", "2025-03-01", "2025-03-03", "2025-02-25", "$10,000")
+         for i in range(1, count + 1))
+    )
+    return conn
+
+
+def load_dicts(conn):
+    cursor = conn.execute(f"SELECT {HACKATHON_COLUMNS} FROM hackathons")
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def load_records(conn):
+    cursor = conn.cursor()
+    cursor.row_factory = hackathon_row_factory
+    return cursor.execute(f"SELECT {HACKATHON_COLUMNS} FROM hackathons").fetchall()
+
+
+def measure_memory(loader, conn):
+    """Bytes still allocated by the loaded records (the rows' strings included)."""
+    tracemalloc.start()
+    records = loader(conn)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, current
+
+
+def best_of(func, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(count=100000):
+    print(f"Record benchmark ({count} records)")
+    conn = make_table(count)
+
+    dicts, dict_bytes = measure_memory(load_dicts, conn)
+    records, record_bytes = measure_memory(load_records, conn)
+    print(f"  dict memory         {dict_bytes / 1024 / 1024:8.1f} MB ({dict_bytes / count:.0f} B/record)")
+    print(f"  Hackathon memory    {record_bytes / 1024 / 1024:8.1f} MB ({record_bytes / count:.0f} B/record)")
+    print(f"  saved               {1 - record_bytes / dict_bytes:8.0%}")
+
+    dict_load = best_of(lambda: load_dicts(conn))
+    record_load = best_of(lambda: load_records(conn))
+    print(f"  load dicts          {dict_load:8.3f}s  {count / dict_load:10.0f} rows/s")
+    print(f"  load records        {record_load:8.3f}s  {count / record_load:10.0f} rows/s")
+
+    dict_access = best_of(lambda: [(d['title'], d['url'], d['date_info']) for d in dicts])
+    record_access = best_of(lambda: [(r.title, r.url, r.date_info) for r in records])
+    print(f"  dict access         {dict_access:8.3f}s")
+    print(f"  attribute access    {record_access:8.3f}s")
+
+    assert [Hackathon(**d) for d in dicts[:100]] == records[:100]
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Scrape engine benchmark - sources one after another vs. the concurrent engine
+
+Runs the DevPost, Devfolio and Unstop source plugins against local mock listing sites
+(benchmarks/mock_sites.py) with per-page delays. The sequential run is the old
+shape of live_scraper.main: each source in turn, each candidate URL in turn
+until one has results. DevPost's first candidate is slow and empty, and one
+extra source never answers inside its timeout. A last run sets a global
+deadline shorter than the slowest source to show a partial result.
+
+Usage: python benchmarks/bench_scrape_engine.py
+"""
+
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_sites import MockSites, listing_page
+from scrape_engine import ScrapeEngine
+from sources import DevPost, Devfolio, Unstop, make_session
+
+STALL_TIMEOUT = 3.0
+
+PAGES = {
+    "/devpost/hackathons": (listing_page("devpost", 0), 1.0),
+    "/devpost/open": (listing_page("devpost", 10), 1.5),
+    "/devpost/upcoming": (listing_page("devpost", 10), 1.2),
+    "/devfolio/hackathons": (listing_page("devfolio", 8), 2.0),
+    "/devfolio/discover": (listing_page("devfolio", 0), 0.5),
+    "/unstop/hackathons": (listing_page("unstop", 5), 1.5),
+    "/stalled": (listing_page("devpost", 3), 30.0),
+}
+
+
+class Stalled(DevPost):
+    label = "Stalled"
+    timeout = STALL_TIMEOUT
+
+
+def make_jobs(sites):
+    session = make_session()
+    sources = [
+        DevPost(session, urls=[sites.url(p) for p in ("/devpost/hackathons", "/devpost/open", "/devpost/upcoming")]),
+        Devfolio(session, urls=[sites.url(p) for p in ("/devfolio/hackathons", "/devfolio/discover")]),
+        # Enough results that the Selenium fallback stays out of the measurement
+        Unstop(session, urls=[sites.url("/unstop/hackathons")]),
+        Stalled(session, urls=[sites.url("/stalled")]),
+    ]
+    return [source.job() for source in sources]
+
+
+def sequential(jobs):
+    """Each source in turn, each candidate URL in turn until one has results."""
+    found = {}
+    for job in jobs:
+        found[job.name] = []
+        for url in job.urls:
+            try:
+                found[job.name] = job.fetch(url, job.timeout)
+            except Exception:
+                continue
+            if found[job.name]:
+                break
+    return found
+
+
+def main():
+    sites = MockSites(PAGES).start()
+    jobs = make_jobs(sites)
+    print(f"Scrape engine benchmark ({len(jobs)} sources, slowest answers in 2.0 s, "
+          f"one stalls past its {STALL_TIMEOUT:.0f} s timeout)")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        found = sequential(jobs)
+        sequential_elapsed = time.perf_counter() - start
+    counts = {name: len(hackathons) for name, hackathons in found.items()}
+    print(f"  {'one source at a time':<24} {sequential_elapsed:6.2f}s  {counts}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = asyncio.run(ScrapeEngine(max_concurrency=8, deadline=30).run(jobs))
+    print(f"  {'concurrent engine':<24} {report.elapsed:6.2f}s  {report.counts()}")
+    for result in report.sources.values():
+        note = f"  ({result.error})" if result.error else ""
+        print(f"    {result.name:<10} {result.elapsed:5.2f}s  from {result.url or '-'}{note}")
+    assert report.counts() == counts
+    assert report.sources["Stalled"].timed_out and not report.deadline_hit
+    assert report.elapsed < STALL_TIMEOUT + 0.5 < sequential_elapsed
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = asyncio.run(ScrapeEngine(max_concurrency=8, deadline=1.6).run(jobs))
+    finished = [name for name, result in report.sources.items() if not result.timed_out]
+    print(f"  {'global deadline 1.6 s':<24} {report.elapsed:6.2f}s  finished: {finished}, "
+          f"{len(report.hackathons)} hackathons kept")
+    assert report.deadline_hit and report.elapsed < 1.8
+    assert set(finished) == {"DevPost", "Unstop"}
+
+    sites.stop()
+    print("  OK: wall time follows the slowest source, not the sum")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Search benchmark - FTS5 index vs. a full-table LIKE '%term%' scan
+
+Fills a database with synthetic listings and compares query latency of
+Database.search against the LIKE scan it replaces, for rare, common and
+prefix terms. LIKE is timed twice: stopping at the first `limit` matches
+(unranked, so it is fast for common words), and scanning every row, which is
+what ranking or counting the matches needs.
+
+Usage: python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from models import Hackathon
+
+TOPICS = ("build ship hack prototype team mentors judges prizes track sponsor api cloud data ai web3 climate "
+          "health fintech open source students developers designers submit demo weekend online workshops "
+          "swag community challenge innovation apply register deadline rules eligibility quantum "
+          "biodiversity accessibility cybersecurity agritech").split()
+SYLLABLES = ("ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "zen", "dor", "pal", "tek")
+
+# term -> what it exercises
+QUERIES = {
+    "quantum": "uncommon",
+    "cyber": "prefix",
+    "climate health": "two words",
+    "hackathon": "every row",
+}
+
+
+def make_vocabulary(rng, size=5000):
+    """Topic words spread through a Zipf-distributed filler vocabulary, like real listing prose."""
+    filler = {"".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)}
+    words = sorted(filler)
+    rng.shuffle(words)
+    for rank, topic in zip(range(20, size, size // len(TOPICS)), TOPICS):
+        words.insert(rank, topic)
+    return words, [1 / (rank + 1) for rank in range(len(words))]
+
+
+def make_listings(count, rng):
+    words, weights = make_vocabulary(rng)
+    for i in range(count):
+        summary = rng.choices(words, weights, k=40)
+        yield Hackathon(
+            title=f"{rng.choice(['Global', 'Smart', 'Open', 'Green'])} {rng.choice(TOPICS).title()} Hackathon {i}",
+            url=f"https://example.com/hackathons/{i}",
+            description=" ".join(summary).capitalize() + ".",
+            source=rng.choice(["DevPost", "Unstop", "DevFolio", "MLH"]),
+            organization=rng.choice(["MIT", "Stanford", "MLH", "Google Developer Groups"]),
+        )
+
+
+def like_search(conn, query, limit=-1):
+    """What finding a listing took before the index: scan rows until `limit` match (-1 scans them all)."""
+    clauses, params = [], []
+    for word in query.split():
+        clauses.append("(title LIKE ? OR unpack_text(description) LIKE ? OR organization LIKE ? OR source LIKE ?)")
+        params.extend([f"%{word}%"] * 4)
+    return conn.execute(
+        f"SELECT id FROM hackathons WHERE {' AND '.join(clauses)} LIMIT ?", (*params, limit)
+    ).fetchall()
+
+
+def latency(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(rows=100000, limit=20, repeat=20):
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "search.db"), dedup_filter=False, near_dup_threshold=0)
+        listings = list(make_listings(rows, rng))
+        start = time.perf_counter()
+        for offset in range(0, rows, 1000):
+            db.add_hackathons(listings[offset:offset + 1000])
+        print(f"Search benchmark ({rows} rows loaded in {time.perf_counter() - start:.1f}s, top {limit})")
+        conn = db.get_connection()
+        conn.execute("INSERT INTO hackathons_fts (hackathons_fts) VALUES ('optimize')")
+
+        for query, label in QUERIES.items():
+            hits = conn.execute("SELECT COUNT(*) FROM hackathons_fts WHERE hackathons_fts MATCH ?",
+                                (" ".join(f'"{word}"*' for word in query.split()),)).fetchone()[0]
+            fts = latency(lambda: db.search(query, limit), repeat)
+            like_first = latency(lambda: like_search(conn, query, limit), max(3, repeat // 5))
+            like_all = latency(lambda: like_search(conn, query), 3)
+            print(f"  {query!r:<17} {label:<10} fts {fts:8.2f} ms   like first {limit} {like_first:8.2f} ms   "
+                  f"like all {like_all:8.2f} ms   ({hits} matching rows)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
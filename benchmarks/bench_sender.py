@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Sender benchmark - fast_scraper's per-message requests.post vs. the pooled TelegramBot path
+
+The old notifier opened a new connection for every message (no session) and
+slept one second after each. fast_scraper now posts through TelegramBot, whose
+HTTP pool keeps its connections alive. Both run against a local mock Bot API
+(benchmarks/mock_bot_api.py) that charges each new connection a handshake
+delay, since a plain-HTTP stub on localhost would otherwise make connecting
+look free. The rate limiter is opened up so only the transport is measured.
+
+Usage: python benchmarks/bench_sender.py [messages]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+from fast_scraper import FastHackathonScraper
+from mock_bot_api import MockBotAPI
+from models import Hackathon
+from rate_limiter import TelegramRateLimiter
+from telegram_bot import TelegramBot, format_hackathon_message
+
+LATENCY = 0.04  # seconds per sendMessage, roughly a round trip to api.telegram.org
+CONNECT_LATENCY = 0.12  # TCP + TLS handshake, about three round trips
+CHAT = "@bench"
+
+
+def summarize(label, latencies, elapsed, api):
+    latencies = sorted(latencies)
+    print(f"  {label:<30} p50 {statistics.median(latencies) * 1000:6.1f} ms  max {latencies[-1] * 1000:6.1f} ms  "
+          f"total {elapsed:6.2f}s  ({len(api.messages)} sent, {api.connections} connections)")
+
+
+def make_hackathons(count):
+    return [Hackathon(f"Hackathon {i}", f"https://example.com/{i}", "March 1, 2025",
+                      "Build something useful in 48 hours.", source="DevPost")
+            for i in range(count)]
+
+
+def old_sender(hackathons, with_sleep):
+    """The notifier as it was: a fresh connection per message, then sleep(1)."""
+    api = MockBotAPI(latency=LATENCY, connect_latency=CONNECT_LATENCY).start()
+    latencies = []
+    start = time.perf_counter()
+    for hackathon in hackathons:
+        sent_at = time.perf_counter()
+        response = requests.post(f"{api.api_url}123:TOKEN/sendMessage", data={
+            'chat_id': CHAT,
+            'text': format_hackathon_message(hackathon),
+            'parse_mode': 'Markdown',
+            'disable_web_page_preview': False,
+        }, timeout=10)
+        assert response.status_code == 200
+        latencies.append(time.perf_counter() - sent_at)
+        if with_sleep:
+            time.sleep(1)
+    elapsed = time.perf_counter() - start
+    api.stop()
+    return latencies, elapsed, api
+
+
+def pooled_sender(tmp, hackathons):
+    """fast_scraper.send_telegram_notifications' path, with send times recorded."""
+    api = MockBotAPI(latency=LATENCY, connect_latency=CONNECT_LATENCY).start()
+    db = Database(os.path.join(tmp, "sender.db"), dedup_filter=False, near_dup_threshold=0)
+    new_hackathons = db.add_hackathons(hackathons)
+    limiter = TelegramRateLimiter(global_rate=1000, chat_rate_per_minute=60000, chat_burst=1)
+    bot = TelegramBot("123:TOKEN", CHAT, db, rate_limiter=limiter, base_url=api.api_url)
+
+    latencies = []
+    send = bot.send_message
+
+    async def timed_send(message, *args, **kwargs):
+        sent_at = time.perf_counter()
+        result = await send(message, *args, **kwargs)
+        latencies.append(time.perf_counter() - sent_at)
+        return result
+
+    bot.send_message = timed_send
+
+    async def run():
+        try:
+            # One message per hackathon, so the per-message numbers compare like for like
+            return await bot.post_hackathons(max_posts=len(new_hackathons), digest=False)
+        finally:
+            await bot.close()
+
+    start = time.perf_counter()
+    result = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    assert result["posted"] == len(hackathons), result
+    assert db.get_stats()["pending_hackathons"] == 0
+    db.close()
+    api.stop()
+    return latencies, elapsed, api
+
+
+def check_fast_scraper(tmp):
+    """The real entry point posts exactly the hackathons it just added, one message each.
+    
+    A backlog larger than the digest threshold is queued first; it must be
+    neither posted nor turn the new hackathons into a digest.
+    """
+    api = MockBotAPI().start()
+    db = Database(os.path.join(tmp, "scraper.db"), dedup_filter=False, near_dup_threshold=0)
+    db.sync_channels([CHAT])
+    backlog = db.add_hackathons(make_hackathons(15))
+    new_hackathons = db.add_hackathons(Hackathon(f"New {h.title}", f"{h.url}/new", h.date_info, h.description,
+                                                 source=h.source) for h in make_hackathons(3))
+    scraper = FastHackathonScraper()
+    result = asyncio.run(scraper._post_notifications("123:TOKEN", CHAT, db, [h.id for h in new_hackathons],
+                                                     base_url=api.api_url))
+    assert result["posted"] == 3 and len(api.messages) == 3, result
+    assert all(text.count("New Hackathon") == 1 for _, text, _ in api.messages)
+    assert db.get_stats()["pending_hackathons"] == len(backlog)
+    db.close()
+    api.stop()
+
+
+def main(count=20):
+    logging.disable(logging.INFO)
+    hackathons = make_hackathons(count)
+    print(f"Sender benchmark ({count} messages, {LATENCY * 1000:.0f} ms per API call, "
+          f"{CONNECT_LATENCY * 1000:.0f} ms per new connection)")
+    with tempfile.TemporaryDirectory() as tmp:
+        latencies, elapsed, api = old_sender(hackathons, with_sleep=True)
+        summarize("requests.post + sleep(1)", latencies, elapsed, api)
+        latencies, elapsed, api = old_sender(hackathons, with_sleep=False)
+        summarize("requests.post, no sleep", latencies, elapsed, api)
+        latencies, elapsed, api = pooled_sender(tmp, hackathons)
+        summarize("pooled TelegramBot", latencies, elapsed, api)
+        assert api.connections == 1
+        check_fast_scraper(tmp)
+        print("  OK: fast_scraper posts only its new hackathons through the pooled bot and marks them posted")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
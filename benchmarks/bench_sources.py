@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Source plugin benchmark - every registered source through the same pipeline
+
+Serves a listing page per source from local mock sites (benchmarks/mock_sites.py)
+and times each source's fetch and its parse + normalize separately, then runs
+all of them at once through run_sources(). A new source only needs a
+listing_page() markup to show up here.
+
+Usage: python benchmarks/bench_sources.py [items_per_page] [repeats]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_sites import MockSites, listing_page
+from sources import SOURCES, make_session, run_sources
+
+
+def main(items=40, repeats=20):
+    sites = MockSites({f"/{name}": (listing_page(name, items), 0.0) for name in SOURCES}).start()
+    session = make_session()
+    print(f"Source benchmark ({len(SOURCES)} sources, {items} listings per page, median of {repeats})")
+
+    sources = []
+    for name, cls in SOURCES.items():
+        source = cls(session, urls=[sites.url(f"/{name}")])
+        sources.append(source)
+        fetch_times, parse_times = [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            html = source.fetch(source.urls[0])
+            fetched = time.perf_counter()
+            hackathons = []
+            for record in source.parse(html, source.urls[0]):
+                hackathon = source.normalize(record)
+                if hackathon:
+                    hackathons.append(hackathon)
+            parse_times.append(time.perf_counter() - fetched)
+            fetch_times.append(fetched - start)
+        kept = source.scrape(source.urls[0])
+        print(f"  {name:<16} fetch {statistics.median(fetch_times) * 1000:6.2f} ms  "
+              f"parse+normalize {statistics.median(parse_times) * 1000:6.2f} ms  "
+              f"{len(hackathons):3d} parsed, {len(kept):3d} kept (max {source.max_items})")
+        assert len(kept) == min(items, source.max_items), (name, len(kept))
+        assert all(h.source == source.label and h.url.startswith("http") for h in kept)
+
+    report = asyncio.run(run_sources(sources))
+    print(f"  all at once via run_sources: {report.elapsed * 1000:.1f} ms, {len(report.hackathons)} unique hackathons")
+    assert len(report.hackathons) == sum(min(items, source.max_items) for source in sources)
+    sites.stop()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Storage benchmark - pre-rendered message descriptions vs. structured, compressed fields
+
+Stores the same listings twice: the old way (the whole rendered Telegram
+message in `description`) and the new way (structured columns, raw summary,
+zlib above DESCRIPTION_COMPRESS_MIN). Compares database size and the cost of
+rendering messages at post time.
+
+Usage: python benchmarks/bench_storage.py [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from models import Hackathon
+
+WORDS = ("build ship hack prototype team mentors judges prizes track sponsor api cloud data ai web3 climate "
+         "health fintech open source students developers designers submit demo weekend online in-person "
+         "workshops swag community challenge innovation apply register deadline rules eligibility").split()
+
+MESSAGE = ("🚀 {title}\n{source}\n📅 Date: {date_info}\n📝 {summary}\n🔗 {url}\n"
+           "#Hackathon #Competition #Tech #Coding")
+
+
+def make_listings(count, summary_words, rng):
+    listings = []
+    for i in range(count):
+        source = rng.choice(["DevPost", "Unstop", "DevFolio", "MLH"])
+        summary = " ".join(rng.choice(WORDS) for _ in range(summary_words)).capitalize() + "."
+        listings.append(Hackathon(
+            title=f"{rng.choice(['Global', 'Smart', 'Open', 'Green'])} {rng.choice(WORDS).title()} Hackathon {i}",
+            url=f"https://{source.lower()}.example.com/hackathons/event-{i}",
+            date_info="September 15, 2025",
+            description=summary,
+            source=source,
+            organization=rng.choice(["MIT", "Stanford", "MLH", "Google Developer Groups"]),
+            deadline="2025-09-15",
+            prize=f"${rng.randint(1, 50)},000 in prizes",
+        ))
+    return listings
+
+
+def stored_size(db):
+    conn = db.get_connection()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    return os.path.getsize(db.db_path)
+
+
+def compare(label, listings, tmp):
+    legacy = Database(os.path.join(tmp, f"{label}-legacy.db"), dedup_filter=False, near_dup_threshold=0,
+                      compress_min=0)
+    legacy.add_hackathons(
+        Hackathon(h.title, h.url, h.date_info, MESSAGE.format(
+            title=h.title, source=h.source, date_info=h.date_info, summary=h.description, url=h.url
+        ), h.source)
+        for h in listings
+    )
+    structured = Database(os.path.join(tmp, f"{label}-structured.db"), dedup_filter=False, near_dup_threshold=0,
+                          compress_min=0)
+    structured.add_hackathons(listings)
+    compressed = Database(os.path.join(tmp, f"{label}-compressed.db"), dedup_filter=False, near_dup_threshold=0,
+                          compress_min=256)
+    compressed.add_hackathons(listings)
+
+    sizes = [(name, stored_size(db)) for name, db in
+             (("pre-rendered", legacy), ("structured", structured), ("structured + zlib", compressed))]
+    base = sizes[0][1]
+    for name, size in sizes:
+        print(f"  {name:<20} {size / 1024 / 1024:7.2f} MB  {size / len(listings):7.0f} B/row  ({size / base - 1:+.0%})")
+
+    start = time.perf_counter()
+    records = compressed.get_unposted_hackathons()
+    messages = [format_hackathon_message(h) for h in records]
+    elapsed = time.perf_counter() - start
+    print(f"  load + render        {elapsed:7.3f}s for {len(messages)} messages "
+          f"({elapsed / len(messages) * 1e6:.1f} µs each)")
+    for db in (legacy, structured, compressed):
+        db.close()
+
+
+def main(rows=20000):
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Storage benchmark, short summaries ({rows} rows, ~6 words)")
+        compare("short", make_listings(rows, 6, rng), tmp)
+        print(f"Storage benchmark, full summaries ({rows} rows, ~150 words)")
+        compare("long", make_listings(rows, 150, rng), tmp)
+
+
+if __name__ == "__main__":
+    try:
+        from telegram_bot import format_hackathon_message
+    except ImportError as e:
+        sys.exit(f"telegram_bot needs python-telegram-bot installed: {e}")
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,97 @@
+"""
+Local stand-in for the Telegram Bot API, for the posting benchmarks.
+
+Serves sendMessage and getMe over HTTP/1.1 keep-alive on 127.0.0.1, records
+every accepted message, and can add per-chat latency or fail a chat outright.
+`connect_latency` is paid once per new connection, standing in for the TCP
+and TLS handshakes a real client makes to api.telegram.org.
+Start it with MockBotAPI().start(); point clients at `api_url`.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs
+
+
+class MockBotAPI:
+    def __init__(self, latency: float = 0.0, chat_latency: Optional[Dict[str, float]] = None,
+                 failing_chats: Optional[Set[str]] = None, connect_latency: float = 0.0):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.chat_latency = chat_latency or {}
+        self.failing_chats = failing_chats or set()
+        self.messages = []  # (chat_id, text, accepted_at)
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def api_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/bot"
+
+    def start(self) -> "MockBotAPI":
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, Nagle
+            # plus delayed ACKs add ~40 ms to every reply on a kept-alive connection
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with api._lock:
+                    api.connections += 1
+                time.sleep(api.connect_latency)
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    params = json.loads(body or b"{}")
+                else:
+                    params = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+                method = self.path.rsplit("/", 1)[-1]
+                status, payload = api.handle(method, params)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def handle(self, method: str, params: Dict):
+        if method == "getMe":
+            return 200, {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "Mock", "username": "mock_bot"}}
+        if method != "sendMessage":
+            return 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+
+        chat_id = str(params.get("chat_id"))
+        time.sleep(self.chat_latency.get(chat_id, self.latency))
+        if chat_id in self.failing_chats:
+            return 400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}
+        with self._lock:
+            self.messages.append((chat_id, params.get("text", ""), time.perf_counter()))
+            message_id = len(self.messages)
+        return 200, {"ok": True, "result": {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": -1000000000000 - abs(hash(chat_id)) % 10 ** 9, "type": "channel", "title": chat_id},
+            "text": params.get("text", ""),
+        }}
@@ -0,0 +1,122 @@
+"""
+Local stand-in for the hackathon listing sites, for the scraping benchmarks.
+
+Serves HTML pages over HTTP/1.1 on 127.0.0.1, each with its own delay, and
+counts the requests it answers and the body bytes it sends. Pages carry an
+ETag and Last-Modified and get 304 Not Modified for matching conditional
+requests (turn off with validators=False); set_page() changes one. Start it
+with MockSites(pages).start(), where pages maps a path to (html, delay);
+`url(path)` gives the full URL.
+"""
+
+import hashlib
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+
+def listing_page(kind: str, count: int, base: str = "") -> str:
+    """A listing page in the markup the source plugins (sources.py) look for.
+
+    `kind` is a registered source name; zero items gives an empty page.
+    """
+    items = []
+    for i in range(count):
+        title = f"{kind.title()} Hackathon {i} 2025"
+        link = f"{base}/hackathons/{kind}-{i}"
+        date = f'<span class="date">March {i % 28 + 1}, 2025</span>'
+        if kind == "devpost":
+            items.append(f'<div class="hackathon-tile"><a href="{base}/challenges/{kind}-{i}"><h3>{title}</h3></a>{date}</div>')
+        elif kind == "devfolio":
+            items.append(f'<div class="hackathon-card"><h3>{title}</h3><a href="{link}">Apply</a></div>')
+        elif kind == "unstop":
+            items.append(f'<a href="{link}">{title}</a>')
+        elif kind == "hackerearth":
+            items.append(f'<div class="challenge-card"><h3>{title}</h3><a href="{base}/challenges/hackathon/{kind}-{i}">Start</a>'
+                         f'<div class="date">Mar {i % 28 + 1}, 2025</div></div>')
+        elif kind == "mlh":
+            items.append(f'<div class="event"><a href="{link}"><h3>{title}</h3></a>{date}'
+                         f'<span class="location">City {i}</span></div>')
+        else:
+            items.append(f'<div class="hackathon-card"><h3>{title}</h3><a href="{link}">Join</a>{date}'
+                         f'<span class="org">Org {i}</span></div>')
+    return "<html><body><main>" + "\n".join(items) + "</main></body></html>"
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients that gave up on a slow page (timeouts, cancelled fetches) hang up mid-reply
+
+
+class MockSites:
+    def __init__(self, pages: Dict[str, Tuple[str, float]], validators: bool = True):
+        self.pages = {}
+        self.validators = validators
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = None
+        for path, (html, delay) in pages.items():
+            self.set_page(path, html, delay)
+
+    def set_page(self, path: str, html: str, delay: float = 0.0) -> None:
+        body = html.encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        with self._lock:
+            self.pages[path] = (body, delay, etag, formatdate(time.time(), usegmt=True))
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = self.not_modified = self.bytes_sent = 0
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}{path}"
+
+    def start(self) -> "MockSites":
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                page = sites.pages.get(self.path)
+                body, delay, etag, last_modified = page or (b"<html></html>", 0.0, None, None)
+                time.sleep(delay)
+                unchanged = sites.validators and page and (
+                    self.headers.get("If-None-Match") == etag
+                    if self.headers.get("If-None-Match") else self.headers.get("If-Modified-Since") == last_modified
+                )
+                with sites._lock:
+                    sites.requests += 1
+                    sites.not_modified += bool(unchanged)
+                    sites.bytes_sent += 0 if unchanged else len(body)
+                if unchanged:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200 if page else 404)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if sites.validators and page:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = QuietServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Outbox stress test - several poster processes draining one queue
+
+Each worker claims batches, "sends" them by appending to a shared log, then
+completes the claims. Some workers crash right after their first claim (they
+exit without completing) to exercise lease expiry; they run first, so each
+finds rows to claim. At the end every hackathon must be posted, and no hackathon may have been sent twice by workers holding a live lease.
+
+Usage: python benchmarks/stress_outbox.py [rows] [workers]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from models import Hackathon
+
+# Live workers hold leases long enough to outlast lock waits; crashed ones
+# claim with a short lease so the test does not wait long for expiry
+LEASE_SECONDS = 30.0
+CRASH_LEASE_SECONDS = 0.5
+
+
+def worker(db_path, log_path, worker_id, batch, crash):
+    db = Database(db_path, dedup_filter=False, near_dup_threshold=0)
+    while True:
+        claimed = db.claim_batch(batch, worker_id, lease_seconds=CRASH_LEASE_SECONDS if crash else LEASE_SECONDS)
+        if not claimed:
+            # Expired leases of crashed workers may still come back
+            if db.get_outbox_stats().get('claimed'):
+                time.sleep(CRASH_LEASE_SECONDS / 4)
+                continue
+            break
+
+        if crash:
+            os._exit(1)  # die holding the lease of the first batch
+
+        with open(log_path, "a") as log:
+            for hackathon in claimed:
+                log.write(f"{hackathon.id} {worker_id}\n")
+        completed = db.complete_claims([h.id for h in claimed], worker_id)
+        assert completed == len(claimed), f"{worker_id} lost {len(claimed) - completed} claims"
+    db.close()
+
+
+def main(rows=5000, workers=8, batch=10):
+    print(f"Outbox stress test ({rows} rows, {workers} workers, batches of {batch})")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "outbox.db")
+        log_path = os.path.join(tmp, "sent.log")
+        db = Database(db_path, dedup_filter=False, near_dup_threshold=0)
+        db.add_hackathons(Hackathon(f"Hackathon {i}", f"https://example.com/{i}") for i in range(rows))
+
+        crashers = max(1, workers // 4)
+        start = time.perf_counter()
+        processes = [
+            multiprocessing.Process(
+                target=worker,
+                args=(db_path, log_path, f"w{i}", batch, i < crashers)
+            )
+            for i in range(workers)
+        ]
+        # Crashers claim and die before the others start, so none finds the queue drained
+        for process in processes[:crashers]:
+            process.start()
+        for process in processes[:crashers]:
+            process.join()
+        for process in processes[crashers:]:
+            process.start()
+        for process in processes[crashers:]:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        sends = Counter()
+        with open(log_path) as log:
+            for line in log:
+                sends[int(line.split()[0])] += 1
+
+        stats = db.get_stats()
+        outbox = db.get_outbox_stats()
+        duplicates = [hackathon_id for hackathon_id, count in sends.items() if count > 1]
+        crashed = sum(1 for process in processes if process.exitcode)
+
+        print(f"  drained in {elapsed:.2f}s ({rows / elapsed:.0f} rows/s), {crashed} workers crashed")
+        print(f"  outbox states: {outbox}")
+        print(f"  sends: {sum(sends.values())}, duplicate sends: {len(duplicates)}")
+
+        assert crashed == crashers and all(process.exitcode == 1 for process in processes[:crashers])
+        assert stats['posted_hackathons'] == rows and stats['pending_hackathons'] == 0
+        assert outbox == {'sent': rows}
+        assert len(sends) == rows
+        assert not duplicates, f"sent twice: {duplicates[:10]}"
+        print("  OK: every row sent exactly once")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -11,9 +11,14 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 
+from database import run_database_backup, run_database_maintenance
+
 # Load environment variables
 load_dotenv()
 
+MAINTENANCE_TIME = os.getenv("MAINTENANCE_TIME", "03:30")
+BACKUP_INTERVAL_HOURS = int(os.getenv("DB_BACKUP_INTERVAL_HOURS", "6"))
+
 # Setup logging without emojis
 logging.basicConfig(
     level=logging.INFO,
@@ -87,11 +92,16 @@ def main():
     logging.info("  - Live scraping: Every 6 hours")
     logging.info("  - Comprehensive scraping: Daily at 9 AM")
     logging.info("  - Post check: Every 2 hours")
+    logging.info(f"  - Database maintenance: Daily at {MAINTENANCE_TIME}")
+    logging.info(f"  - Database backup: Every {BACKUP_INTERVAL_HOURS} hours")
     
     # Schedule jobs
     schedule.every(6).hours.do(run_live_scraping)
     schedule.every().day.at("09:00").do(run_comprehensive_scraping)
     schedule.every(2).hours.do(post_unposted)
+    schedule.every().day.at(MAINTENANCE_TIME).do(run_database_maintenance)
+    if os.getenv("DB_BACKUP_DIR"):
+        schedule.every(BACKUP_INTERVAL_HOURS).hours.do(run_database_backup)
     
     # Run initial scraping
     logging.info("Running initial scraping...")
@@ -3,19 +3,36 @@
 Comprehensive Hackathon Finder - Multiple strategies for maximum coverage
 """
 
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
 import json
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
 from database import Database
+from http_cache import default_cache
+from models import Hackathon, parse_date
+from scrape_engine import scrape_all
+from sources import build_sources, make_session
 from telegram_bot import TelegramBot
 
 load_dotenv()
 
+SOURCE_NAMES = ('hackathon-earth', 'hackerearth', 'mlh')
+
+
+def make_hackathon(title: str, organization: str, deadline: str, link: str, source: str) -> Hackathon:
+    """Map this scraper's listing fields onto the shared Hackathon record."""
+    return Hackathon(
+        title=title,
+        url=link,
+        date_info=deadline,
+        source=source,
+        organization=organization,
+        deadline=parse_date(deadline)
+    )
+
+
 class ComprehensiveHackathonFinder:
     def __init__(self):
         self.db = Database()
@@ -24,8 +41,11 @@ class ComprehensiveHackathonFinder:
             channel_id=os.getenv("TELEGRAM_CHANNEL_ID"),
             db=self.db
         )
-        self.session = requests.Session()
+        self.cache = default_cache()
+        self.session = make_session(self.cache)
         self.setup_session()
+        self.sources = {source.name: source for source in build_sources(SOURCE_NAMES, self.session, validators=self.db)}
+        self.fetch_stats = self.sources['mlh'].stats
         
     def setup_session(self):
         """Setup requests session"""
@@ -38,253 +58,107 @@ class ComprehensiveHackathonFinder:
     def generate_current_hackathons(self):
         """Generate current trending hackathons based on 2025 trends"""
         current_hackathons = [
-            {
-                'title': 'AI Ethics Hackathon 2025',
-                'organization': 'Stanford AI Ethics Lab',
-                'deadline': 'September 15, 2025',
-                'link': 'https://ai-ethics.stanford.edu/hackathon2025',
-                'source': 'Curated-AI'
-            },
-            {
-                'title': 'Climate Tech Challenge',
-                'organization': 'MIT Climate Portal',
-                'deadline': 'September 30, 2025',
-                'link': 'https://climate.mit.edu/hackathon',
-                'source': 'Curated-Climate'
-            },
-            {
-                'title': 'Web3 DeFi Innovation Hackathon',
-                'organization': 'Ethereum Foundation',
-                'deadline': 'October 10, 2025',
-                'link': 'https://ethereum.org/en/hackathons/',
-                'source': 'Curated-Web3'
-            },
-            {
-                'title': 'HealthTech AI Hackathon',
-                'organization': 'Johns Hopkins Digital Health',
-                'deadline': 'September 25, 2025',
-                'link': 'https://digitalhealth.jhu.edu/hackathon',
-                'source': 'Curated-Health'
-            },
-            {
-                'title': 'Quantum Computing Challenge 2025',
-                'organization': 'IBM Quantum Network',
-                'deadline': 'October 5, 2025',
-                'link': 'https://qiskit.org/events/hackathon',
-                'source': 'Curated-Quantum'
-            },
-            {
-                'title': 'Smart City IoT Hackathon',
-                'organization': 'Smart Cities Alliance',
-                'deadline': 'September 20, 2025',
-                'link': 'https://smartcitiescouncil.com/hackathon',
-                'source': 'Curated-IoT'
-            },
-            {
-                'title': 'EdTech Innovation Challenge',
-                'organization': 'Microsoft Education',
-                'deadline': 'October 15, 2025',
-                'link': 'https://education.microsoft.com/hackathon',
-                'source': 'Curated-EdTech'
-            },
-            {
-                'title': 'Cybersecurity Defense Hackathon',
-                'organization': 'SANS Institute',
-                'deadline': 'September 28, 2025',
-                'link': 'https://sans.org/hackathon',
-                'source': 'Curated-Security'
-            },
-            {
-                'title': 'Fintech Blockchain Challenge',
-                'organization': 'JP Morgan Tech',
-                'deadline': 'October 8, 2025',
-                'link': 'https://jpmorgan.com/technology/hackathon',
-                'source': 'Curated-Fintech'
-            },
-            {
-                'title': 'AR/VR Metaverse Hackathon',
-                'organization': 'Meta Reality Labs',
-                'deadline': 'October 12, 2025',
-                'link': 'https://about.meta.com/realitylabs/hackathon',
-                'source': 'Curated-AR/VR'
-            }
+            make_hackathon(
+                title='AI Ethics Hackathon 2025',
+                organization='Stanford AI Ethics Lab',
+                deadline='September 15, 2025',
+                link='https://ai-ethics.stanford.edu/hackathon2025',
+                source='Curated-AI'
+            ),
+            make_hackathon(
+                title='Climate Tech Challenge',
+                organization='MIT Climate Portal',
+                deadline='September 30, 2025',
+                link='https://climate.mit.edu/hackathon',
+                source='Curated-Climate'
+            ),
+            make_hackathon(
+                title='Web3 DeFi Innovation Hackathon',
+                organization='Ethereum Foundation',
+                deadline='October 10, 2025',
+                link='https://ethereum.org/en/hackathons/',
+                source='Curated-Web3'
+            ),
+            make_hackathon(
+                title='HealthTech AI Hackathon',
+                organization='Johns Hopkins Digital Health',
+                deadline='September 25, 2025',
+                link='https://digitalhealth.jhu.edu/hackathon',
+                source='Curated-Health'
+            ),
+            make_hackathon(
+                title='Quantum Computing Challenge 2025',
+                organization='IBM Quantum Network',
+                deadline='October 5, 2025',
+                link='https://qiskit.org/events/hackathon',
+                source='Curated-Quantum'
+            ),
+            make_hackathon(
+                title='Smart City IoT Hackathon',
+                organization='Smart Cities Alliance',
+                deadline='September 20, 2025',
+                link='https://smartcitiescouncil.com/hackathon',
+                source='Curated-IoT'
+            ),
+            make_hackathon(
+                title='EdTech Innovation Challenge',
+                organization='Microsoft Education',
+                deadline='October 15, 2025',
+                link='https://education.microsoft.com/hackathon',
+                source='Curated-EdTech'
+            ),
+            make_hackathon(
+                title='Cybersecurity Defense Hackathon',
+                organization='SANS Institute',
+                deadline='September 28, 2025',
+                link='https://sans.org/hackathon',
+                source='Curated-Security'
+            ),
+            make_hackathon(
+                title='Fintech Blockchain Challenge',
+                organization='JP Morgan Tech',
+                deadline='October 8, 2025',
+                link='https://jpmorgan.com/technology/hackathon',
+                source='Curated-Fintech'
+            ),
+            make_hackathon(
+                title='AR/VR Metaverse Hackathon',
+                organization='Meta Reality Labs',
+                deadline='October 12, 2025',
+                link='https://about.meta.com/realitylabs/hackathon',
+                source='Curated-AR/VR'
+            )
         ]
         
         return current_hackathons
 
-    def scrape_hackathon_earth(self):
-        """Scrape from hackathon.earth - a real hackathon aggregator"""
-        hackathons = []
-        
+    def scrape_source(self, name):
+        """Scrape one registered source (see sources.py) with this finder's session"""
+        source = self.sources[name]
+        print(f"🔍 Scraping {source.label}...")
         try:
-            print("🔍 Scraping Hackathon.earth...")
-            url = "https://hackathon.earth/"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for hackathon cards
-                cards = soup.select('.hackathon-card, .event-card, .card, [class*="hack"]')
-                
-                for card in cards:
-                    try:
-                        # Title
-                        title_elem = card.select_one('h3, h2, .title, .name')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Link
-                        link_elem = card.find('a', href=True)
-                        link = link_elem['href'] if link_elem else url
-                        if link.startswith('/'):
-                            link = "https://hackathon.earth" + link
-                        
-                        # Date
-                        date_elem = card.select_one('.date, .deadline, .when')
-                        date = date_elem.get_text(strip=True) if date_elem else "Date TBD"
-                        
-                        # Organization
-                        org_elem = card.select_one('.org, .organizer, .host')
-                        org = org_elem.get_text(strip=True) if org_elem else "Various Organizations"
-                        
-                        hackathon = {
-                            'title': title,
-                            'organization': org,
-                            'deadline': date,
-                            'link': link,
-                            'source': 'Hackathon.earth'
-                        }
-                        
-                        hackathons.append(hackathon)
-                        
-                    except Exception as e:
-                        continue
-                        
-                print(f"✅ Hackathon.earth: Found {len(hackathons)} hackathons")
-                
+            hackathons = source.collect()
+            print(f"✅ {source.label}: Found {len(hackathons)} hackathons")
+            return hackathons
         except Exception as e:
-            print(f"❌ Hackathon.earth error: {e}")
-            
-        return hackathons
+            print(f"❌ {source.label} error: {e}")
+            return []
+
+    def scrape_hackathon_earth(self):
+        """Scrape from hackathon.earth - a real hackathon aggregator"""
+        return self.scrape_source('hackathon-earth')
 
     def scrape_hackerearth(self):
         """Scrape from HackerEarth"""
-        hackathons = []
-        
-        try:
-            print("🔍 Scraping HackerEarth...")
-            url = "https://www.hackerearth.com/challenges/"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for challenge cards
-                cards = soup.select('.challenge-card, .event-card, [class*="challenge"]')
-                
-                for card in cards:
-                    try:
-                        # Title
-                        title_elem = card.select_one('h3, h2, .title, .challenge-title')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Only include hackathons
-                        if 'hackathon' not in title.lower():
-                            continue
-                        
-                        # Link
-                        link_elem = card.find('a', href=True)
-                        link = link_elem['href'] if link_elem else url
-                        if link.startswith('/'):
-                            link = "https://www.hackerearth.com" + link
-                        
-                        # Date
-                        date_elem = card.select_one('.date, .deadline, .ends-in')
-                        date = date_elem.get_text(strip=True) if date_elem else "Date TBD"
-                        
-                        hackathon = {
-                            'title': title,
-                            'organization': "HackerEarth",
-                            'deadline': date,
-                            'link': link,
-                            'source': 'HackerEarth'
-                        }
-                        
-                        hackathons.append(hackathon)
-                        
-                    except Exception as e:
-                        continue
-                        
-                print(f"✅ HackerEarth: Found {len(hackathons)} hackathons")
-                
-        except Exception as e:
-            print(f"❌ HackerEarth error: {e}")
-            
-        return hackathons
+        return self.scrape_source('hackerearth')
 
     def scrape_mlh_hackathons(self):
         """Scrape Major League Hacking (MLH)"""
-        hackathons = []
-        
-        try:
-            print("🔍 Scraping Major League Hacking (MLH)...")
-            url = "https://mlh.io/seasons/2025/events"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for event cards
-                cards = soup.select('.event, .hackathon, [class*="event"]')
-                
-                for card in cards:
-                    try:
-                        # Title
-                        title_elem = card.select_one('h3, h2, .title, .name')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        
-                        # Link
-                        link_elem = card.find('a', href=True)
-                        link = link_elem['href'] if link_elem else url
-                        if link.startswith('/'):
-                            link = "https://mlh.io" + link
-                        
-                        # Date
-                        date_elem = card.select_one('.date, .when, .time')
-                        date = date_elem.get_text(strip=True) if date_elem else "Check MLH for dates"
-                        
-                        # Location/Organization
-                        loc_elem = card.select_one('.location, .where, .host')
-                        org = loc_elem.get_text(strip=True) if loc_elem else "MLH Member Event"
-                        
-                        hackathon = {
-                            'title': title,
-                            'organization': org,
-                            'deadline': date,
-                            'link': link,
-                            'source': 'Major League Hacking'
-                        }
-                        
-                        hackathons.append(hackathon)
-                        
-                    except Exception as e:
-                        continue
-                        
-                print(f"✅ MLH: Found {len(hackathons)} hackathons")
-                
-        except Exception as e:
-            print(f"❌ MLH error: {e}")
-            
-        return hackathons
+        return self.scrape_source('mlh')
+
+    def source_jobs(self):
+        """The scraped sources as jobs for the concurrent scrape engine"""
+        return [source.job() for source in self.sources.values()]
 
     def run_comprehensive_search(self):
         """Run comprehensive hackathon search"""
@@ -299,16 +173,13 @@ class ComprehensiveHackathonFinder:
         all_hackathons.extend(curated)
         print(f"✅ Curated: Found {len(curated)} trending hackathons")
         
-        # 2. Hackathon.earth
-        all_hackathons.extend(self.scrape_hackathon_earth())
-        time.sleep(2)
-        
-        # 3. HackerEarth
-        all_hackathons.extend(self.scrape_hackerearth())
-        time.sleep(2)
-        
-        # 4. MLH
-        all_hackathons.extend(self.scrape_mlh_hackathons())
+        # 2-4. Hackathon.earth, HackerEarth and MLH, all at once (different hosts, no pause needed)
+        report = scrape_all(self.source_jobs())
+        all_hackathons.extend(report.hackathons)
+        print(f"⏱️ Scraped {len(report.sources)} sites in {report.elapsed:.1f}s")
+        print(f"♻️ Conditional GET: {self.fetch_stats.summary()}")
+        if self.cache:
+            print(f"🗄️ Response cache: {self.cache.summary()}")
         
         print(f"\n📊 COMPREHENSIVE SEARCH RESULTS:")
         print(f"  Total found: {len(all_hackathons)} hackathons")
@@ -318,7 +189,7 @@ class ComprehensiveHackathonFinder:
         seen_titles = set()
         
         for hackathon in all_hackathons:
-            title_key = hackathon['title'].lower().strip()
+            title_key = hackathon.title.lower().strip()
             if title_key not in seen_titles:
                 seen_titles.add(title_key)
                 unique_hackathons.append(hackathon)
@@ -326,19 +197,13 @@ class ComprehensiveHackathonFinder:
         print(f"📋 Unique hackathons: {len(unique_hackathons)}")
         
         # Add to database and post new ones
-        new_hackathons = []
+        new_hackathons = self.db.add_hackathons(unique_hackathons)
+        new_urls = {h.url for h in new_hackathons}
         for hackathon in unique_hackathons:
-            if not self.db.is_duplicate(hackathon['title'], hackathon['link']):
-                self.db.add_hackathon(
-                    title=hackathon['title'],
-                    url=hackathon['link'],
-                    date_info=hackathon['deadline'],
-                    description=f"Organization: {hackathon['organization']} | Source: {hackathon['source']}"
-                )
-                new_hackathons.append(hackathon)
-                print(f"  ✅ NEW: {hackathon['title']} ({hackathon['source']})")
+            if hackathon.url in new_urls:
+                print(f"  ✅ NEW: {hackathon.title} ({hackathon.source})")
             else:
-                print(f"  ⚠️ Exists: {hackathon['title']}")
+                print(f"  ⚠️ Exists: {hackathon.title}")
         
         print(f"\n📝 Added {len(new_hackathons)} new hackathons to database")
         
@@ -347,7 +212,7 @@ class ComprehensiveHackathonFinder:
             unposted = self.db.get_unposted_hackathons()
             if unposted:
                 print(f"📤 Posting {len(unposted)} new hackathons to Telegram...")
-                self.telegram_bot.post_hackathons(unposted)
+                asyncio.run(self.telegram_bot.post_hackathons(max_posts=len(unposted)))
                 print("✅ Posted to Telegram!")
             else:
                 print("ℹ️ No hackathons to post")
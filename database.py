@@ -1,21 +1,705 @@
 import sqlite3
+import asyncio
+import functools
 import logging
-from datetime import datetime
-from typing import List, Dict, Optional
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterable, Iterator, Callable, Union, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import hashlib
 
+from models import (HACKATHON_COLUMNS, Hackathon, hackathon_row_factory, pack_text, unpack_text,
+                    parse_date, parse_legacy_description)
+from near_duplicates import NearDuplicateIndex, BatchMatcher, distinct_events
+from backup import configured_backup_dir, create_snapshot, restore_latest
+from settings import env, env_flag
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+# Ordered schema migrations applied on top of the base tables created by init_database.
+# Each step is (version, description, statements); a statement is SQL or a callable
+# taking the connection. Never edit an applied step - append a new one instead.
+Migration = Tuple[int, str, List[Union[str, Callable[[sqlite3.Connection], None]]]]
+
+UNPOSTED_INDEX = "CREATE INDEX IF NOT EXISTS idx_hackathons_unposted ON hackathons(id) WHERE is_posted = FALSE"
+
+NEAR_DUP_DELETE_TRIGGER = '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_near_dup_delete AFTER DELETE ON hackathons
+    BEGIN
+        DELETE FROM near_dup_signatures WHERE hackathon_id = OLD.id;
+        DELETE FROM near_dup_buckets WHERE hackathon_id = OLD.id;
+    END
+'''
+
+# Full-text index over the searchable listing fields. Migration 9 built it as an
+# external-content table reading through a view that called the app-side
+# unpack_text() function, which broke UPDATE/DELETE on connections without it
+# (sqlite3 CLI, DB browsers). It is kept here only so that step stays unchanged.
+FTS_COLUMNS = ("title", "description", "organization", "source")
+FTS_WEIGHTS = (10.0, 1.0, 4.0, 2.0)  # bm25 weight per column: title matches rank first
+
+_FTS_OLD = ", ".join(f"unpack_text(OLD.{c})" if c == "description" else f"OLD.{c}" for c in FTS_COLUMNS)
+_FTS_NEW = ", ".join(f"unpack_text(NEW.{c})" if c == "description" else f"NEW.{c}" for c in FTS_COLUMNS)
+
+FTS_SCHEMA_V9 = [
+    '''
+    CREATE VIEW IF NOT EXISTS hackathons_fts_content AS
+    SELECT id, title, unpack_text(description) AS description, organization, source FROM hackathons
+    ''',
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS hackathons_fts USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        content = 'hackathons_fts_content', content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_fts_insert AFTER INSERT ON hackathons
+    BEGIN
+        INSERT INTO hackathons_fts (rowid, {", ".join(FTS_COLUMNS)}) VALUES (NEW.id, {_FTS_NEW});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_fts_delete AFTER DELETE ON hackathons
+    BEGIN
+        INSERT INTO hackathons_fts (hackathons_fts, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', OLD.id, {_FTS_OLD});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_fts_update AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON hackathons
+    BEGIN
+        INSERT INTO hackathons_fts (hackathons_fts, rowid, {", ".join(FTS_COLUMNS)})
+        VALUES ('delete', OLD.id, {_FTS_OLD});
+        INSERT INTO hackathons_fts (rowid, {", ".join(FTS_COLUMNS)}) VALUES (NEW.id, {_FTS_NEW});
+    END
+    ''',
+]
+
+# Since migration 13 the index is a regular FTS5 table holding its own copy of
+# the text. Python fills it with the decompressed description (add_hackathons,
+# index_fts), so the schema needs no app-side SQL function. The triggers only
+# drop a deleted row; an UPDATE re-indexes the new values, with the description
+# only while it is stored uncompressed (Python updates call index_fts after).
+FTS_SCHEMA = [
+    "DROP TRIGGER IF EXISTS trg_hackathons_fts_insert",
+    "DROP TRIGGER IF EXISTS trg_hackathons_fts_delete",
+    "DROP TRIGGER IF EXISTS trg_hackathons_fts_update",
+    "DROP TABLE IF EXISTS hackathons_fts",
+    "DROP VIEW IF EXISTS hackathons_fts_content",
+    f'''
+    CREATE VIRTUAL TABLE hackathons_fts USING fts5(
+        {", ".join(FTS_COLUMNS)},
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_fts_delete AFTER DELETE ON hackathons
+    BEGIN
+        DELETE FROM hackathons_fts WHERE rowid = OLD.id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_fts_update AFTER UPDATE OF {", ".join(FTS_COLUMNS)} ON hackathons
+    BEGIN
+        DELETE FROM hackathons_fts WHERE rowid = OLD.id;
+        INSERT INTO hackathons_fts (rowid, {", ".join(FTS_COLUMNS)})
+        VALUES (NEW.id, NEW.title, CASE WHEN typeof(NEW.description) = 'text' THEN NEW.description END,
+                NEW.organization, NEW.source);
+    END
+    ''',
+]
+
+_FTS_INSERT = f"INSERT INTO hackathons_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?)"
+
+
+def index_fts(conn: sqlite3.Connection, hackathon_ids: Optional[Iterable[int]] = None) -> int:
+    """(Re)index hackathons in hackathons_fts with decompressed descriptions; all of them by default.
+    
+    Does nothing before migration 13 has created the table (the view is only
+    there while the migration 9 index is). Returns the number indexed.
+    """
+    objects = {row for row in conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE name IN ('hackathons_fts', 'hackathons_fts_content')"
+    )}
+    if ("table", "hackathons_fts") not in objects or ("view", "hackathons_fts_content") in objects:
+        return 0
+    query = "SELECT id, title, description, organization, source FROM hackathons"
+    params: List[int] = []
+    if hackathon_ids is None:
+        conn.execute("DELETE FROM hackathons_fts")
+    else:
+        params = list(hackathon_ids)
+        if not params:
+            return 0
+        placeholders = ", ".join("?" for _ in params)
+        conn.execute(f"DELETE FROM hackathons_fts WHERE rowid IN ({placeholders})", params)
+        query += f" WHERE id IN ({placeholders})"
+    rows = [(row_id, title, unpack_text(description), organization, source)
+            for row_id, title, description, organization, source in conn.execute(query, params).fetchall()]
+    conn.executemany(_FTS_INSERT, rows)
+    return len(rows)
+
+
+# Characters FTS5 would read as query syntax; search() matches plain words only
+FTS_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = ("utm_", "ref", "fbclid", "gclid")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize scheme/host case, www., trailing slashes, fragments and tracking params."""
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    ))
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path.rstrip("/"), query, ""))
+
+
+def dedup_key(title: str, url: str) -> int:
+    """64-bit signed dedup key of a canonicalized title + URL; fits an SQLite INTEGER."""
+    content = f"{' '.join(title.lower().split())}|{canonical_url(url)}"
+    return int.from_bytes(hashlib.blake2b(content.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+# Hackathons past retention live in a separate file attached as "archive", keeping
+# the main database (and its scans and backups) small. Archived rows keep their
+# dedup_key so an event that is still listed is never inserted and posted again.
+ARCHIVE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS archive.hackathons_archive (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        url TEXT NOT NULL,
+        date_info TEXT,
+        description TEXT,
+        source TEXT,
+        organization TEXT,
+        starts_at TEXT,
+        ends_at TEXT,
+        deadline TEXT,
+        prize TEXT,
+        dedup_key INTEGER NOT NULL UNIQUE,
+        is_posted BOOLEAN,
+        posted_at TIMESTAMP,
+        created_at TIMESTAMP,
+        archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# Structured listing fields added after the first release (migration 8)
+STRUCTURED_COLUMNS = ("organization", "starts_at", "ends_at", "deadline", "prize")
+
+
+def upgrade_archive_schema(conn: sqlite3.Connection) -> None:
+    """Add columns missing from an archive file created by an older version."""
+    existing = {row[1] for row in conn.execute("PRAGMA archive.table_info(hackathons_archive)")}
+    for column in STRUCTURED_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE archive.hackathons_archive ADD COLUMN {column} TEXT")
+
+
+# Triggers keeping hackathon_counters in step with every write to hackathons
+COUNTER_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_count_insert AFTER INSERT ON hackathons
+    BEGIN
+        INSERT INTO hackathon_counters (name, value) VALUES ('total', 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+        INSERT INTO hackathon_counters (name, value) VALUES ('posted', CASE WHEN NEW.is_posted THEN 1 ELSE 0 END)
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value;
+        INSERT INTO hackathon_counters (name, value) VALUES ('source:' || COALESCE(NEW.source, 'unknown'), 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_count_delete AFTER DELETE ON hackathons
+    BEGIN
+        UPDATE hackathon_counters SET value = value - 1 WHERE name = 'total';
+        UPDATE hackathon_counters SET value = value - 1 WHERE name = 'posted' AND OLD.is_posted;
+        UPDATE hackathon_counters SET value = value - 1 WHERE name = 'source:' || COALESCE(OLD.source, 'unknown');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_count_posted AFTER UPDATE OF is_posted ON hackathons
+    WHEN COALESCE(NEW.is_posted, 0) != COALESCE(OLD.is_posted, 0)
+    BEGIN
+        UPDATE hackathon_counters SET value = value + (CASE WHEN NEW.is_posted THEN 1 ELSE -1 END)
+        WHERE name = 'posted';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_count_source AFTER UPDATE OF source ON hackathons
+    WHEN COALESCE(NEW.source, 'unknown') != COALESCE(OLD.source, 'unknown')
+    BEGIN
+        UPDATE hackathon_counters SET value = value - 1 WHERE name = 'source:' || COALESCE(OLD.source, 'unknown');
+        INSERT INTO hackathon_counters (name, value) VALUES ('source:' || COALESCE(NEW.source, 'unknown'), 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1;
+    END
+    ''',
+]
+
+
+# Every configured chat gets its own outbox row per hackathon; with no channels
+# registered yet, rows go to the '' chat, which the first channel adopts
+OUTBOX_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_insert AFTER INSERT ON hackathons
+    WHEN NOT COALESCE(NEW.is_posted, 0)
+    BEGIN
+        INSERT OR IGNORE INTO outbox (hackathon_id, chat_id)
+        SELECT NEW.id, chat_id FROM channels
+        UNION ALL
+        SELECT NEW.id, '' WHERE NOT EXISTS (SELECT 1 FROM channels);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_posted AFTER UPDATE OF is_posted ON hackathons
+    WHEN NEW.is_posted
+    BEGIN
+        UPDATE outbox SET state = 'sent', worker_id = NULL, lease_expires_at = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE hackathon_id = NEW.id AND state != 'sent';
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_delete AFTER DELETE ON hackathons
+    BEGIN
+        DELETE FROM outbox WHERE hackathon_id = OLD.id;
+    END
+    ''',
+]
+
+
+def rebuild_counters(conn: sqlite3.Connection) -> None:
+    """Recompute hackathon_counters from the hackathons table."""
+    conn.execute("DELETE FROM hackathon_counters")
+    conn.execute('''
+        INSERT INTO hackathon_counters (name, value)
+        SELECT 'total', COUNT(*) FROM hackathons
+        UNION ALL
+        SELECT 'posted', COUNT(*) FROM hackathons WHERE is_posted = TRUE
+        UNION ALL
+        SELECT 'source:' || COALESCE(source, 'unknown'), COUNT(*) FROM hackathons GROUP BY COALESCE(source, 'unknown')
+    ''')
+    if conn.execute("SELECT 1 FROM pragma_database_list WHERE name = 'archive'").fetchone():
+        conn.execute("INSERT INTO hackathon_counters (name, value) SELECT 'archived', COUNT(*) FROM archive.hackathons_archive")
+
+
+MIGRATIONS: List[Migration] = [
+    (1, "Partial index over the unposted queue", [
+        UNPOSTED_INDEX
+    ]),
+    (2, "Index scraping_log by scrape time", [
+        "CREATE INDEX IF NOT EXISTS idx_scraping_log_scraped_at ON scraping_log(scraped_at)"
+    ]),
+    (3, "Track insert time in created_at; posted_at is the real send time", [
+        "ALTER TABLE hackathons ADD COLUMN created_at TIMESTAMP",
+        "UPDATE hackathons SET created_at = posted_at",
+        "UPDATE hackathons SET posted_at = NULL WHERE is_posted = FALSE"
+    ]),
+    (4, "Source column and trigger-maintained hackathon counters", [
+        "ALTER TABLE hackathons ADD COLUMN source TEXT",
+        '''
+        CREATE TABLE IF NOT EXISTS hackathon_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        *COUNTER_TRIGGERS,
+        rebuild_counters
+    ]),
+    (5, "MinHash/LSH near-duplicate index over titles", [
+        '''
+        CREATE TABLE IF NOT EXISTS near_dup_signatures (
+            hackathon_id INTEGER PRIMARY KEY,
+            signature BLOB NOT NULL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS near_dup_buckets (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            hackathon_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, hackathon_id)
+        ) WITHOUT ROWID
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_near_dup_buckets_hackathon ON near_dup_buckets(hackathon_id)",
+        NEAR_DUP_DELETE_TRIGGER,
+        lambda conn: NearDuplicateIndex().rebuild(conn)
+    ]),
+    (6, "Replace the url/hash UNIQUE indexes with one 64-bit dedup_key", [
+        lambda conn: migrate_to_dedup_key(conn)
+    ]),
+    (7, "Posting outbox with leased claims", [
+        '''
+        CREATE TABLE IF NOT EXISTS outbox (
+            hackathon_id INTEGER PRIMARY KEY,
+            state TEXT NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'claimed', 'sent', 'failed')),
+            worker_id TEXT,
+            lease_expires_at REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox(state, hackathon_id)",
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_insert AFTER INSERT ON hackathons
+        WHEN NOT COALESCE(NEW.is_posted, 0)
+        BEGIN
+            INSERT OR IGNORE INTO outbox (hackathon_id) VALUES (NEW.id);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_posted AFTER UPDATE OF is_posted ON hackathons
+        WHEN NEW.is_posted
+        BEGIN
+            UPDATE outbox SET state = 'sent', worker_id = NULL, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE hackathon_id = NEW.id;
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS trg_hackathons_outbox_delete AFTER DELETE ON hackathons
+        BEGIN
+            DELETE FROM outbox WHERE hackathon_id = OLD.id;
+        END
+        ''',
+        "INSERT OR IGNORE INTO outbox (hackathon_id) SELECT id FROM hackathons WHERE is_posted = FALSE"
+    ]),
+    (8, "Structured listing fields; descriptions hold the raw summary, optionally compressed", [
+        *(f"ALTER TABLE hackathons ADD COLUMN {column} TEXT" for column in STRUCTURED_COLUMNS),
+        lambda conn: migrate_structured_fields(conn)
+    ]),
+    (9, "FTS5 full-text index over title, description, organization and source", [
+        *FTS_SCHEMA_V9,
+        "INSERT INTO hackathons_fts (hackathons_fts) VALUES ('rebuild')"
+    ]),
+    (10, "Learned Telegram send rate per chat", [
+        '''
+        CREATE TABLE IF NOT EXISTS chat_pacing (
+            chat_id TEXT PRIMARY KEY,
+            rate_per_minute REAL NOT NULL,
+            retry_afters INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        '''
+    ]),
+    (11, "Outbox rows per chat for multi-channel posting", [
+        # The triggers name the outbox, so they go before it is rebuilt
+        "DROP TRIGGER IF EXISTS trg_hackathons_outbox_insert",
+        "DROP TRIGGER IF EXISTS trg_hackathons_outbox_posted",
+        "DROP TRIGGER IF EXISTS trg_hackathons_outbox_delete",
+        '''
+        CREATE TABLE IF NOT EXISTS channels (
+            chat_id TEXT PRIMARY KEY,
+            added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE outbox_rebuild (
+            hackathon_id INTEGER NOT NULL,
+            chat_id TEXT NOT NULL DEFAULT '',
+            state TEXT NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'claimed', 'sent', 'failed')),
+            worker_id TEXT,
+            lease_expires_at REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (hackathon_id, chat_id)
+        ) WITHOUT ROWID
+        ''',
+        '''
+        INSERT INTO outbox_rebuild
+            (hackathon_id, chat_id, state, worker_id, lease_expires_at, attempts, last_error, updated_at)
+        SELECT hackathon_id, '', state, worker_id, lease_expires_at, attempts, last_error, updated_at FROM outbox
+        ''',
+        "DROP TABLE outbox",
+        "ALTER TABLE outbox_rebuild RENAME TO outbox",
+        "CREATE INDEX IF NOT EXISTS idx_outbox_chat_state ON outbox(chat_id, state, hackathon_id)",
+        *OUTBOX_TRIGGERS
+    ]),
+    (12, "HTTP validators and the last parsed result per scraped URL", [
+        '''
+        CREATE TABLE IF NOT EXISTS http_validators (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            parser TEXT NOT NULL,
+            result BLOB,
+            body_bytes INTEGER NOT NULL DEFAULT 0,
+            parse_seconds REAL NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        '''
+    ]),
+    (13, "Full-text index filled from Python; the schema no longer calls unpack_text", [
+        *FTS_SCHEMA,
+        lambda conn: index_fts(conn)
+    ]),
+]
+
+
+def migrate_to_dedup_key(conn: sqlite3.Connection) -> None:
+    """Rebuild hackathons keyed by dedup_key instead of UNIQUE url + md5 hex hash.
+    
+    SQLite cannot drop a UNIQUE constraint in place, so the table is copied. Rows
+    whose canonical key collides keep the oldest id (posted if any copy was).
+    Indexes and triggers on the old table go with it and are recreated.
+    """
+    conn.execute('''
+        CREATE TABLE hackathons_rebuild (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL,
+            date_info TEXT,
+            description TEXT,
+            dedup_key INTEGER NOT NULL UNIQUE,
+            posted_at TIMESTAMP,
+            is_posted BOOLEAN DEFAULT FALSE,
+            created_at TIMESTAMP,
+            source TEXT
+        )
+    ''')
+    kept = {}
+    for row_id, title, url, date_info, description, posted_at, is_posted, created_at, source in conn.execute('''
+        SELECT id, title, url, date_info, description, posted_at, is_posted, created_at, source
+        FROM hackathons ORDER BY id
+    '''):
+        key = dedup_key(title, url)
+        if key not in kept:
+            kept[key] = [row_id, title, url, date_info, description, key, posted_at, is_posted, created_at, source]
+        elif is_posted and not kept[key][7]:
+            # A merged copy was already posted, so the survivor must not be posted again
+            kept[key][6:8] = [posted_at, is_posted]
+    conn.executemany('''
+        INSERT INTO hackathons_rebuild
+            (id, title, url, date_info, description, dedup_key, posted_at, is_posted, created_at, source)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', list(kept.values()))
+    
+    conn.execute("DROP TABLE hackathons")
+    conn.execute("ALTER TABLE hackathons_rebuild RENAME TO hackathons")
+    
+    conn.execute(UNPOSTED_INDEX)
+    for trigger in COUNTER_TRIGGERS + [NEAR_DUP_DELETE_TRIGGER]:
+        conn.execute(trigger)
+    rebuild_counters(conn)
+    conn.execute("DELETE FROM near_dup_signatures WHERE hackathon_id NOT IN (SELECT id FROM hackathons)")
+    conn.execute("DELETE FROM near_dup_buckets WHERE hackathon_id NOT IN (SELECT id FROM hackathons)")
+
+
+def configured_compress_min() -> int:
+    """DESCRIPTION_COMPRESS_MIN in bytes; 0 stores summaries uncompressed."""
+    return env("DESCRIPTION_COMPRESS_MIN", 256, int)
+
+
+def migrate_structured_fields(conn: sqlite3.Connection, compress_min: Optional[int] = None) -> None:
+    """Split pre-rendered descriptions into structured columns and compress long summaries."""
+    compress_min = configured_compress_min() if compress_min is None else compress_min
+    updates = []
+    for row_id, date_info, description, source in conn.execute(
+        "SELECT id, date_info, description, source FROM hackathons"
+    ).fetchall():
+        fields = parse_legacy_description(unpack_text(description))
+        updates.append((
+            pack_text(fields['description'], compress_min),
+            fields['organization'],
+            source or fields['source'],
+            parse_date(date_info),
+            row_id
+        ))
+    conn.executemany('''
+        UPDATE hackathons SET description = ?, organization = ?, source = ?, deadline = ?
+        WHERE id = ?
+    ''', updates)
+    # The update trigger cannot index compressed descriptions
+    index_fts(conn, [update[-1] for update in updates])
+
+
+def utc_timestamp() -> str:
+    """Current UTC time in SQLite's CURRENT_TIMESTAMP format."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class DedupKeyFilter:
+    """Compact in-memory set of 64-bit dedup keys used to skip duplicate lookups.
+    
+    Keys live in a sorted array of signed 64-bit ints (8 bytes each) searched
+    with bisect. New entries go into a small pending set that is merged into the
+    array once it grows past MERGE_THRESHOLD, so inserts stay cheap.
+    """
+    
+    MERGE_THRESHOLD = 4096
+    
+    def __init__(self, keys: Iterable[int] = ()):
+        self._sorted = array('q', sorted(set(keys)))
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def add(self, key: int) -> None:
+        with self._lock:
+            if key in self._pending or self._contains_sorted(key):
+                return
+            self._pending.add(key)
+            if len(self._pending) >= self.MERGE_THRESHOLD:
+                self._sorted = array('q', sorted(list(self._sorted) + list(self._pending)))
+                self._pending = set()
+    
+    def _contains_sorted(self, key: int) -> bool:
+        index = bisect_left(self._sorted, key)
+        return index < len(self._sorted) and self._sorted[index] == key
+    
+    def __contains__(self, key: int) -> bool:
+        with self._lock:
+            found = key in self._pending or self._contains_sorted(key)
+            self.lookups += 1
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+    
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the filter's entries."""
+        pending = sys.getsizeof(self._pending) + sum(sys.getsizeof(key) for key in self._pending)
+        return sys.getsizeof(self._sorted) + pending
+    
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self),
+            "memory_bytes": self.memory_bytes,
+            "bytes_per_entry": round(self.memory_bytes / len(self), 2) if len(self) else 0,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0
+        }
+
 
 class Database:
-    """Database handler for storing hackathon information and managing deduplication."""
+    """Database handler for storing hackathon information and managing deduplication.
+    
+    Settings left as None are read from the environment (and .env) when the
+    Database is constructed; see settings.env.
+    """
     
-    def __init__(self, db_path: str = "hackathons.db"):
+    def __init__(self, db_path: str = "hackathons.db", journal_mode: Optional[str] = None,
+                 synchronous: Optional[str] = None, cache_size: Optional[int] = None,
+                 mmap_size: Optional[int] = None, busy_timeout: Optional[float] = None,
+                 dedup_filter: Optional[bool] = None, confirm_filter_hits: bool = False,
+                 near_dup_threshold: Optional[float] = None, archive_path: Optional[str] = None,
+                 backup_dir: Optional[str] = None, compress_min: Optional[int] = None):
         self.db_path = db_path
+        self.compress_min = configured_compress_min() if compress_min is None else compress_min
+        # ARCHIVE_DB_PATH defaults to <db>_archive.db next to the database
+        self.archive_path = (archive_path or env("ARCHIVE_DB_PATH", None)
+                             or f"{os.path.splitext(db_path)[0]}_archive.db")
+        self.backup_dir = configured_backup_dir() if backup_dir is None else backup_dir
+        
+        # Connection tuning, overridable per deployment
+        journal_mode = env("SQLITE_JOURNAL_MODE", "WAL") if journal_mode is None else journal_mode
+        synchronous = env("SQLITE_SYNCHRONOUS", "NORMAL") if synchronous is None else synchronous
+        self.journal_mode = journal_mode.upper()
+        self.synchronous = synchronous.upper()
+        # Negative cache sizes are KiB, so ~16 MB by default
+        self.cache_size = int(env("SQLITE_CACHE_SIZE", -16000, int) if cache_size is None else cache_size)
+        self.mmap_size = int(env("SQLITE_MMAP_SIZE", 64 * 1024 * 1024, int) if mmap_size is None else mmap_size)
+        self.busy_timeout = env("SQLITE_BUSY_TIMEOUT", 30.0, float) if busy_timeout is None else busy_timeout
+        
+        # Outbox and retention policy, the defaults of the methods that use them
+        self.claim_lease = env("OUTBOX_LEASE_SECONDS", 300.0, float)
+        self.max_attempts = env("OUTBOX_MAX_ATTEMPTS", 5, int)
+        self.failed_retry_hours = env("OUTBOX_FAILED_RETRY_HOURS", 24.0, float)  # 0 leaves failed rows parked
+        self.retention_days = env("RETENTION_DAYS", 90, int)  # posted hackathons
+        self.unposted_retention_days = env("UNPOSTED_RETENTION_DAYS", 60, int)  # never posted, no parsed date
+        self.log_retention_days = env("LOG_RETENTION_DAYS", 30, int)
+        
+        dedup_filter = env_flag("DEDUP_FILTER", True) if dedup_filter is None else dedup_filter
+        # NEAR_DUP_THRESHOLD 0 disables near-duplicate matching
+        if near_dup_threshold is None:
+            near_dup_threshold = env("NEAR_DUP_THRESHOLD", 0.8, float)
+        self.confirm_filter_hits = confirm_filter_hits
+        self.dedup_filter: Optional[DedupKeyFilter] = None
+        self.near_dup_index = NearDuplicateIndex(near_dup_threshold) if near_dup_threshold > 0 else None
+        
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Unsupported journal_mode: {journal_mode}")
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Unsupported synchronous mode: {synchronous}")
+        
+        # One long-lived connection per thread, tracked so close() can release them all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        
+        # A redeploy starts from an empty working directory; pick up the last snapshot
+        restore_latest(self.db_path, self.backup_dir, self.archive_path)
         self.init_database()
+        if dedup_filter:
+            self.load_dedup_filter()
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Return the calling thread's pooled connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        # Must precede journal_mode to apply to a new file; older files are converted by enable_incremental_vacuum
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # Only migration 9 (on databases not yet at 13) still calls it from SQL
+        conn.create_function("unpack_text", 1, unpack_text, deterministic=True)
+        conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+        conn.execute(f"PRAGMA archive.journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA archive.synchronous = {self.synchronous}")
+        
+        self._local.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def close(self) -> None:
+        """Close every pooled connection opened by this instance."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logging.error(f"Error closing database connection: {e}")
+        self._local = threading.local()
     
     def init_database(self):
         """Initialize the database with required tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
                 # Create hackathons table
@@ -43,26 +727,97 @@ class Database:
                     )
                 ''')
                 
+                cursor.execute(ARCHIVE_SCHEMA)
+                upgrade_archive_schema(conn)
+                
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS schema_version (
+                        version INTEGER PRIMARY KEY,
+                        description TEXT,
+                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                
                 conn.commit()
-                logging.info("Database initialized successfully")
+            
+            self.run_migrations()
+            logging.info("Database initialized successfully")
                 
         except Exception as e:
             logging.error(f"Database initialization error: {e}")
             raise
     
-    def generate_hash(self, title: str, url: str) -> str:
-        """Generate a unique hash for a hackathon to prevent duplicates."""
-        content = f"{title.strip().lower()}|{url.strip()}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def get_schema_version(self) -> int:
+        """Return the highest applied migration version (0 for a fresh database)."""
+        with self.get_connection() as conn:
+            return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    
+    def run_migrations(self) -> int:
+        """Apply pending migrations in order, each in its own transaction. Returns the final version."""
+        conn = self.get_connection()
+        for version, description, statements in MIGRATIONS:
+            with conn:
+                # Lock before re-reading the version so concurrent processes apply each step once
+                conn.execute("BEGIN IMMEDIATE")
+                current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+                if version <= current:
+                    continue
+                
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                logging.info(f"Applied migration {version}: {description}")
+        return self.get_schema_version()
+    
+    def query_plan(self, query: str, params: Tuple = ()) -> List[str]:
+        """Return the EXPLAIN QUERY PLAN details for a query."""
+        with self.get_connection() as conn:
+            return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+    
+    def generate_hash(self, title: str, url: str) -> int:
+        """Generate the dedup key for a hackathon to prevent duplicates."""
+        return dedup_key(title, url)
+    
+    def load_dedup_filter(self) -> None:
+        """Warm the in-memory dedup filter from the dedup_key column."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute("SELECT dedup_key FROM hackathons UNION ALL SELECT dedup_key FROM archive.hackathons_archive")
+                self.dedup_filter = DedupKeyFilter(row[0] for row in cursor)
+            logging.info(f"Dedup filter loaded with {len(self.dedup_filter)} entries")
+        except Exception as e:
+            logging.error(f"Error loading dedup filter: {e}")
+            self.dedup_filter = None
+    
+    def dedup_stats(self) -> Dict:
+        """Memory and hit-rate counters of the dedup filter (empty when disabled)."""
+        return self.dedup_filter.stats() if self.dedup_filter is not None else {}
     
     def is_duplicate(self, title: str, url: str) -> bool:
         """Check if a hackathon already exists in the database."""
-        hash_value = self.generate_hash(title, url)
+        key = self.generate_hash(title, url)
+        
+        # A filter miss is definitive; a hit only needs SQL when hits must be confirmed
+        if self.dedup_filter is not None:
+            if key not in self.dedup_filter:
+                return False
+            if not self.confirm_filter_hits:
+                return True
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT id FROM hackathons WHERE hash = ?", (hash_value,))
+                cursor.execute('''
+                    SELECT 1 FROM hackathons WHERE dedup_key = ?
+                    UNION ALL
+                    SELECT 1 FROM archive.hackathons_archive WHERE dedup_key = ?
+                ''', (key, key))
                 return cursor.fetchone() is not None
         except Exception as e:
             logging.error(f"Error checking duplicate: {e}")
@@ -70,63 +825,550 @@ class Database:
     
     def add_hackathon(self, title: str, url: str, date_info: str = "", description: str = "") -> bool:
         """Add a new hackathon to the database if it's not a duplicate."""
-        if self.is_duplicate(title, url):
-            return False
+        return bool(self.add_hackathons([Hackathon(title, url, date_info, description)]))
+    
+    def add_hackathons(self, hackathons: Iterable[Hackathon]) -> List[Hackathon]:
+        """Insert a batch of hackathons in one transaction and return only the new ones.
+        
+        Duplicates (same dedup key, in the database, the archive or earlier in the
+        batch) are skipped by INSERT OR IGNORE. With the near-duplicate index enabled, titles
+        that closely match a stored or earlier batch entry are skipped as well.
+        Returned records are copies carrying their new id.
+        """
+        batch = {}
+        for hackathon in hackathons:
+            key = self.generate_hash(hackathon.title, hackathon.url)
+            # Known keys are rejected here without touching SQLite
+            if self.dedup_filter is not None and not self.confirm_filter_hits and key in self.dedup_filter:
+                continue
+            batch.setdefault(key, hackathon)
         
-        hash_value = self.generate_hash(title, url)
+        if not batch:
+            return []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            conn = self.get_connection()
+            with conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO hackathons (title, url, date_info, description, hash)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (title, url, date_info, description, hash_value))
-                conn.commit()
-                logging.info(f"Added new hackathon: {title}")
-                return True
+                # Take the write lock up front so every id above last_id is ours
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM hackathons")
+                last_id = cursor.fetchone()[0]
+                
+                signatures = {}
+                if self.near_dup_index is not None:
+                    signatures = self._drop_near_duplicates(conn, batch)
+                
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO hackathons (title, url, date_info, description, source, organization,
+                                                      starts_at, ends_at, deadline, prize, dedup_key, created_at, posted_at)
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, NULL
+                    WHERE NOT EXISTS (SELECT 1 FROM archive.hackathons_archive WHERE dedup_key = ?)
+                ''', [
+                    (h.title, h.url, h.date_info or "", pack_text(h.description or "", self.compress_min), h.source,
+                     h.organization, h.starts_at, h.ends_at, h.deadline, h.prize, key, key)
+                    for key, h in batch.items()
+                ])
+                
+                cursor.execute("SELECT id, dedup_key FROM hackathons WHERE id > ? ORDER BY id", (last_id,))
+                new_rows = cursor.fetchall()
+                new_hackathons = [batch[key].with_id(row_id) for row_id, key in new_rows]
+                cursor.executemany(_FTS_INSERT, [
+                    (h.id, h.title, h.description or "", h.organization, h.source) for h in new_hackathons
+                ])
+                
+                for row_id, key in new_rows:
+                    if key in signatures:
+                        self.near_dup_index.add(conn, row_id, signatures[key])
+            
+            # Ignored rows are known too (stored by another process since the filter was warmed)
+            if self.dedup_filter is not None:
+                for key in batch:
+                    self.dedup_filter.add(key)
+            
+            for hackathon in new_hackathons:
+                logging.info(f"Added new hackathon: {hackathon.title}")
+            return new_hackathons
         except Exception as e:
-            logging.error(f"Error adding hackathon: {e}")
-            return False
+            logging.error(f"Error adding hackathons: {e}")
+            return []
+    
+    def _drop_near_duplicates(self, conn: sqlite3.Connection, batch: Dict[int, Hackathon]) -> Dict[int, tuple]:
+        """Remove near-duplicates from the batch in place; return signatures of the rest.
+        
+        A similar title only counts when the two listings are not told apart by
+        year, site page or dates (near_duplicates.distinct_events).
+        """
+        matcher = BatchMatcher(self.near_dup_index)
+        signatures = {}
+        
+        def stored(hackathon_id: int) -> Hackathon:
+            title, url, starts_at, deadline = conn.execute(
+                "SELECT title, url, starts_at, deadline FROM hackathons WHERE id = ?", (hackathon_id,)
+            ).fetchone()
+            return Hackathon(title, url, starts_at=starts_at, deadline=deadline)
+        
+        for key, hackathon in list(batch.items()):
+            signature = self.near_dup_index.signature(hackathon.title)
+            match = self.near_dup_index.find_match(
+                conn, signature, accept=lambda hackathon_id: not distinct_events(hackathon, stored(hackathon_id))
+            )
+            earlier = matcher.seen(signature, accept=lambda other: not distinct_events(hackathon, other))
+            if match is not None or earlier is not None:
+                if match is not None:
+                    logging.info(f"Skipping near-duplicate: {hackathon.title} (matches #{match[0]}, {match[1]:.2f})")
+                else:
+                    logging.info(f"Skipping near-duplicate: {hackathon.title} (matches {earlier.title} in this batch)")
+                del batch[key]
+                continue
+            matcher.add(signature, hackathon)
+            signatures[key] = signature
+        return signatures
     
-    def get_unposted_hackathons(self) -> List[Dict]:
+    def iter_unposted_hackathons(self, limit: Optional[int] = None, page_size: int = 100) -> Iterator[Hackathon]:
+        """Lazily yield unposted hackathons in id order, one keyset page at a time.
+        
+        Each page is a separate `WHERE id > ? LIMIT ?` query, so rows posted while
+        iterating are simply skipped and no cursor stays open between yields.
+        """
+        last_id = 0
+        remaining = limit
+        
+        while remaining is None or remaining > 0:
+            page_limit = page_size if remaining is None else min(page_size, remaining)
+            try:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.row_factory = hackathon_row_factory
+                    cursor.execute(f'''
+                        SELECT {HACKATHON_COLUMNS}
+                        FROM hackathons
+                        WHERE is_posted = FALSE AND id > ?
+                        ORDER BY id ASC
+                        LIMIT ?
+                    ''', (last_id, page_limit))
+                    page = cursor.fetchall()
+            except Exception as e:
+                logging.error(f"Error getting unposted hackathons: {e}")
+                return
+            
+            yield from page
+            
+            if len(page) < page_limit:
+                return
+            last_id = page[-1].id
+            if remaining is not None:
+                remaining -= len(page)
+    
+    def get_unposted_hackathons(self, limit: Optional[int] = None) -> List[Hackathon]:
         """Get hackathons that haven't been posted to Telegram yet."""
+        return list(self.iter_unposted_hackathons(limit=limit))
+    
+    def search(self, query: str, limit: int = 20) -> List[Hackathon]:
+        """Full-text search over stored hackathons, best bm25 match first.
+        
+        Every word of `query` must match title, description, organization or
+        source, each as a prefix ("hack" finds "hackathon"). Punctuation is
+        ignored rather than parsed as FTS5 syntax. Archived rows are not searched.
+        """
+        tokens = FTS_TOKEN_PATTERN.findall(query or "")
+        if not tokens or limit <= 0:
+            return []
+        match = " ".join(f'"{token}"*' for token in tokens)
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, title, url, date_info, description
+                cursor.row_factory = hackathon_row_factory
+                cursor.execute(f'''
+                    SELECT {HACKATHON_COLUMNS}
                     FROM hackathons
-                    WHERE is_posted = FALSE
-                    ORDER BY id ASC
-                ''')
-                
-                columns = [desc[0] for desc in cursor.description]
-                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    JOIN (
+                        SELECT rowid, bm25(hackathons_fts, {weights}) AS score
+                        FROM hackathons_fts
+                        WHERE hackathons_fts MATCH ?
+                        ORDER BY score
+                        LIMIT ?
+                    ) matches ON matches.rowid = hackathons.id
+                    ORDER BY matches.score
+                ''', (match, limit))
+                return cursor.fetchall()
         except Exception as e:
-            logging.error(f"Error getting unposted hackathons: {e}")
+            logging.error(f"Error searching hackathons for {query!r}: {e}")
             return []
     
     def mark_as_posted(self, hackathon_id: int) -> bool:
         """Mark a hackathon as posted to Telegram."""
+        return self.mark_many_as_posted([hackathon_id]) > 0
+    
+    def mark_many_as_posted(self, entries: Iterable[Union[int, Tuple[int, str]]]) -> int:
+        """Mark many hackathons as posted in a single transaction.
+        
+        Entries are ids (stamped with the current time) or (id, posted_at) pairs
+        carrying the time Telegram accepted the message. Rows already posted are
+        left untouched. Returns the number of rows that changed state.
+        """
+        now = utc_timestamp()
+        updates = [
+            (entry[1], entry[0]) if isinstance(entry, tuple) else (now, entry)
+            for entry in entries
+        ]
+        if not updates:
+            return 0
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                cursor.executemany('''
                     UPDATE hackathons
-                    SET is_posted = TRUE
-                    WHERE id = ?
-                ''', (hackathon_id,))
-                conn.commit()
-                return True
+                    SET is_posted = TRUE, posted_at = ?
+                    WHERE id = ? AND is_posted = FALSE
+                ''', updates)
+                return cursor.rowcount
+        except Exception as e:
+            logging.error(f"Error marking hackathons as posted: {e}")
+            return 0
+    
+    def sync_channels(self, chat_ids: Iterable[Union[int, str]]) -> Dict[str, List[str]]:
+        """Register `chat_ids` as chats every hackathon is posted to.
+        
+        A new chat gets outbox rows for every hackathon not yet posted everywhere;
+        the first chat ever registered also adopts the rows queued before any
+        chat was configured. Chats registered earlier but missing from
+        `chat_ids` are left alone: a run with a different TELEGRAM_CHANNEL_ID
+        must not touch other channels' queues. Use remove_channels to stop
+        posting to a chat.
+        """
+        wanted = list(dict.fromkeys(str(chat_id) for chat_id in chat_ids if str(chat_id)))
+        if not wanted:
+            return {"added": []}
+        
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                existing = [row[0] for row in conn.execute("SELECT chat_id FROM channels")]
+                added = [chat_id for chat_id in wanted if chat_id not in existing]
+                
+                if not existing:
+                    conn.execute("UPDATE outbox SET chat_id = ? WHERE chat_id = ''", (wanted[0],))
+                conn.executemany("INSERT INTO channels (chat_id) VALUES (?)", [(chat_id,) for chat_id in added])
+                conn.executemany('''
+                    INSERT OR IGNORE INTO outbox (hackathon_id, chat_id)
+                    SELECT id, ? FROM hackathons WHERE is_posted = FALSE
+                ''', [(chat_id,) for chat_id in added])
+            
+            for chat_id in added:
+                logging.info(f"Posting to new chat {chat_id}")
+            return {"added": added}
+        except Exception as e:
+            logging.error(f"Error syncing channels: {e}")
+            return {"added": []}
+    
+    def remove_channels(self, chat_ids: Iterable[Union[int, str]]) -> List[str]:
+        """Stop posting to `chat_ids`: drop them and their unsent outbox rows.
+        
+        Hackathons a removed chat was the last holdout for count as posted.
+        This is never done implicitly; returns the chats actually removed.
+        """
+        chat_ids = list(dict.fromkeys(str(chat_id) for chat_id in chat_ids))
+        if not chat_ids:
+            return []
+        
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                placeholders = ", ".join("?" for _ in chat_ids)
+                removed = [row[0] for row in conn.execute(
+                    f"SELECT chat_id FROM channels WHERE chat_id IN ({placeholders})", chat_ids
+                )]
+                if not removed:
+                    return []
+                placeholders = ", ".join("?" for _ in removed)
+                conn.execute(f"DELETE FROM channels WHERE chat_id IN ({placeholders})", removed)
+                conn.execute(f"DELETE FROM outbox WHERE chat_id IN ({placeholders}) AND state != 'sent'", removed)
+                self._mark_fully_sent(conn, utc_timestamp())
+            
+            for chat_id in removed:
+                logging.info(f"Stopped posting to chat {chat_id}")
+            return removed
+        except Exception as e:
+            logging.error(f"Error removing channels: {e}")
+            return []
+    
+    @staticmethod
+    def _mark_fully_sent(conn: sqlite3.Connection, posted_at: str, hackathon_ids: Optional[List[int]] = None) -> int:
+        """Set is_posted on hackathons whose outbox rows have all been sent."""
+        scope = ""
+        if hackathon_ids is not None:
+            scope = f"AND id IN ({', '.join('?' for _ in hackathon_ids)})"
+        return conn.execute(f'''
+            UPDATE hackathons SET is_posted = TRUE, posted_at = ?
+            WHERE is_posted = FALSE {scope}
+                AND EXISTS (SELECT 1 FROM outbox WHERE hackathon_id = hackathons.id)
+                AND NOT EXISTS (SELECT 1 FROM outbox WHERE hackathon_id = hackathons.id AND state != 'sent')
+        ''', [posted_at, *(hackathon_ids or [])]).rowcount
+    
+    def claim_batch(self, limit: int, worker_id: str, lease_seconds: Optional[float] = None,
+                    chat_id: Union[int, str] = "", hackathon_ids: Optional[Iterable[int]] = None) -> List[Hackathon]:
+        """Atomically claim up to `limit` pending outbox rows of one chat for one posting worker.
+        
+        Claims whose lease has expired (a worker died mid-batch) are claimable
+        again. The IMMEDIATE transaction makes select-and-claim a single step, so
+        concurrent workers never receive the same row. Given `hackathon_ids`,
+        only rows for those hackathons are claimed. Leases default to
+        OUTBOX_LEASE_SECONDS.
+        """
+        lease_seconds = self.claim_lease if lease_seconds is None else lease_seconds
+        chat_id = str(chat_id)
+        now = time.time()
+        scope, scope_params = "", []
+        if hackathon_ids is not None:
+            scope_params = list(hackathon_ids)
+            if not scope_params:
+                return []
+            scope = f"AND hackathon_id IN ({', '.join('?' for _ in scope_params)})"
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                ids = [row[0] for row in conn.execute(f'''
+                    SELECT hackathon_id FROM outbox
+                    WHERE chat_id = ? AND (state = 'pending' OR (state = 'claimed' AND lease_expires_at < ?))
+                        {scope}
+                    ORDER BY hackathon_id
+                    LIMIT ?
+                ''', (chat_id, now, *scope_params, limit))]
+                if not ids:
+                    return []
+                
+                placeholders = ", ".join("?" for _ in ids)
+                conn.execute(f'''
+                    UPDATE outbox
+                    SET state = 'claimed', worker_id = ?, lease_expires_at = ?,
+                        attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                    WHERE chat_id = ? AND hackathon_id IN ({placeholders})
+                ''', [worker_id, now + lease_seconds, chat_id, *ids])
+                
+                cursor = conn.cursor()
+                cursor.row_factory = hackathon_row_factory
+                cursor.execute(f'''
+                    SELECT {HACKATHON_COLUMNS}
+                    FROM hackathons
+                    WHERE id IN ({placeholders})
+                    ORDER BY id
+                ''', ids)
+                return cursor.fetchall()
+        except Exception as e:
+            logging.error(f"Error claiming outbox batch: {e}")
+            return []
+    
+    def complete_claims(self, entries: Iterable[Union[int, Tuple[int, str]]], worker_id: str,
+                        chat_id: Union[int, str] = "") -> int:
+        """Mark claimed rows of one chat as sent, but only while `worker_id` still holds them.
+        
+        Entries are ids or (id, posted_at) pairs as in mark_many_as_posted. A
+        hackathon counts as posted once every chat's row for it has been sent.
+        Returns the number of rows completed.
+        """
+        chat_id = str(chat_id)
+        now = utc_timestamp()
+        updates = [
+            (entry[1], entry[0]) if isinstance(entry, tuple) else (now, entry)
+            for entry in entries
+        ]
+        if not updates:
+            return 0
+        
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                owned = []
+                for posted_at, hackathon_id in updates:
+                    cursor = conn.execute('''
+                        UPDATE outbox SET state = 'sent', worker_id = NULL, lease_expires_at = NULL,
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE hackathon_id = ? AND chat_id = ? AND state = 'claimed' AND worker_id = ?
+                    ''', (hackathon_id, chat_id, worker_id))
+                    if cursor.rowcount:
+                        owned.append((posted_at, hackathon_id))
+                
+                for posted_at, hackathon_id in owned:
+                    self._mark_fully_sent(conn, posted_at, [hackathon_id])
+            
+            if len(owned) < len(updates):
+                logging.warning(f"{len(updates) - len(owned)} claims were no longer held by {worker_id}")
+            return len(owned)
+        except Exception as e:
+            logging.error(f"Error completing outbox claims: {e}")
+            return 0
+    
+    def extend_claims(self, hackathon_ids: Iterable[int], worker_id: str, lease_seconds: Optional[float] = None,
+                      chat_id: Union[int, str] = "") -> List[int]:
+        """Renew the leases `worker_id` still holds on one chat's rows to `lease_seconds` from now.
+        
+        A poster calls this before each send, so a batch that goes out slowly
+        (a low learned rate, a RetryAfter pause) keeps its rows. Returns the ids
+        still held; a row whose lease ran out may already be with another worker.
+        """
+        ids = list(hackathon_ids)
+        if not ids:
+            return []
+        lease_seconds = self.claim_lease if lease_seconds is None else lease_seconds
+        chat_id = str(chat_id)
+        now = time.time()
+        placeholders = ", ".join("?" for _ in ids)
+        held_by_worker = f"chat_id = ? AND state = 'claimed' AND worker_id = ? AND hackathon_id IN ({placeholders})"
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Expired leases are not renewed: claim_batch may already have handed them out again
+                held = {row[0] for row in conn.execute(f'''
+                    SELECT hackathon_id FROM outbox WHERE {held_by_worker} AND lease_expires_at >= ?
+                ''', [chat_id, worker_id, *ids, now])}
+                conn.execute(f'''
+                    UPDATE outbox SET lease_expires_at = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE {held_by_worker} AND lease_expires_at >= ?
+                ''', [now + lease_seconds, chat_id, worker_id, *ids, now])
+            return [hackathon_id for hackathon_id in ids if hackathon_id in held]
+        except Exception as e:
+            logging.error(f"Error extending outbox claims: {e}")
+            return []
+    
+    def fail_claims(self, hackathon_ids: Iterable[int], worker_id: str, error: str = "",
+                    max_attempts: Optional[int] = None, chat_id: Union[int, str] = "") -> int:
+        """Release one chat's claims after a failed send; rows out of attempts move to 'failed'."""
+        max_attempts = self.max_attempts if max_attempts is None else max_attempts
+        updates = [(max_attempts, error, hackathon_id, str(chat_id), worker_id) for hackathon_id in hackathon_ids]
+        if not updates:
+            return 0
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.executemany('''
+                    UPDATE outbox
+                    SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                        worker_id = NULL, lease_expires_at = NULL, last_error = ?,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE hackathon_id = ? AND chat_id = ? AND state = 'claimed' AND worker_id = ?
+                ''', updates)
+                return cursor.rowcount
+        except Exception as e:
+            logging.error(f"Error failing outbox claims: {e}")
+            return 0
+    
+    def requeue_failed(self, older_than_hours: Optional[float] = None) -> int:
+        """Give outbox rows parked as 'failed' at least `older_than_hours` ago a fresh set of attempts.
+        
+        A rate-limit storm or an outage can use up every attempt of many rows
+        in a few minutes; this keeps such posts from being lost for good.
+        Returns the number of rows put back in the queue.
+        """
+        older_than_hours = self.failed_retry_hours if older_than_hours is None else older_than_hours
+        if older_than_hours <= 0:
+            return 0
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=older_than_hours)).strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.get_connection() as conn:
+                return conn.execute('''
+                    UPDATE outbox SET state = 'pending', attempts = 0, updated_at = CURRENT_TIMESTAMP
+                    WHERE state = 'failed' AND updated_at < ?
+                ''', (cutoff,)).rowcount
+        except Exception as e:
+            logging.error(f"Error requeueing failed outbox rows: {e}")
+            return 0
+    
+    def get_outbox_stats(self, by_chat: bool = False) -> Dict:
+        """Number of outbox rows in each state, optionally per chat ({chat_id: {state: count}})."""
+        try:
+            with self.get_connection() as conn:
+                if not by_chat:
+                    return dict(conn.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state").fetchall())
+                stats: Dict[str, Dict[str, int]] = {}
+                for chat_id, state, count in conn.execute(
+                    "SELECT chat_id, state, COUNT(*) FROM outbox GROUP BY chat_id, state"
+                ):
+                    stats.setdefault(chat_id, {})[state] = count
+                return stats
+        except Exception as e:
+            logging.error(f"Error getting outbox stats: {e}")
+            return {}
+    
+    def get_chat_rate(self, chat_id: Union[int, str]) -> Optional[float]:
+        """Send rate (messages per minute) learned for a chat in earlier runs, if any."""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT rate_per_minute FROM chat_pacing WHERE chat_id = ?", (str(chat_id),)
+                ).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logging.error(f"Error reading send rate for {chat_id}: {e}")
+            return None
+    
+    def save_chat_rate(self, chat_id: Union[int, str], rate_per_minute: float, retry_afters: int = 0) -> bool:
+        """Persist a chat's learned send rate; `retry_afters` is added to its running count."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    INSERT INTO chat_pacing (chat_id, rate_per_minute, retry_afters, updated_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(chat_id) DO UPDATE SET
+                        rate_per_minute = excluded.rate_per_minute,
+                        retry_afters = retry_afters + excluded.retry_afters,
+                        updated_at = excluded.updated_at
+                ''', (str(chat_id), rate_per_minute, retry_afters))
+            return True
+        except Exception as e:
+            logging.error(f"Error saving send rate for {chat_id}: {e}")
+            return False
+    
+    def get_http_validator(self, url: str) -> Optional[Dict]:
+        """ETag/Last-Modified stored for a scraped URL, with the result parsed from that response."""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute('''
+                    SELECT etag, last_modified, parser, result, body_bytes, parse_seconds
+                    FROM http_validators WHERE url = ?
+                ''', (url,)).fetchone()
+        except Exception as e:
+            logging.error(f"Error reading HTTP validators for {url}: {e}")
+            return None
+        if not row:
+            return None
+        etag, last_modified, parser, result, body_bytes, parse_seconds = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'parser': parser,
+            'result': unpack_text(result),
+            'body_bytes': body_bytes,
+            'parse_seconds': parse_seconds,
+        }
+    
+    def save_http_validator(self, url: str, etag: Optional[str], last_modified: Optional[str], parser: str,
+                            result: str, body_bytes: int, parse_seconds: float) -> bool:
+        """Remember a URL's validators and what `parser` made of the response (JSON text)."""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO http_validators
+                        (url, etag, last_modified, parser, result, body_bytes, parse_seconds, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (url, etag, last_modified, parser, pack_text(result, self.compress_min), body_bytes, parse_seconds))
+            return True
         except Exception as e:
-            logging.error(f"Error marking hackathon as posted: {e}")
+            logging.error(f"Error saving HTTP validators for {url}: {e}")
             return False
     
     def log_scraping_session(self, hackathons_found: int, new_hackathons: int, errors: str = "") -> None:
         """Log scraping session statistics."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO scraping_log (hackathons_found, new_hackathons, errors)
@@ -137,18 +1379,20 @@ class Database:
             logging.error(f"Error logging scraping session: {e}")
     
     def get_stats(self) -> Dict:
-        """Get database statistics."""
+        """Get database statistics from the precomputed counters."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Total hackathons
-                cursor.execute("SELECT COUNT(*) FROM hackathons")
-                total = cursor.fetchone()[0]
-                
-                # Posted hackathons
-                cursor.execute("SELECT COUNT(*) FROM hackathons WHERE is_posted = TRUE")
-                posted = cursor.fetchone()[0]
+                cursor.execute("SELECT name, value FROM hackathon_counters")
+                counters = dict(cursor.fetchall())
+                total = counters.get('total', 0)
+                posted = counters.get('posted', 0)
+                by_source = {
+                    name[len('source:'):]: value
+                    for name, value in counters.items()
+                    if name.startswith('source:') and value > 0
+                }
                 
                 # Recent scraping sessions
                 cursor.execute('''
@@ -159,12 +1403,278 @@ class Database:
                 ''')
                 recent_sessions = cursor.fetchall()
                 
+                cursor.execute("SELECT chat_id, rate_per_minute FROM chat_pacing")
+                send_rates = dict(cursor.fetchall())
+                
                 return {
                     "total_hackathons": total,
                     "posted_hackathons": posted,
                     "pending_hackathons": total - posted,
+                    "archived_hackathons": counters.get('archived', 0),
+                    "by_source": by_source,
+                    "send_rates": send_rates,
                     "recent_sessions": recent_sessions
                 }
         except Exception as e:
             logging.error(f"Error getting stats: {e}")
             return {}
+    
+    def enable_incremental_vacuum(self) -> bool:
+        """Switch an older file to auto_vacuum=INCREMENTAL (one full VACUUM).
+        
+        Returns True if the file was converted by this call.
+        """
+        conn = self.get_connection()
+        if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] == 2:
+            return False
+        
+        start = time.perf_counter()
+        conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM main")  # must run outside a transaction
+        logging.info(f"Converted database to incremental auto_vacuum in {time.perf_counter() - start:.2f}s")
+        return True
+    
+    def run_maintenance(self, retention_days: Optional[int] = None,
+                        unposted_retention_days: Optional[int] = None,
+                        log_retention_days: Optional[int] = None,
+                        vacuum_pages: Optional[int] = None,
+                        failed_retry_hours: Optional[float] = None) -> Dict:
+        """Archive old hackathons, trim scraping_log and give free pages back to the disk.
+        
+        Posted hackathons older than `retention_days` (by posted_at) and unposted
+        ones that have ended (ends_at, else deadline, before today) are moved to
+        the archive file. Unposted rows with no parsed date fall back to being
+        older than `unposted_retention_days` (by created_at). Rows currently
+        claimed by a poster are left alone. Outbox
+        rows failed for `failed_retry_hours` are queued again (requeue_failed).
+        `vacuum_pages` caps the incremental vacuum (None frees every free page).
+        Returns what was moved and freed, and how long the pass took.
+        """
+        retention_days = self.retention_days if retention_days is None else retention_days
+        if unposted_retention_days is None:
+            unposted_retention_days = self.unposted_retention_days
+        log_retention_days = self.log_retention_days if log_retention_days is None else log_retention_days
+        start = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        posted_cutoff = (now - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        today = now.strftime("%Y-%m-%d")
+        unposted_cutoff = (now - timedelta(days=unposted_retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        log_cutoff = (now - timedelta(days=log_retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        
+        try:
+            self.enable_incremental_vacuum()
+            conn = self.get_connection()
+            page_size = conn.execute("PRAGMA main.page_size").fetchone()[0]
+            pages_before = conn.execute("PRAGMA main.page_count").fetchone()[0]
+            file_before = self._file_bytes()
+            
+            # starts_at/ends_at/deadline are ISO dates, so they compare as text
+            expired = '''
+                (is_posted = TRUE AND posted_at < ?)
+                OR (is_posted = FALSE
+                    AND CASE WHEN COALESCE(ends_at, deadline) IS NOT NULL THEN COALESCE(ends_at, deadline) < ?
+                             ELSE created_at < ? END
+                    AND id NOT IN (SELECT hackathon_id FROM outbox WHERE state = 'claimed'))
+            '''
+            expired_params = (posted_cutoff, today, unposted_cutoff)
+            # Copy first, then delete only what the archive holds: with WAL a transaction
+            # spanning both files is not atomic, and a crash in between must not lose rows
+            with conn:
+                conn.execute(f'''
+                    INSERT OR REPLACE INTO archive.hackathons_archive
+                        (id, title, url, date_info, description, source, organization, starts_at, ends_at,
+                         deadline, prize, dedup_key, is_posted, posted_at, created_at)
+                    SELECT id, title, url, date_info, description, source, organization, starts_at, ends_at,
+                           deadline, prize, dedup_key, is_posted, posted_at, created_at
+                    FROM main.hackathons
+                    WHERE {expired}
+                ''', expired_params)
+            
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                archived = f'''
+                    FROM main.hackathons
+                    WHERE ({expired}) AND id IN (SELECT id FROM archive.hackathons_archive)
+                '''
+                archived_posted, archived_expired = conn.execute(
+                    f"SELECT COALESCE(SUM(is_posted = TRUE), 0), COALESCE(SUM(is_posted = FALSE), 0) {archived}",
+                    expired_params
+                ).fetchone()
+                conn.execute(f"DELETE {archived}", expired_params)
+                conn.execute('''
+                    INSERT INTO hackathon_counters (name, value)
+                    SELECT 'archived', COUNT(*) FROM archive.hackathons_archive WHERE true
+                    ON CONFLICT(name) DO UPDATE SET value = excluded.value
+                ''')
+                log_rows = conn.execute("DELETE FROM scraping_log WHERE scraped_at < ?", (log_cutoff,)).rowcount
+            
+            free_pages = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+            # executescript steps the pragma to completion; execute() frees a single page
+            conn.executescript(f"PRAGMA main.incremental_vacuum({int(vacuum_pages or 0)})")
+            if self.journal_mode == "WAL":
+                conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE)").fetchall()
+                conn.execute("PRAGMA archive.wal_checkpoint(TRUNCATE)").fetchall()
+            
+            requeued = self.requeue_failed(failed_retry_hours)
+            
+            pages_after = conn.execute("PRAGMA main.page_count").fetchone()[0]
+            result = {
+                "requeued_failed": requeued,
+                "archived_posted": archived_posted,
+                "archived_expired": archived_expired,
+                "log_rows_deleted": log_rows,
+                "free_pages": free_pages,
+                "reclaimed_bytes": (pages_before - pages_after) * page_size,
+                "file_bytes_before": file_before,
+                "file_bytes_after": self._file_bytes(),
+                "archive_bytes": self._file_bytes(self.archive_path),
+                "elapsed_seconds": round(time.perf_counter() - start, 3),
+            }
+            logging.info(
+                f"Maintenance: archived {archived_posted} posted + {archived_expired} expired hackathons, "
+                f"requeued {requeued} failed posts, deleted {log_rows} log rows, reclaimed {result['reclaimed_bytes'] / 1024:.0f} KiB "
+                f"in {result['elapsed_seconds']:.2f}s"
+            )
+            return result
+        except Exception as e:
+            logging.error(f"Error running database maintenance: {e}")
+            return {}
+    
+    def _file_bytes(self, path: Optional[str] = None) -> int:
+        """Size of a database file (the main one by default) plus its WAL."""
+        path = path or self.db_path
+        return sum(
+            os.path.getsize(path)
+            for path in (path, f"{path}-wal")
+            if os.path.exists(path)
+        )
+    
+    def backup(self, keep: Optional[int] = None) -> Dict:
+        """Take an online snapshot into backup_dir, keeping the `keep` newest (DB_BACKUP_KEEP)."""
+        try:
+            return create_snapshot(self.db_path, self.backup_dir, self.archive_path, keep=keep)
+        except Exception as e:
+            logging.error(f"Error backing up database: {e}")
+            return {}
+    
+    def check_counters(self, repair: bool = True) -> bool:
+        """Compare the counters with real COUNT(*) values, rebuilding them on drift.
+        
+        Returns True when the counters were already consistent.
+        """
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                stored = dict(conn.execute("SELECT name, value FROM hackathon_counters WHERE value != 0"))
+                rebuild_counters(conn)
+                actual = dict(conn.execute("SELECT name, value FROM hackathon_counters WHERE value != 0"))
+                if not repair:
+                    conn.rollback()
+            
+            if stored != actual:
+                logging.warning(f"Hackathon counters drifted (stored={stored}, actual={actual})"
+                                + (", rebuilt" if repair else ""))
+                return False
+            return True
+        except Exception as e:
+            logging.error(f"Error checking counters: {e}")
+            return False
+
+
+class AsyncDatabase:
+    """Awaitable facade over Database for code running on an event loop.
+    
+    Every call is dispatched to one dedicated thread, so SQLite never blocks the
+    loop and all writes from the process are serialised through a single writer.
+    """
+    
+    def __init__(self, db: Database):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+    
+    async def _run(self, func: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def get_unposted(self, limit: Optional[int] = None) -> List[Hackathon]:
+        return await self._run(self.db.get_unposted_hackathons, limit=limit)
+    
+    async def mark_posted(self, entries: Iterable[Union[int, Tuple[int, str]]]) -> int:
+        return await self._run(self.db.mark_many_as_posted, list(entries))
+    
+    async def add_many(self, hackathons: Iterable[Hackathon]) -> List[Hackathon]:
+        return await self._run(self.db.add_hackathons, list(hackathons))
+    
+    async def get_stats(self) -> Dict:
+        return await self._run(self.db.get_stats)
+    
+    async def search(self, query: str, limit: int = 20) -> List[Hackathon]:
+        return await self._run(self.db.search, query, limit)
+    
+    async def get_chat_rate(self, chat_id: Union[int, str]) -> Optional[float]:
+        return await self._run(self.db.get_chat_rate, chat_id)
+    
+    async def save_chat_rate(self, chat_id: Union[int, str], rate_per_minute: float, retry_afters: int = 0) -> bool:
+        return await self._run(self.db.save_chat_rate, chat_id, rate_per_minute, retry_afters)
+    
+    async def get_outbox_stats(self, by_chat: bool = False) -> Dict:
+        return await self._run(self.db.get_outbox_stats, by_chat)
+    
+    async def sync_channels(self, chat_ids: Iterable[Union[int, str]]) -> Dict[str, List[str]]:
+        return await self._run(self.db.sync_channels, list(chat_ids))
+    
+    async def remove_channels(self, chat_ids: Iterable[Union[int, str]]) -> List[str]:
+        return await self._run(self.db.remove_channels, list(chat_ids))
+    
+    async def claim_batch(self, limit: int, worker_id: str, lease_seconds: Optional[float] = None,
+                          chat_id: Union[int, str] = "", hackathon_ids: Optional[Iterable[int]] = None) -> List[Hackathon]:
+        return await self._run(self.db.claim_batch, limit, worker_id, lease_seconds, chat_id=chat_id,
+                               hackathon_ids=None if hackathon_ids is None else list(hackathon_ids))
+    
+    async def complete_claims(self, entries: Iterable[Union[int, Tuple[int, str]]], worker_id: str,
+                              chat_id: Union[int, str] = "") -> int:
+        return await self._run(self.db.complete_claims, list(entries), worker_id, chat_id=chat_id)
+    
+    async def extend_claims(self, hackathon_ids: Iterable[int], worker_id: str,
+                            lease_seconds: Optional[float] = None, chat_id: Union[int, str] = "") -> List[int]:
+        return await self._run(self.db.extend_claims, list(hackathon_ids), worker_id, lease_seconds, chat_id=chat_id)
+    
+    async def fail_claims(self, hackathon_ids: Iterable[int], worker_id: str, error: str = "",
+                          chat_id: Union[int, str] = "") -> int:
+        return await self._run(self.db.fail_claims, list(hackathon_ids), worker_id, error, chat_id=chat_id)
+    
+    def close(self) -> None:
+        """Stop the writer thread after pending calls finish."""
+        self._executor.shutdown(wait=True)
+
+
+def run_database_maintenance() -> None:
+    """Scheduled job: archive old hackathons, requeue failed posts, trim the scraping log and vacuum."""
+    try:
+        logging.info("Starting database maintenance...")
+        db = Database()
+        result = db.run_maintenance()
+        db.close()
+        if result:
+            logging.info(f"Database maintenance completed: reclaimed {result['reclaimed_bytes']} bytes "
+                         f"in {result['elapsed_seconds']}s")
+        else:
+            logging.error("Database maintenance failed")
+    except Exception as e:
+        logging.error(f"Error running database maintenance: {e}")
+
+
+def run_database_backup() -> None:
+    """Scheduled job: snapshot the database onto the persistent disk."""
+    try:
+        logging.info("Starting database backup...")
+        db = Database()
+        result = db.backup()
+        db.close()
+        if result:
+            logging.info(f"Database backup completed: {result['bytes']} bytes in {result['elapsed_seconds']}s")
+        else:
+            logging.error("Database backup failed")
+    except Exception as e:
+        logging.error(f"Error running database backup: {e}")
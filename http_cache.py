@@ -0,0 +1,235 @@
+"""
+On-disk HTTP response cache for the scrapers.
+
+CachedSession is a requests.Session that answers GETs from a SQLite file
+(http_cache.db) while the stored response is fresh. The cache key is the URL
+plus the request headers that change what a site serves (Accept,
+Accept-Language, User-Agent). Bodies are stored zlib-compressed. Each entry
+lives for a TTL the caller chooses per request (sources pass their own),
+defaulting to HTTP_CACHE_TTL. When the stored bodies exceed
+HTTP_CACHE_MAX_BYTES, the least recently used entries are evicted.
+
+This makes a second run soon after the first (start-up run, then the first
+scheduled one) free, and lets changed selectors be re-run against pages
+already on disk.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from settings import env
+
+logger = logging.getLogger(__name__)
+
+# Request headers that select a different representation of the same URL
+KEY_HEADERS = ("Accept", "Accept-Language", "User-Agent")
+# Response headers worth keeping with the body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class ResponseCache:
+    """Size-bounded store of GET responses with per-entry expiry and LRU eviction.
+
+    One connection guarded by a lock, so a session shared by the scrape
+    engine's worker threads can use it. Settings left as None are read from
+    HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES (compressed bodies) and
+    HTTP_CACHE_TTL (seconds) when the cache is constructed.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 default_ttl: Optional[float] = None, clock=time.time):
+        path = configured_cache_path() if path is None else path
+        self.path = path
+        self.max_bytes = env("HTTP_CACHE_MAX_BYTES", 50 * 1024 * 1024, int) if max_bytes is None else max_bytes
+        self.default_ttl = env("HTTP_CACHE_TTL", 900.0, float) if default_ttl is None else default_ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0  # misses that found a stale entry
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_served = 0  # uncompressed bodies answered from the cache
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+
+    @staticmethod
+    def key(url: str, headers) -> str:
+        parts = [url] + [f"{name}:{headers.get(name, '')}" for name in KEY_HEADERS]
+        return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+    def get(self, url: str, headers) -> Optional[requests.Response]:
+        """The stored response if it is still fresh."""
+        key = self.key(url, headers)
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[3] <= now:
+                self.misses += 1
+                self.expired += row is not None
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        status, stored_headers, body, _ = row
+        body = zlib.decompress(body)
+        with self._lock:
+            self.bytes_served += len(body)
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(stored_headers))
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = url
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+    def put(self, url: str, headers, response: requests.Response, ttl: Optional[float] = None) -> bool:
+        """Store a 200 response for `ttl` seconds, then evict down to the byte budget."""
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return False
+        body = zlib.compress(response.content, 6)
+        if len(body) > self.max_bytes:
+            return False
+        kept = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        now = self.clock()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO responses
+                    (key, url, status, headers, body, size, stored_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (self.key(url, headers), url, response.status_code, json.dumps(kept), body, len(body),
+                  now, now + ttl, now))
+            self.stores += 1
+            self._evict()
+        return True
+
+    def refresh(self, url: str, headers, ttl: Optional[float] = None) -> bool:
+        """Extend a stored entry after the site confirmed it unchanged (304)."""
+        now = self.clock()
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                (now + ttl, now, self.key(url, headers))
+            )
+        return cursor.rowcount > 0
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the bodies fit in max_bytes (lock held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "bytes_served": self.bytes_served,
+        }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        return (f"{stats['hits']} hits, {stats['misses']} misses ({stats['expired']} expired), "
+                f"{stats['evictions']} evicted, {stats['entries']} entries in "
+                f"{stats['bytes'] / 1024:.0f}/{stats['max_bytes'] / 1024:.0f} KiB")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class CachedSession(requests.Session):
+    """requests.Session answering GETs from a ResponseCache while entries are fresh.
+
+    get(url, cache_ttl=...) sets the entry's lifetime; other methods and
+    non-200 responses pass straight through. A 304 to a conditional request
+    extends the stored entry's lifetime.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, *args, cache_ttl: Optional[float] = None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, *args, **kwargs)
+        headers = CaseInsensitiveDict(self.headers)
+        headers.update(kwargs.get("headers") or {})
+        cached = self.cache.get(url, headers)
+        if cached is not None:
+            return cached
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 200:
+            self.cache.put(url, headers, response, cache_ttl)
+        elif response.status_code == 304:
+            self.cache.refresh(url, headers, cache_ttl)
+        return response
+
+
+_shared: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def configured_cache_path() -> str:
+    """HTTP_CACHE_PATH; empty disables the cache."""
+    return env("HTTP_CACHE_PATH", "http_cache.db")
+
+
+def default_cache() -> Optional[ResponseCache]:
+    """The process-wide cache at HTTP_CACHE_PATH, or None when that is empty."""
+    global _shared
+    if not configured_cache_path():
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = ResponseCache()
+        return _shared
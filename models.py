@@ -0,0 +1,112 @@
+"""
+Record types shared by the scrapers, the database layer and the Telegram bot.
+"""
+
+import re
+import sqlite3
+import zlib
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Optional, Tuple, Union
+
+
+@dataclass(slots=True)
+class Hackathon:
+    """One hackathon listing.
+
+    Scrapers build these without an id; rows read back from the database carry
+    theirs. Slotted, so there is no per-instance __dict__. Not frozen: a frozen
+    __init__ costs ~5x more per row, so treat records as read-only and derive
+    changed copies with with_id() or dataclasses.replace().
+
+    `description` is the raw summary from the listing; the Telegram message is
+    rendered from these fields at post time. `date_info` keeps the scraped date
+    text, while starts_at/ends_at/deadline hold ISO dates when it could be parsed.
+    """
+    title: str
+    url: str
+    date_info: str = ""
+    description: str = ""
+    source: Optional[str] = None
+    organization: Optional[str] = None
+    starts_at: Optional[str] = None
+    ends_at: Optional[str] = None
+    deadline: Optional[str] = None
+    prize: Optional[str] = None
+    id: Optional[int] = None
+
+    def with_id(self, hackathon_id: int) -> "Hackathon":
+        return replace(self, id=hackathon_id)
+
+
+# Column list matching Hackathon's field order, for SELECTs read through hackathon_row_factory
+HACKATHON_COLUMNS = "title, url, date_info, description, source, organization, starts_at, ends_at, deadline, prize, id"
+
+
+def pack_text(text: Optional[str], min_size: int) -> Union[str, bytes, None]:
+    """zlib-compress text of at least `min_size` bytes (0 disables) when that makes it smaller.
+
+    Compressed values are stored as BLOBs, plain ones as TEXT, so the column
+    type alone tells unpack_text what to do.
+    """
+    if not text or min_size <= 0:
+        return text
+    raw = text.encode()
+    if len(raw) < min_size:
+        return text
+    packed = zlib.compress(raw, 9)
+    return packed if len(packed) < len(raw) else text
+
+
+def unpack_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """Inverse of pack_text; also registered as an SQL function on every connection."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode()
+    return value
+
+
+def hackathon_row_factory(cursor: sqlite3.Cursor, row: Tuple) -> Hackathon:
+    """sqlite3 row factory for queries selecting HACKATHON_COLUMNS."""
+    if type(row[3]) is bytes:
+        row = row[:3] + (unpack_text(row[3]),) + row[4:]
+    return Hackathon(*row)
+
+
+DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y")
+
+
+def parse_date(text: Optional[str]) -> Optional[str]:
+    """ISO date (YYYY-MM-DD) of scraped date text, or None if it is not a plain date."""
+    if not text:
+        return None
+    text = " ".join(text.replace(",", ", ").split()).replace(" ,", ",")
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+ORGANIZATION_PATTERN = re.compile(r"^Organization: (?P<organization>.*?) \| Source: (?P<source>.*)$")
+
+
+def parse_legacy_description(description: Optional[str]) -> Dict[str, Optional[str]]:
+    """Split a description stored before the structured columns existed.
+
+    fast_scraper stored the whole rendered message ("🚀 title / source / 📅 date /
+    📝 summary / 🔗 url / hashtags") and comprehensive_scraper stored
+    "Organization: X | Source: Y". Anything else already is a raw summary.
+    """
+    text = description or ""
+    match = ORGANIZATION_PATTERN.match(text)
+    if match:
+        return {'description': "", 'organization': match['organization'], 'source': match['source']}
+
+    lines = text.split("\n")
+    if lines and lines[0].startswith("🚀"):
+        summary = next((line[len("📝"):].strip() for line in lines if line.startswith("📝")), "")
+        source = lines[1].strip() if len(lines) > 1 and not lines[1].startswith(("📅", "📝", "🔗")) else None
+        return {'description': summary, 'organization': None, 'source': source}
+
+    return {'description': text, 'organization': None, 'source': None}
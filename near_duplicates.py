@@ -0,0 +1,212 @@
+"""
+Near-duplicate detection for hackathon titles using MinHash signatures and LSH banding.
+
+The same event is often listed on DevPost, Unstop and Devfolio under slightly
+different titles and URLs, so the exact title|url hash cannot match them. Titles
+are normalized, split into character shingles and reduced to a MinHash signature.
+Signatures are cut into bands; only hackathons sharing at least one band bucket
+are compared, which keeps lookups far away from a full-table scan.
+
+A similar title alone is not enough. Yearly editions ("... 2025" vs
+"... 2026"), two pages on the same site, and listings with different dates
+are different events (see distinct_events).
+"""
+
+import hashlib
+import re
+import sqlite3
+import unicodedata
+import zlib
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+# Filler that varies between listings of the same event
+NOISE_WORDS = {"the", "a", "an", "of", "and", "presents", "edition", "official", "online", "virtual"}
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents and punctuation, drop filler words."""
+    text = unicodedata.normalize("NFKD", title or "").encode("ascii", "ignore").decode()
+    text = text.lower().replace("&", " and ")
+    words = re.findall(r"[a-z0-9]+", text)
+    return " ".join(word for word in words if word not in NOISE_WORDS)
+
+
+def title_years(title: str) -> Set[str]:
+    """Years named in a title, e.g. {"2025"} for "Smart India Hackathon 2025"."""
+    return set(YEAR_PATTERN.findall(normalize_title(title)))
+
+
+def distinct_events(a: Any, b: Any) -> bool:
+    """Whether two listings with similar titles are still different events.
+
+    `a` and `b` are Hackathon-like (title, url, and optionally starts_at and
+    deadline). They differ when both titles name years and the years differ,
+    when they are different pages on the same site (a site lists an event
+    once), or when both carry start dates (else deadlines) that differ.
+    """
+    years_a, years_b = title_years(a.title), title_years(b.title)
+    if years_a and years_b and years_a != years_b:
+        return True
+
+    url_a, url_b = urlsplit(a.url or ""), urlsplit(b.url or "")
+    host_a, host_b = url_a.netloc.lower().removeprefix("www."), url_b.netloc.lower().removeprefix("www.")
+    if host_a and host_a == host_b and url_a.path.rstrip("/") != url_b.path.rstrip("/"):
+        return True
+
+    for field in ("starts_at", "deadline"):
+        date_a, date_b = getattr(a, field, None), getattr(b, field, None)
+        if date_a and date_b:
+            return date_a != date_b
+    return False
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Character shingles of a normalized title (the whole text if it is shorter)."""
+    text = f" {text} "
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class MinHasher:
+    """Deterministic MinHash over universal hash functions (a*x + b) mod p."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        self.permutations = []
+        for i in range(num_perm):
+            digest = hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=16).digest()
+            a = int.from_bytes(digest[:8], "big") % (MERSENNE_PRIME - 1) + 1
+            b = int.from_bytes(digest[8:], "big") % MERSENNE_PRIME
+            self.permutations.append((a, b))
+
+    def signature(self, title: str) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles(normalize_title(title))]
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in self.permutations
+        )
+
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: the share of matching signature slots."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def pack_signature(signature: Tuple[int, ...]) -> bytes:
+    return array("Q", signature).tobytes()
+
+
+def unpack_signature(blob: bytes) -> Tuple[int, ...]:
+    values = array("Q")
+    values.frombytes(blob)
+    return tuple(values)
+
+
+class NearDuplicateIndex:
+    """LSH index over MinHash signatures, persisted in near_dup_* tables.
+
+    With 16 bands of 4 rows two titles share a bucket with probability
+    1-(1-s^4)^16: ~99.9% at similarity 0.8, ~12% at 0.3, so only a small
+    blocked subset ever reaches the signature comparison.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+
+    def signature(self, title: str) -> Tuple[int, ...]:
+        return self.hasher.signature(title)
+
+    def band_buckets(self, signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+        """(band, bucket) pairs, buckets as signed 64-bit ints so they fit SQLite INTEGER."""
+        buckets = []
+        for band in range(self.bands):
+            chunk = array("Q", signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, "big", signed=True)))
+        return buckets
+
+    def find_match(self, conn: sqlite3.Connection, signature: Tuple[int, ...],
+                   accept: Optional[Callable[[int], bool]] = None) -> Optional[Tuple[int, float]]:
+        """Return (hackathon_id, similarity) of the best stored match above threshold.
+
+        `accept(hackathon_id)` can veto candidates (e.g. another year's edition);
+        the best one it accepts is returned.
+        """
+        buckets = self.band_buckets(signature)
+        placeholders = ", ".join("(?, ?)" for _ in buckets)
+        rows = conn.execute(f'''
+            SELECT s.hackathon_id, s.signature
+            FROM near_dup_signatures s
+            WHERE s.hackathon_id IN (
+                SELECT nb.hackathon_id
+                FROM (VALUES {placeholders}) AS probe
+                JOIN near_dup_buckets nb ON nb.band = probe.column1 AND nb.bucket = probe.column2
+            )
+        ''', [value for pair in buckets for value in pair]).fetchall()
+
+        candidates = []
+        for hackathon_id, blob in rows:
+            score = similarity(signature, unpack_signature(blob))
+            if score >= self.threshold:
+                candidates.append((hackathon_id, score))
+        for hackathon_id, score in sorted(candidates, key=lambda candidate: -candidate[1]):
+            if accept is None or accept(hackathon_id):
+                return hackathon_id, score
+        return None
+
+    def add(self, conn: sqlite3.Connection, hackathon_id: int, signature: Tuple[int, ...]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO near_dup_signatures (hackathon_id, signature) VALUES (?, ?)",
+            (hackathon_id, pack_signature(signature))
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO near_dup_buckets (band, bucket, hackathon_id) VALUES (?, ?, ?)",
+            [(band, bucket, hackathon_id) for band, bucket in self.band_buckets(signature)]
+        )
+
+    def rebuild(self, conn: sqlite3.Connection) -> int:
+        """Re-index every stored hackathon title. Returns the number indexed."""
+        conn.execute("DELETE FROM near_dup_buckets")
+        conn.execute("DELETE FROM near_dup_signatures")
+        count = 0
+        for hackathon_id, title in conn.execute("SELECT id, title FROM hackathons").fetchall():
+            self.add(conn, hackathon_id, self.signature(title))
+            count += 1
+        return count
+
+
+class BatchMatcher:
+    """In-memory LSH over the rows of a single batch, so a batch cannot add two variants of one event."""
+
+    def __init__(self, index: NearDuplicateIndex):
+        self.index = index
+        self.buckets: Dict[Tuple[int, int], List[Tuple[Tuple[int, ...], Any]]] = {}
+
+    def seen(self, signature: Tuple[int, ...], accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """The earlier batch item matching `signature` (that `accept` agrees with), if any."""
+        for key in self.index.band_buckets(signature):
+            for other, item in self.buckets.get(key, ()):
+                if similarity(signature, other) >= self.index.threshold and (accept is None or accept(item)):
+                    return item
+        return None
+
+    def add(self, signature: Tuple[int, ...], item: Any) -> None:
+        for key in self.index.band_buckets(signature):
+            self.buckets.setdefault(key, []).append((signature, item))
+
+
+def brute_force_match(signature: Tuple[int, ...], signatures: Iterable[Tuple[int, ...]], threshold: float) -> bool:
+    """Reference O(n) comparison, used by the benchmarks as the baseline."""
+    return any(similarity(signature, other) >= threshold for other in signatures)
@@ -34,12 +34,12 @@ async def post_unposted_hackathons():
     # Display what we're about to post
     print("\n📋 Hackathons to post:")
     for i, hackathon in enumerate(unposted, 1):
-        # hackathon is a dictionary from database
-        print(f"{i}. {hackathon['title']}")
+        # hackathon is a Hackathon record from the database
+        print(f"{i}. {hackathon.title}")
     
     # Post them
     try:
-        await telegram_bot.post_hackathons(unposted)
+        await telegram_bot.post_hackathons(max_posts=len(unposted))
         print("✅ Successfully posted all hackathons to Telegram!")
         
         # Check final stats
@@ -0,0 +1,222 @@
+"""
+Token-bucket rate limiting for Telegram sends.
+
+Telegram accepts about 30 messages per second from one bot and about 20 per
+minute into one channel or group. TelegramRateLimiter keeps a bucket for the
+global budget and one per chat. Every sender in the process awaits the same
+instance (shared_limiter()), so concurrent posters split the budgets instead
+of each assuming they own them.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Union
+
+from settings import env
+
+ChatId = Union[int, str]
+
+
+class TokenBucket:
+    """Token bucket of `capacity` tokens refilled at `rate` tokens per second.
+
+    The state is kept as the time the bucket would be full again (the GCRA form
+    of a token bucket), so a send can be scheduled ahead: reserve() books the
+    next token and returns when it may be used. Bursts of up to `capacity`
+    sends go through at once when the bucket is full, so any window of `w`
+    seconds holds at most capacity + rate * w sends.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.clock = clock
+        self.capacity = max(1, int(capacity))
+        self.rate = rate
+        self._full_at = clock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self._rate = rate
+        self.interval = 1.0 / rate
+
+    def earliest(self, now: Optional[float] = None) -> float:
+        """Earliest time a token is available, without taking it."""
+        now = self.clock() if now is None else now
+        return max(now, self._full_at - (self.capacity - 1) * self.interval)
+
+    def take(self, at: float) -> None:
+        """Consume one token at time `at` (no earlier than earliest())."""
+        self._full_at = max(self._full_at, at) + self.interval
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Book the next token; return the time it may be used."""
+        at = self.earliest(now)
+        self.take(at)
+        return at
+
+    def pause_until(self, at: float) -> None:
+        """Hand out no token before `at`."""
+        self._full_at = max(self._full_at, at + (self.capacity - 1) * self.interval)
+
+    def tokens(self, now: Optional[float] = None) -> float:
+        """Tokens available right now (negative while sends are booked ahead)."""
+        now = self.clock() if now is None else now
+        return min(self.capacity, self.capacity - (self._full_at - now) * self.rate)
+
+
+class TelegramRateLimiter:
+    """Global and per-chat token buckets in front of every Telegram send.
+
+    acquire() books a slot in both the global bucket and the chat's bucket at
+    the first instant both have a token, then sleeps until then. Booking happens
+    before any await, so callers on one loop (or several threads) are served in
+    arrival order without a lock being held while they wait. A cancelled wait
+    keeps its booking; the slot is simply left unused.
+
+    Per-chat rates adapt AIMD-style to what Telegram accepts: a RetryAfter
+    pauses the chat for the time asked and multiplies its rate by
+    `rate_decrease`; every `success_run` sends in a row without one add
+    `rate_increase` messages per minute, up to `chat_rate_max`.
+
+    Settings left as None are read from the TELEGRAM_* environment variables
+    (and .env) when the limiter is constructed.
+    """
+
+    def __init__(self, global_rate: Optional[float] = None, global_burst: Optional[int] = None,
+                 chat_rate_per_minute: Optional[float] = None, chat_burst: Optional[int] = None,
+                 chat_rate_min: Optional[float] = None, chat_rate_max: Optional[float] = None,
+                 rate_increase: Optional[float] = None, rate_decrease: Optional[float] = None,
+                 success_run: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep):
+        # Messages per second over all chats and per minute into one chat; a default 5-post run goes out at once
+        global_rate = env("TELEGRAM_GLOBAL_RATE", 30.0, float) if global_rate is None else global_rate
+        global_burst = env("TELEGRAM_GLOBAL_BURST", 1, int) if global_burst is None else global_burst
+        if chat_rate_per_minute is None:
+            chat_rate_per_minute = env("TELEGRAM_CHAT_RATE", 20.0, float)
+        chat_burst = env("TELEGRAM_CHAT_BURST", 5, int) if chat_burst is None else chat_burst
+
+        # AIMD pacing of the per-chat rate, in messages per minute. Telegram's per-chat
+        # limit is about the configured rate; probing above it only draws RetryAfters.
+        chat_rate_min = env("TELEGRAM_CHAT_RATE_MIN", 1.0, float) if chat_rate_min is None else chat_rate_min
+        if chat_rate_max is None:
+            chat_rate_max = env("TELEGRAM_CHAT_RATE_MAX", chat_rate_per_minute, float)
+        rate_increase = env("TELEGRAM_RATE_INCREASE", 1.0, float) if rate_increase is None else rate_increase
+        rate_decrease = env("TELEGRAM_RATE_DECREASE", 0.7, float) if rate_decrease is None else rate_decrease
+        success_run = env("TELEGRAM_SUCCESS_RUN", 10, int) if success_run is None else success_run
+
+        self.clock = clock
+        self.sleep = sleep
+        self.chat_rate = chat_rate_per_minute / 60.0
+        self.chat_burst = chat_burst
+        self.chat_rate_min = chat_rate_min / 60.0
+        self.chat_rate_max = max(chat_rate_max, chat_rate_per_minute) / 60.0
+        self.rate_increase = rate_increase / 60.0
+        self.rate_decrease = rate_decrease
+        self.success_run = max(1, success_run)
+        self.global_bucket = TokenBucket(global_rate, global_burst, clock)
+        self._chats: Dict[ChatId, TokenBucket] = {}
+        self._successes: Dict[ChatId, int] = {}
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+        self.acquired = 0
+        self.retry_afters = 0
+
+    def chat_bucket(self, chat_id: ChatId) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, self.clock)
+        return bucket
+
+    def chat_rate_per_minute(self, chat_id: ChatId) -> float:
+        """Current send rate to `chat_id`, in messages per minute."""
+        with self._lock:
+            return self.chat_bucket(chat_id).rate * 60.0
+
+    def set_chat_rate(self, chat_id: ChatId, rate_per_minute: float) -> float:
+        """Set a chat's rate (e.g. one learned in an earlier run), clamped to the allowed range."""
+        rate = min(self.chat_rate_max, max(self.chat_rate_min, rate_per_minute / 60.0))
+        with self._lock:
+            self.chat_bucket(chat_id).rate = rate
+            self._successes[chat_id] = 0
+        return rate * 60.0
+
+    def on_success(self, chat_id: ChatId) -> None:
+        """Additive increase after every `success_run` sends in a row."""
+        with self._lock:
+            count = self._successes.get(chat_id, 0) + 1
+            if count >= self.success_run:
+                bucket = self.chat_bucket(chat_id)
+                bucket.rate = min(self.chat_rate_max, bucket.rate + self.rate_increase)
+                count = 0
+            self._successes[chat_id] = count
+
+    def on_retry_after(self, chat_id: ChatId, retry_after: float) -> float:
+        """Multiplicative decrease, and no sends to the chat until Telegram's wait is over.
+
+        Returns the new rate in messages per minute.
+        """
+        with self._lock:
+            bucket = self.chat_bucket(chat_id)
+            bucket.rate = max(self.chat_rate_min, bucket.rate * self.rate_decrease)
+            bucket.pause_until(self.clock() + retry_after)
+            self._successes[chat_id] = 0
+            self.retry_afters += 1
+            return bucket.rate * 60.0
+
+    def delay(self, chat_id: ChatId) -> float:
+        """Seconds until a send to `chat_id` could go out, without booking it."""
+        with self._lock:
+            now = self.clock()
+            return max(self.chat_bucket(chat_id).earliest(now), self.global_bucket.earliest(now)) - now
+
+    def reserve(self, chat_id: ChatId) -> float:
+        """Book the next send to `chat_id`; return how many seconds to wait for it."""
+        with self._lock:
+            now = self.clock()
+            chat = self.chat_bucket(chat_id)
+            at = max(chat.earliest(now), self.global_bucket.earliest(now))
+            chat.take(at)
+            self.global_bucket.take(at)
+            self.acquired += 1
+            self.waited_seconds += at - now
+            return at - now
+
+    async def acquire(self, chat_id: ChatId) -> float:
+        """Wait for a send slot to `chat_id`; return the seconds waited."""
+        delay = self.reserve(chat_id)
+        if delay > 0:
+            await self.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict:
+        now = self.clock()
+        return {
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "retry_afters": self.retry_afters,
+            "chat_rates_per_minute": {chat_id: round(bucket.rate * 60.0, 2) for chat_id, bucket in self._chats.items()},
+            "global_tokens": round(self.global_bucket.tokens(now), 2),
+            "chat_tokens": {chat_id: round(bucket.tokens(now), 2) for chat_id, bucket in self._chats.items()},
+        }
+
+
+_shared: Optional[TelegramRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> TelegramRateLimiter:
+    """The process-wide limiter used by every TelegramBot unless one is passed in."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TelegramRateLimiter()
+        return _shared
@@ -14,9 +14,14 @@ from dotenv import load_dotenv
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+from database import run_database_backup, run_database_maintenance
+
 # Load environment variables
 load_dotenv()
 
+MAINTENANCE_TIME = os.getenv("MAINTENANCE_TIME", "03:30")
+BACKUP_INTERVAL_HOURS = int(os.getenv("DB_BACKUP_INTERVAL_HOURS", "6"))
+
 # Setup logging without emojis
 logging.basicConfig(
     level=logging.INFO,
@@ -142,6 +147,9 @@ def main():
         
         # Schedule the comprehensive search every 6 hours
         schedule.every(6).hours.do(daily_comprehensive_search)
+        schedule.every().day.at(MAINTENANCE_TIME).do(run_database_maintenance)
+        if os.getenv("DB_BACKUP_DIR"):
+            schedule.every(BACKUP_INTERVAL_HOURS).hours.do(run_database_backup)
         
         # Run initial search (with error handling)
         logging.info("Running initial cloud-compatible search...")
@@ -0,0 +1,161 @@
+"""
+Concurrent scraping engine.
+
+Every source, and every candidate URL within a source, is fetched at the same
+time on a bounded thread pool (the fetchers are blocking requests/BeautifulSoup
+code). Within a source the first candidate URL that yields hackathons wins and
+the others are dropped. Each source has its own timeout and the whole run has
+a deadline, so a run takes about as long as its slowest source rather than the
+sum of all of them. Results are merged, deduplicated by URL, as sources finish.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from models import Hackathon
+from settings import env
+
+logger = logging.getLogger(__name__)
+
+# fetch(url, timeout) -> hackathons found at url; blocking, runs in a worker thread
+Fetcher = Callable[[str, float], List[Hackathon]]
+
+
+@dataclass
+class SourceJob:
+    """One source to scrape: candidate URLs tried concurrently, first hit wins.
+
+    `fallback` (blocking, no arguments) runs when the candidates found fewer
+    than `min_results` hackathons, e.g. a Selenium pass for pages that need
+    JavaScript; what it finds is added. It counts against the source's timeout,
+    in seconds (SCRAPE_SOURCE_TIMEOUT unless given).
+    """
+    name: str
+    urls: Sequence[str]
+    fetch: Fetcher
+    timeout: float = field(default_factory=lambda: env("SCRAPE_SOURCE_TIMEOUT", 20.0, float))
+    fallback: Optional[Callable[[], List[Hackathon]]] = None
+    min_results: int = 1
+
+
+@dataclass
+class SourceResult:
+    name: str
+    hackathons: List[Hackathon] = field(default_factory=list)
+    url: Optional[str] = None  # the candidate that produced the hackathons
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+@dataclass
+class ScrapeReport:
+    hackathons: List[Hackathon] = field(default_factory=list)  # merged, unique by URL, in arrival order
+    sources: Dict[str, SourceResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+    deadline_hit: bool = False
+
+    def counts(self) -> Dict[str, int]:
+        return {name: len(result.hackathons) for name, result in self.sources.items()}
+
+
+class ScrapeEngine:
+    def __init__(self, max_concurrency: Optional[int] = None, deadline: Optional[float] = None):
+        # Fetches in flight at once, and seconds for the whole run
+        if max_concurrency is None:
+            max_concurrency = env("SCRAPE_MAX_CONCURRENCY", 8, int)
+        self.max_concurrency = max(1, max_concurrency)
+        self.deadline = env("SCRAPE_DEADLINE", 60.0, float) if deadline is None else deadline
+
+    async def run(self, jobs: Iterable[SourceJob],
+                  on_result: Optional[Callable[[SourceResult], None]] = None) -> ScrapeReport:
+        """Scrape every job concurrently; `on_result` is called as each source finishes."""
+        jobs = list(jobs)
+        report = ScrapeReport()
+        seen_urls = set()
+        start = time.perf_counter()
+        deadline_at = start + self.deadline
+
+        # A pool of our own bounds the threads; queued fetches of a source that
+        # already has its answer are cancelled before they start
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="scrape")
+        tasks = {asyncio.create_task(self._run_job(job, executor, deadline_at)): job for job in jobs}
+        try:
+            for finished in asyncio.as_completed(tasks, timeout=self.deadline):
+                result = await finished
+                report.sources[result.name] = result
+                for hackathon in result.hackathons:
+                    if hackathon.url not in seen_urls:
+                        seen_urls.add(hackathon.url)
+                        report.hackathons.append(hackathon)
+                if on_result:
+                    on_result(result)
+        except asyncio.TimeoutError:
+            report.deadline_hit = True
+            logger.warning(f"Scrape deadline of {self.deadline:.1f}s hit")
+            for task, job in tasks.items():
+                if job.name not in report.sources:
+                    task.cancel()
+                    report.sources[job.name] = SourceResult(job.name, elapsed=self.deadline, timed_out=True,
+                                                            error="global deadline")
+        finally:
+            # Do not wait for fetches still blocked in requests; they end at their own timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    async def _run_job(self, job: SourceJob, executor: ThreadPoolExecutor, deadline_at: float) -> SourceResult:
+        result = SourceResult(job.name)
+        start = time.perf_counter()
+        timeout = max(0.0, min(job.timeout, deadline_at - start))
+        try:
+            await asyncio.wait_for(self._first_hit(job, executor, timeout, result), timeout)
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            result.error = f"timed out after {timeout:.1f}s"
+            logger.warning(f"{job.name}: {result.error}")
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def _first_hit(self, job: SourceJob, executor: ThreadPoolExecutor, timeout: float,
+                         result: SourceResult) -> None:
+        loop = asyncio.get_running_loop()
+
+        async def fetch(url):
+            return url, await loop.run_in_executor(executor, job.fetch, url, timeout)
+
+        tasks = [asyncio.create_task(fetch(url)) for url in job.urls]
+        errors = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    url, hackathons = await finished
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                if hackathons:
+                    result.url, result.hackathons = url, hackathons
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if job.fallback and len(result.hackathons) < job.min_results:
+            try:
+                result.hackathons = result.hackathons + (await loop.run_in_executor(executor, job.fallback) or [])
+            except Exception as e:
+                errors.append(str(e))
+        if errors and not result.hackathons:
+            result.error = "; ".join(errors)
+
+
+def scrape_all(jobs: Iterable[SourceJob], max_concurrency: Optional[int] = None,
+               deadline: Optional[float] = None,
+               on_result: Optional[Callable[[SourceResult], None]] = None) -> ScrapeReport:
+    """Blocking entry point for synchronous callers."""
+    return asyncio.run(ScrapeEngine(max_concurrency, deadline).run(jobs, on_result))
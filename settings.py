@@ -0,0 +1,37 @@
+"""
+Deployment settings from the environment.
+
+Modules read their settings through env() when a Database, rate limiter,
+response cache or scrape engine is constructed, not when they are imported,
+and the first read loads .env. A value set in .env therefore applies however
+a script orders its imports, and also to one-off commands such as
+`python -c "from database import Database; ..."` that never call load_dotenv().
+"""
+
+import functools
+import os
+from typing import Callable, TypeVar
+
+from dotenv import load_dotenv
+
+T = TypeVar("T")
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load .env into the environment once; variables that are already set win."""
+    load_dotenv()
+
+
+def env(name: str, default: T, cast: Callable[[str], T] = str) -> T:
+    """Setting `name` converted with `cast`, or `default` when it is not set."""
+    load_env()
+    value = os.getenv(name)
+    return default if value is None else cast(value)
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Boolean setting `name` ("1", "true" or "yes" turn it on), or `default` when it is not set."""
+    return env(name, default, lambda value: value.strip().lower() in TRUE_VALUES)
@@ -34,7 +34,7 @@ async def post_all_unposted():
     # Display what we're about to post
     print("\nHackathons to post:")
     for i, hackathon in enumerate(unposted, 1):
-        print(f"{i}. {hackathon['title']}")
+        print(f"{i}. {hackathon.title}")
     
     # Post them using the telegram bot's method (it will get them from DB)
     try:
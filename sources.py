@@ -0,0 +1,579 @@
+"""
+Hackathon listing sources as plugins.
+
+Each site is a Source subclass registered by name. A source splits scraping
+into fetch (download a page, with requests or a headless browser), parse (pull
+raw listing records out of the HTML) and normalize (clean a record into a
+Hackathon or drop it). Most sources only declare their URLs and selectors.
+run_sources() turns any set of sources into jobs for the concurrent scrape
+engine, so every scraper gets the same scheduling, timeouts and deduplication.
+
+Given a validator store (the Database), requests-backed sources send
+If-None-Match / If-Modified-Since from the previous run. On 304 Not Modified
+they skip the download and the parse and return the result parsed last time.
+A session from make_session(cache) also answers from the on-disk response
+cache (http_cache.py) for each source's `cache_ttl`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Type, Union
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+from http_cache import CachedSession, ResponseCache
+from models import Hackathon, parse_date
+from scrape_engine import ScrapeEngine, ScrapeReport, SourceJob, SourceResult
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    SELENIUM_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+SESSION_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+HEADINGS = 'h1, h2, h3, h4, h5'
+
+# Hackathon fields kept in a cached parse result (ids belong to the database)
+RESULT_FIELDS = [f.name for f in fields(Hackathon) if f.name != 'id']
+
+
+def make_session(cache: Optional[ResponseCache] = None) -> requests.Session:
+    """A requests session with the browser-like headers every source expects, cached when given a cache."""
+    session = CachedSession(cache) if cache is not None else requests.Session()
+    session.headers.update(SESSION_HEADERS)
+    return session
+
+
+@dataclass
+class FetchStats:
+    """Conditional GET outcome of one run, shared by the sources built together."""
+    pages: int = 0
+    not_modified: int = 0  # answered 304, or served with the ETag the stored result was parsed from
+    cache_hits: int = 0  # answered from the response cache without a request
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0  # bodies not downloaded again, at their last full size
+    parse_seconds: float = 0.0
+    parse_seconds_avoided: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, **counts) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def summary(self) -> str:
+        return (f"{self.not_modified}/{self.pages} pages unchanged, {self.cache_hits} from cache, "
+                f"{self.bytes_saved / 1024:.0f} KiB not downloaded ({self.bytes_downloaded / 1024:.0f} KiB fetched), "
+                f"{self.parse_seconds_avoided * 1000:.0f} ms parsing avoided ({self.parse_seconds * 1000:.0f} ms spent)")
+
+
+class BrowserFetcher:
+    """Headless Chrome for pages that only render with JavaScript.
+
+    One driver is not thread-safe, so a browser-backed source must not be run
+    with other browser-backed sources on the concurrent engine.
+    """
+
+    def __init__(self):
+        self.driver = None
+
+    def start(self) -> bool:
+        if not SELENIUM_AVAILABLE:
+            logger.warning("Selenium is not installed")
+            return False
+        try:
+            chrome_options = Options()
+            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1280,720")
+            chrome_options.add_argument("--disable-logging")
+            chrome_options.add_argument("--log-level=3")
+            chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+            chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+
+            # Only actual containers get the restricted flags and preinstalled driver
+            is_container = (os.path.exists('/.dockerenv') or
+                            os.environ.get('RENDER') or
+                            os.environ.get('RAILWAY_ENVIRONMENT') or
+                            platform.system() == 'Linux' and os.path.exists('/app/chrome-data'))
+
+            if is_container:
+                for flag in ("--disable-software-rasterizer", "--disable-background-timer-throttling",
+                             "--disable-backgrounding-occluded-windows", "--disable-renderer-backgrounding",
+                             "--disable-features=TranslateUI", "--disable-extensions", "--disable-plugins",
+                             "--disable-images", "--memory-pressure-off", "--max_old_space_size=4096",
+                             "--single-process", "--user-data-dir=/app/chrome-data"):
+                    chrome_options.add_argument(flag)
+                if os.environ.get('CHROME_BIN'):
+                    chrome_options.binary_location = os.environ.get('CHROME_BIN')
+                service = Service(os.environ.get('CHROMEDRIVER_PATH')) if os.environ.get('CHROMEDRIVER_PATH') else Service()
+                logger.info("Docker/Container mode detected")
+            else:
+                service = Service(ChromeDriverManager().install())
+
+            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver.set_page_load_timeout(30)
+            return True
+        except Exception as e:
+            logger.warning(f"Selenium failed: {e}")
+            self.driver = None
+            return False
+
+    def page_source(self, url: str, wait: float) -> str:
+        self.driver.get(url)
+        time.sleep(wait)  # let the page's scripts render the listing
+        return self.driver.page_source
+
+    def close(self) -> None:
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+
+class Source:
+    """A hackathon listing site.
+
+    Subclasses set `name` (registry key), `label` (stored as Hackathon.source),
+    `base_url` and candidate `urls`, and describe the listing markup:
+    `card_selectors` are tried in order and the first that matches anything
+    wins (all are combined with `combine_selectors`); `title_selector`,
+    `date_selector` and `organization_selector` are looked up inside a card.
+    normalize() then applies the title, keyword and URL filters. Override
+    parse() or title_of() for markup that does not fit.
+    """
+    name = ""
+    label = ""
+    base_url = ""
+    urls: Sequence[str] = ()
+    timeout = 15.0
+    cache_ttl: Optional[float] = None  # seconds a cached response is reused; None = HTTP_CACHE_TTL
+    render_wait = 3.0  # seconds a browser waits for the page's scripts
+
+    card_selectors: Sequence[str] = ()
+    combine_selectors = False
+    title_selector: Optional[str] = HEADINGS
+    title_required = False  # without it, a card's whole text is its title
+    date_selector: Optional[str] = None
+    organization_selector: Optional[str] = None
+    organization = None  # default when the card names none
+    description = ""
+    date_placeholder = "Date TBD"
+
+    max_items = 10
+    min_results = 1  # fewer from the candidate URLs triggers fallback()
+    min_title, max_title = 6, 100
+    keywords: Sequence[str] = ()  # a title must contain one of these, when set
+    skip_terms: Sequence[str] = ()  # titles containing these are navigation, not listings
+    url_patterns: Sequence[str] = ()  # a listing URL must contain one of these, when set
+    url_excludes: Sequence[str] = ()
+    # Bump when an overridden parse()/title_of()/link_of() changes, so results
+    # cached for conditional GETs by the old code are not reused
+    parser_version = 1
+
+    def __init__(self, session: Optional[requests.Session] = None, browser: Optional[BrowserFetcher] = None,
+                 urls: Optional[Sequence[str]] = None, base_url: Optional[str] = None,
+                 validators=None, stats: Optional[FetchStats] = None):
+        self.session = session or make_session()
+        self.browser = browser
+        if urls is not None:
+            self.urls = list(urls)
+        if base_url is not None:
+            self.base_url = base_url
+        self.validators = validators  # Database (get/save_http_validator), or None for plain GETs
+        self.stats = stats or FetchStats()
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies this parser's configuration; a cached result must come from the same one."""
+        config = (type(self).__name__, self.parser_version, self.base_url, tuple(self.card_selectors),
+                  self.combine_selectors, self.title_selector, self.title_required, self.date_selector,
+                  self.organization_selector, self.organization, self.description, self.date_placeholder,
+                  self.max_items, self.min_title, self.max_title, tuple(self.keywords), tuple(self.skip_terms),
+                  tuple(self.url_patterns), tuple(self.url_excludes))
+        return hashlib.sha1(repr(config).encode()).hexdigest()[:16]
+
+    def get(self, url: str, timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """GET through the session, with this source's cache lifetime when the session caches."""
+        cache = {'cache_ttl': self.cache_ttl} if isinstance(self.session, CachedSession) else {}
+        return self.session.get(url, timeout=timeout or self.timeout, headers=headers, **cache)
+
+    def fetch(self, url: str, timeout: Optional[float] = None) -> Optional[str]:
+        """The page's HTML, or None if the site did not serve it."""
+        if self.browser and self.browser.driver:
+            return self.browser.page_source(url, self.render_wait)
+        response = self.get(url, timeout)
+        if response.status_code != 200:
+            logger.info(f"{self.label}: {url} returned {response.status_code}")
+            return None
+        return response.text
+
+    def parse(self, html: str, url: str) -> List[Dict[str, Optional[str]]]:
+        """Raw listing records (title, url, date, organization) found in a page."""
+        soup = BeautifulSoup(html, 'html.parser')
+        records = []
+        for selector in self.card_selectors:
+            found = [record for record in map(self.record_of, soup.select(selector))
+                     if record['title'] and record['url']]
+            if found:
+                logger.debug(f"{self.label}: {len(found)} cards with {selector}")
+                records.extend(found)
+                if not self.combine_selectors:
+                    break
+        return records
+
+    def record_of(self, card) -> Dict[str, Optional[str]]:
+        return {
+            'title': self.title_of(card),
+            'url': self.link_of(card),
+            'date': self.text_of(card, self.date_selector),
+            'organization': self.text_of(card, self.organization_selector),
+        }
+
+    def title_of(self, card) -> str:
+        if self.title_selector:
+            element = card.select_one(self.title_selector)
+            if element:
+                return element.get_text(" ", strip=True)
+            if self.title_required:
+                return ""
+        return card.get_text(" ", strip=True)
+
+    def link_of(self, card) -> str:
+        if card.name == 'a' and card.get('href'):
+            return card['href']
+        link = card.find('a', href=True)
+        return link['href'] if link else ""
+
+    @staticmethod
+    def text_of(card, selector: Optional[str]) -> Optional[str]:
+        if not selector:
+            return None
+        element = card.select_one(selector)
+        return element.get_text(" ", strip=True) if element else None
+
+    def normalize(self, record: Dict[str, Optional[str]]) -> Optional[Hackathon]:
+        """The record as a Hackathon, or None if it does not look like a listing."""
+        title = " ".join((record.get('title') or "").split())
+        if len(title) < self.min_title:
+            return None
+        title = title[:self.max_title]
+        lowered = title.lower()
+        if self.keywords and not any(keyword in lowered for keyword in self.keywords):
+            return None
+        if any(term in lowered for term in self.skip_terms):
+            return None
+
+        url = urljoin(self.base_url, (record.get('url') or "").strip())
+        if not url.startswith('http'):
+            return None
+        if self.url_patterns and not any(pattern in url for pattern in self.url_patterns):
+            return None
+        if any(pattern in url for pattern in self.url_excludes):
+            return None
+
+        date_info = record.get('date') or self.date_placeholder
+        return Hackathon(
+            title=title,
+            url=url,
+            date_info=date_info,
+            description=self.description,
+            source=self.label,
+            organization=record.get('organization') or self.organization,
+            deadline=parse_date(record.get('date')),
+        )
+
+    def scrape(self, url: str, timeout: Optional[float] = None) -> List[Hackathon]:
+        """fetch, parse and normalize one candidate URL (conditionally, given a validator store)."""
+        if self.validators is None or (self.browser and self.browser.driver):
+            return self.extract(self.fetch(url, timeout), url)
+
+        cached = self.validators.get_http_validator(url)
+        if cached and cached['parser'] != self.fingerprint:
+            cached = None
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.get(url, timeout, headers)
+        from_cache = getattr(response, 'from_cache', False)
+        downloaded = len(response.content) if response.status_code == 200 and not from_cache else 0
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        # A 304, or a body (possibly cached) with the ETag the stored result was parsed from
+        if cached and (response.status_code == 304 or (response.status_code == 200 and etag and etag == cached['etag'])):
+            self.stats.record(pages=1, not_modified=1, cache_hits=int(from_cache), bytes_downloaded=downloaded,
+                              bytes_saved=0 if downloaded else cached['body_bytes'],
+                              parse_seconds_avoided=cached['parse_seconds'])
+            return [Hackathon(**fields) for fields in json.loads(cached['result'] or "[]")]
+        if response.status_code != 200:
+            logger.info(f"{self.label}: {url} returned {response.status_code}")
+            return []
+
+        start = time.perf_counter()
+        hackathons = self.extract(response.text, url)
+        parse_seconds = time.perf_counter() - start
+        self.stats.record(pages=1, cache_hits=int(from_cache), parse_seconds=parse_seconds,
+                          bytes_downloaded=downloaded, bytes_saved=len(response.content) - downloaded)
+
+        if etag or last_modified:
+            result = json.dumps([{name: getattr(h, name) for name in RESULT_FIELDS} for h in hackathons])
+            self.validators.save_http_validator(url, etag, last_modified, self.fingerprint, result,
+                                                len(response.content), parse_seconds)
+        return hackathons
+
+    def extract(self, html: Optional[str], url: str) -> List[Hackathon]:
+        """parse and normalize a page: unique listings, at most `max_items`."""
+        if not html:
+            return []
+        hackathons = []
+        seen_urls = set()
+        for record in self.parse(html, url):
+            hackathon = self.normalize(record)
+            if hackathon and hackathon.url not in seen_urls:
+                seen_urls.add(hackathon.url)
+                hackathons.append(hackathon)
+                if len(hackathons) >= self.max_items:
+                    break
+        return hackathons
+
+    def fallback(self) -> List[Hackathon]:
+        """Extra hackathons when the candidate URLs found fewer than `min_results`."""
+        return []
+
+    def collect(self) -> List[Hackathon]:
+        """Serial scrape: candidate URLs in order until one has results, then fallback() if short."""
+        hackathons = []
+        for url in self.urls:
+            try:
+                hackathons = self.scrape(url)
+            except Exception as e:
+                logger.warning(f"{self.label}: {url} failed: {e}")
+                continue
+            if hackathons:
+                break
+        if len(hackathons) < self.min_results:
+            hackathons = hackathons + self.fallback()
+        return hackathons
+
+    def job(self) -> SourceJob:
+        """This source as a job for the concurrent scrape engine."""
+        has_fallback = type(self).fallback is not Source.fallback
+        return SourceJob(self.label, list(self.urls), self.scrape, timeout=self.timeout,
+                         fallback=self.fallback if has_fallback else None, min_results=self.min_results)
+
+
+SOURCES: Dict[str, Type[Source]] = {}
+
+
+def register_source(cls: Type[Source]) -> Type[Source]:
+    """Class decorator adding a Source to the registry under its name."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no name")
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def get_source(name: str) -> Type[Source]:
+    try:
+        return SOURCES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown source {name!r}; registered: {', '.join(sorted(SOURCES))}") from None
+
+
+def build_sources(names: Optional[Iterable[str]] = None, session: Optional[requests.Session] = None,
+                  browser: Optional[BrowserFetcher] = None, validators=None,
+                  stats: Optional[FetchStats] = None) -> List[Source]:
+    """Instances of the named sources (all registered ones by default) sharing one session and FetchStats."""
+    session = session or make_session()
+    stats = stats or FetchStats()
+    return [get_source(name)(session, browser, validators=validators, stats=stats) for name in (names or SOURCES)]
+
+
+async def run_sources(sources: Iterable[Union[str, Source]], max_concurrency: Optional[int] = None,
+                      deadline: Optional[float] = None,
+                      on_result: Optional[Callable[[SourceResult], None]] = None, validators=None) -> ScrapeReport:
+    """Scrape the sources (names or instances) concurrently through the scrape engine."""
+    session, stats = make_session(), FetchStats()
+    instances = [get_source(source)(session, validators=validators, stats=stats) if isinstance(source, str) else source
+                 for source in sources]
+    return await ScrapeEngine(max_concurrency, deadline).run((source.job() for source in instances), on_result)
+
+
+@register_source
+class DevPost(Source):
+    name = "devpost"
+    label = "DevPost"
+    base_url = "https://devpost.com"
+    urls = (
+        "https://devpost.com/hackathons",
+        "https://devpost.com/hackathons/open",
+        "https://devpost.com/hackathons/upcoming",
+    )
+    render_wait = 2.0
+    card_selectors = ('.hackathon-tile', '.challenge-tile', '.featured-hackathon', 'article.hackathon',
+                      '.hackathon-card', 'a[href*="/challenges/"]', '.software-entry')
+    title_selector = f'{HEADINGS}, [class*="title"], [class*="name"]'
+    date_selector = '[class*="date"], [class*="time"], [class*="deadline"]'
+    description = "Live from DevPost.com"
+    date_placeholder = "Check DevPost for dates"
+    max_items = 8
+    link_keywords = ('hack', 'challenge', 'innovation', '2024', '2025')
+
+    def parse(self, html, url):
+        records = super().parse(html, url)
+        if records:
+            return records
+        # No tiles (the page changed or needs JavaScript): any challenge or
+        # hackathon link whose text looks like a hackathon title
+        soup = BeautifulSoup(html, 'html.parser')
+        return [
+            {'title': link.get_text(" ", strip=True), 'url': link['href'], 'date': None, 'organization': None}
+            for link in soup.find_all('a', href=True)
+            if ('challenge' in link['href'] or 'hackathon' in link['href'].lower())
+            and any(word in link.get_text(strip=True).lower() for word in self.link_keywords)
+        ]
+
+
+@register_source
+class Devfolio(Source):
+    name = "devfolio"
+    label = "Devfolio"
+    base_url = "https://devfolio.co"
+    urls = (
+        "https://devfolio.co/hackathons",
+        "https://devfolio.co/discover",
+        "https://devfolio.co/events",
+    )
+    card_selectors = ('.hackathon-card', '.event-card', '.challenge-card', 'a[href*="/hackathons/"]',
+                      '.hackathon-tile', '[data-testid*="hackathon"]', "div[class*='hackathon']", 'article', '.card')
+    title_selector = f'{HEADINGS}, [class*="title"], [class*="name"]'
+    date_selector = '[class*="date"], [class*="time"], [class*="deadline"]'
+    description = "Live from Devfolio.co"
+    date_placeholder = "Check Devfolio for dates"
+    max_items = 8
+    min_title = 8
+    skip_terms = ('browse', 'explore', 'see all', 'view more')
+
+
+@register_source
+class Unstop(Source):
+    name = "unstop"
+    label = "Unstop"
+    base_url = "https://unstop.com"
+    urls = ("https://unstop.com/hackathons",)
+    timeout = 60.0  # covers the Selenium fallback, which needs a driver and a page load
+    render_wait = 4.0
+    card_selectors = ("div[class*='cursor-pointer']", "[role='button']", "div[class*='single_profile']",
+                      "div[class*='opp_']", "a[href*='/hackathons/']", '.competition-card', '.hackathon-card')
+    combine_selectors = True
+    description = "Live from Unstop.com"
+    date_placeholder = "Check Unstop for dates"
+    max_items = 12
+    min_results = 3
+    keywords = ('hack', 'tech', 'code', 'innovation', 'challenge', 'fest', 'competition', 'ai', 'ml',
+                '2024', '2025', '2026')
+    skip_terms = ('view all', 'see more', 'browse', 'filter', 'sort', 'engineering students', 'mba student',
+                  'upcoming', 'ongoing')
+    url_patterns = ('/hackathons/', '/competitions/')
+    url_excludes = ('/opportunity_',)  # these often return 404
+    # Card lines that are metadata rather than the title
+    meta_terms = ('registered', 'days left', 'engineering', 'mba', 'student', '₹', 'prize', 'participants')
+    title_words = ('hack', 'code', 'tech', 'innovation', 'challenge', 'fest', 'competition')
+
+    def title_of(self, card):
+        """The first line of the card's text that looks like a title."""
+        for line in (line.strip() for line in card.get_text("\n").split("\n")):
+            lowered = line.lower()
+            if not 5 < len(line) < 80 or any(term in lowered for term in self.meta_terms):
+                continue
+            if any(word in lowered for word in self.title_words) or (len(line) > 8 and any(c.isdigit() for c in line)):
+                return line
+        return ""
+
+    def link_of(self, card):
+        if card.name == 'a' and card.get('href'):
+            return card['href']
+        link = card.select_one("a[href*='/hackathons/'], a[href*='/competitions/']")
+        return link['href'] if link else ""
+
+    def fallback(self):
+        # Already rendering through a browser, or none available
+        if (self.browser and self.browser.driver) or not SELENIUM_AVAILABLE:
+            return []
+        browser = BrowserFetcher()
+        if not browser.start():
+            return []
+        try:
+            return Unstop(self.session, browser, self.urls, self.base_url).scrape(self.urls[0])
+        finally:
+            browser.close()
+
+
+@register_source
+class HackerEarth(Source):
+    name = "hackerearth"
+    label = "HackerEarth"
+    base_url = "https://www.hackerearth.com"
+    urls = ("https://www.hackerearth.com/challenges/",)
+    card_selectors = ('.challenge-card, .event-card, [class*="challenge"]',)
+    title_selector = 'h3, h2, .title, .challenge-title'
+    title_required = True
+    date_selector = '.date, .deadline, .ends-in'
+    organization = "HackerEarth"
+    max_items = 50
+    keywords = ('hackathon',)  # the page also lists hiring and coding challenges
+
+
+@register_source
+class MLH(Source):
+    name = "mlh"
+    label = "Major League Hacking"
+    base_url = "https://mlh.io"
+    urls = ("https://mlh.io/seasons/2025/events",)
+    card_selectors = ('.event, .hackathon, [class*="event"]',)
+    title_selector = 'h3, h2, .title, .name'
+    title_required = True
+    date_selector = '.date, .when, .time'
+    organization_selector = '.location, .where, .host'
+    organization = "MLH Member Event"
+    date_placeholder = "Check MLH for dates"
+    max_items = 50
+    cache_ttl = 3600.0  # one season page, changes a few times a week
+
+
+@register_source
+class HackathonEarth(Source):
+    name = "hackathon-earth"
+    label = "Hackathon.earth"
+    base_url = "https://hackathon.earth"
+    urls = ("https://hackathon.earth/",)
+    card_selectors = ('.hackathon-card, .event-card, .card, [class*="hack"]',)
+    title_selector = 'h3, h2, .title, .name'
+    title_required = True
+    date_selector = '.date, .deadline, .when'
+    organization_selector = '.org, .organizer, .host'
+    organization = "Various Organizations"
+    max_items = 50
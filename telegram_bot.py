@@ -1,111 +1,232 @@
 import asyncio
 import logging
+import os
+import socket
+import uuid
 from telegram import Bot
 from telegram.error import TelegramError, RetryAfter
-from typing import List, Dict, Optional
-import time
+from telegram.helpers import escape_markdown
+from telegram.request import HTTPXRequest
+from typing import List, Dict, Iterable, Optional, Tuple, Union
 from datetime import datetime
-from database import Database
+from database import Database, AsyncDatabase, utc_timestamp
+from models import Hackathon
+from rate_limiter import TelegramRateLimiter, shared_limiter
+from settings import env
+
+DIGEST_CLAIM_SIZE = 50  # rows leased per digest batch; they are split over as many messages as needed
+
+MESSAGE_LIMIT = 4096  # Telegram's limit on message text, in UTF-16 code units
+HASHTAGS = "#Hackathon #Competition #Tech #Coding"
+
+
+def format_hackathon_message(hackathon: Hackathon) -> str:
+    """Render a hackathon record into a Telegram (Markdown) message at post time."""
+    title = (hackathon.title or 'Hackathon').strip()
+    if len(title) > 100:
+        title = title[:97] + "..."
+    
+    message = f"🚀 *{title}*\n"
+    if hackathon.organization:
+        message += f"🏢 {hackathon.organization.strip()}\n"
+    message += "\n"
+    
+    # Structured dates when the scraper could parse them, the scraped text otherwise
+    if hackathon.starts_at and hackathon.ends_at:
+        message += f"📅 *Dates:* {hackathon.starts_at} → {hackathon.ends_at}\n"
+    elif hackathon.starts_at:
+        message += f"📅 *Starts:* {hackathon.starts_at}\n"
+    if hackathon.deadline:
+        message += f"⏰ *Deadline:* {hackathon.deadline}\n"
+    if not (hackathon.starts_at or hackathon.deadline) and (hackathon.date_info or '').strip():
+        message += f"📅 *Date:* {hackathon.date_info.strip()}\n"
+    if hackathon.prize:
+        message += f"🏆 *Prize:* {hackathon.prize.strip()}\n"
+    if not message.endswith("\n\n"):
+        message += "\n"
+    
+    description = (hackathon.description or '').strip()
+    if description:
+        if len(description) > 200:
+            description = description[:197] + "..."
+        message += f"📝 {description}\n\n"
+    
+    if hackathon.source:
+        message += f"📡 via {hackathon.source}\n"
+    message += f"🔗 [Register Here]({hackathon.url or ''})\n\n"
+    message += HASHTAGS
+    
+    return message
+
+
+def telegram_length(text: str) -> int:
+    """Length as Telegram counts it (UTF-16 code units, so most emoji count twice)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def format_digest_entry(hackathon: Hackathon) -> str:
+    """One hackathon as a short digest entry.
+    
+    Scraped text is escaped, so a stray `_` or `*` cannot open an entity that
+    runs on into the next entry and make Telegram reject the whole digest.
+    Inside the bold title other markers are literal, and only `*` (which would
+    end it early) is dropped.
+    """
+    title = (hackathon.title or 'Hackathon').strip()
+    if len(title) > 100:
+        title = title[:97] + "..."
+    
+    details = [
+        hackathon.organization,
+        f"⏰ {hackathon.deadline}" if hackathon.deadline else (hackathon.date_info or '').strip(),
+        f"🏆 {hackathon.prize}" if hackathon.prize else None,
+        f"via {hackathon.source}" if hackathon.source else None,
+    ]
+    entry = f"🚀 *{title.replace('*', '')}*\n"
+    details = " · ".join(escape_markdown(detail.strip()) for detail in details if detail and detail.strip())
+    if details:
+        entry += f"{details}\n"
+    entry += f"🔗 [Register Here]({hackathon.url or ''})"
+    return entry
+
+
+def format_digest(hackathons: List[Hackathon], limit: int = MESSAGE_LIMIT) -> Tuple[str, List[Hackathon]]:
+    """Pack as many hackathons as fit into one message under `limit`.
+    
+    Entries are only ever added whole, so no Markdown entity is split. Returns
+    the message and the hackathons it includes (always at least the first).
+    """
+    separator = "\n\n"
+    # Room for the header with a count of up to three digits and the hashtag footer
+    reserved = telegram_length(f"📬 *999 new hackathons*{separator}{separator}{HASHTAGS}")
+    
+    entries = []
+    included = []
+    used = reserved
+    for hackathon in hackathons:
+        entry = format_digest_entry(hackathon)
+        size = telegram_length(entry) + (telegram_length(separator) if entries else 0)
+        if entries and used + size > limit:
+            break
+        entries.append(entry)
+        included.append(hackathon)
+        used += size
+    
+    noun = "hackathon" if len(included) == 1 else "hackathons"
+    message = f"📬 *{len(included)} new {noun}*{separator}" + separator.join(entries) + f"{separator}{HASHTAGS}"
+    return message, included
+
+
+def parse_channel_ids(channels: Union[str, int, Iterable[Union[str, int]], None]) -> List[str]:
+    """Chat ids from a comma-separated string (e.g. TELEGRAM_CHANNEL_ID="@main,@ai_hackathons") or a list."""
+    if channels is None:
+        return []
+    if isinstance(channels, (str, int)):
+        channels = str(channels).split(",")
+    return list(dict.fromkeys(str(chat_id).strip() for chat_id in channels if str(chat_id).strip()))
 
 
 class TelegramBot:
-    """Telegram bot for posting hackathon updates to channels."""
-    
-    def __init__(self, token: str, channel_id: str, db: Database, rate_limit: int = 30):
-        self.bot = Bot(token=token)
-        self.channel_id = channel_id
-        self.db = db
-        self.rate_limit = rate_limit  # messages per minute
-        self.last_message_time = 0
-        self.message_count = 0
-        self.start_time = time.time()
-    
-    def format_hackathon_message(self, hackathon: Dict) -> str:
+    """Telegram bot for posting hackathon updates to channels.
+    
+    `channel_id` may name several chats, comma-separated. Every hackathon is
+    posted to each of them; the first is the primary one used for status
+    updates and the connection test.
+    """
+    
+    def __init__(self, token: str, channel_id: Union[str, int, Iterable[Union[str, int]]],
+                 db: Union[Database, AsyncDatabase], rate_limiter: Optional[TelegramRateLimiter] = None,
+                 base_url: Optional[str] = None):
+        self.channel_ids = parse_channel_ids(channel_id)
+        # One keep-alive connection per chat task; PTB's default pool holds a single connection
+        pool_size = env("TELEGRAM_POOL_SIZE", 8, int)
+        request = HTTPXRequest(connection_pool_size=max(pool_size, len(self.channel_ids)))
+        # Kept so close() can shut them down: Bot.shutdown() skips a Bot that was never initialize()d
+        self._requests = (request, HTTPXRequest())
+        self.bot = Bot(token=token, request=request, get_updates_request=self._requests[1],
+                       **({"base_url": base_url} if base_url else {}))
+        self.channel_id = self.channel_ids[0] if self.channel_ids else channel_id
+        self._channels_synced = False
+        # All database access from the coroutines goes through the async facade
+        self._owns_adb = not isinstance(db, AsyncDatabase)
+        self.adb = AsyncDatabase(db) if self._owns_adb else db
+        self.db = self.adb.db
+        # Global and per-chat send budgets, shared with every other bot in the process
+        self.rate_limiter = rate_limiter or shared_limiter()
+        self._pacing_loaded = set()
+        self._retry_afters: Dict[str, int] = {}  # per chat, since its learned rate was last saved
+        # Identifies this poster's outbox leases
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = self.db.claim_lease
+    
+    async def close(self) -> None:
+        """Close the HTTP clients of both Bot API request objects (and the database thread, if this bot started it)."""
+        await asyncio.gather(*(request.shutdown() for request in self._requests))
+        if self._owns_adb:
+            self.adb.close()
+    
+    def format_hackathon_message(self, hackathon: Hackathon) -> str:
         """Format hackathon data into a Telegram message."""
-        title = hackathon.get('title', 'Hackathon')
-        url = hackathon.get('url', '')
-        date_info = hackathon.get('date_info', '')
-        description = hackathon.get('description', '')
-        
-        # Clean up the title
-        title = title.strip()
-        if len(title) > 100:
-            title = title[:97] + "..."
-        
-        # Format the message
-        message = f"🚀 *{title}*\n\n"
-        
-        if date_info:
-            # Clean up date info
-            date_info = date_info.strip()
-            if date_info:
-                message += f"📅 *Date:* {date_info}\n\n"
-        
-        if description and len(description.strip()) > 0:
-            # Clean up description
-            description = description.strip()
-            if len(description) > 200:
-                description = description[:197] + "..."
-            message += f"📝 {description}\n\n"
-        
-        message += f"🔗 [Register Here]({url})\n\n"
-        message += "#Hackathon #Competition #Tech #Coding"
-        
-        return message
-    
-    def check_rate_limit(self) -> bool:
-        """Check if we're within rate limits."""
-        current_time = time.time()
-        
-        # Reset counter every minute
-        if current_time - self.start_time >= 60:
-            self.message_count = 0
-            self.start_time = current_time
-        
-        # Check if we've exceeded the rate limit
-        if self.message_count >= self.rate_limit:
-            return False
-        
-        return True
+        return format_hackathon_message(hackathon)
+    
+    async def load_pacing(self, chat_id: Optional[str] = None) -> None:
+        """Start from the send rate learned for a chat in earlier runs."""
+        chat_id = chat_id or self.channel_id
+        if chat_id in self._pacing_loaded:
+            return
+        self._pacing_loaded.add(chat_id)
+        rate = await self.adb.get_chat_rate(chat_id)
+        if rate is not None:
+            rate = self.rate_limiter.set_chat_rate(chat_id, rate)
+            logging.info(f"Resuming at {rate:.1f} messages/minute to {chat_id}")
     
-    def wait_for_rate_limit(self) -> None:
-        """Wait if rate limit is exceeded."""
-        if not self.check_rate_limit():
-            wait_time = 60 - (time.time() - self.start_time)
-            if wait_time > 0:
-                logging.info(f"Rate limit reached, waiting {wait_time:.1f} seconds...")
-                time.sleep(wait_time)
-                self.message_count = 0
-                self.start_time = time.time()
+    async def save_pacing(self, chat_id: Optional[str] = None) -> None:
+        """Persist a chat's current send rate for the next run."""
+        chat_id = chat_id or self.channel_id
+        rate = self.rate_limiter.chat_rate_per_minute(chat_id)
+        if await self.adb.save_chat_rate(chat_id, rate, self._retry_afters.get(chat_id, 0)):
+            self._retry_afters[chat_id] = 0
     
-    async def send_message(self, message: str, retries: int = 3) -> bool:
-        """Send a message to the Telegram channel with retry logic."""
+    async def send_message(self, message: str, retries: int = 3, chat_id: Optional[str] = None,
+                           max_wait: Optional[float] = None) -> bool:
+        """Send a message to a chat (the primary channel by default) with retry logic.
+        
+        Gives up instead of retrying when Telegram asks for a pause longer than
+        `max_wait` seconds (posters pass their lease, which would run out first).
+        """
+        chat_id = chat_id or self.channel_id
+        await self.load_pacing(chat_id)
         for attempt in range(retries):
             try:
-                # Check rate limits
-                self.wait_for_rate_limit()
+                await self.rate_limiter.acquire(chat_id)
                 
                 # Send the message
                 await self.bot.send_message(
-                    chat_id=self.channel_id,
+                    chat_id=chat_id,
                     text=message,
                     parse_mode='Markdown',
                     disable_web_page_preview=False
                 )
                 
-                self.message_count += 1
-                self.last_message_time = time.time()
-                
-                logging.info("Message sent successfully")
+                self.rate_limiter.on_success(chat_id)
+                logging.info(f"Message sent successfully to {chat_id}")
                 return True
                 
             except RetryAfter as e:
-                wait_time = e.retry_after + 1
-                logging.warning(f"Rate limited by Telegram, waiting {wait_time} seconds...")
-                await asyncio.sleep(wait_time)
+                # The next acquire() waits out retry_after, then sends at the reduced rate
+                rate = self.rate_limiter.on_retry_after(chat_id, e.retry_after + 1)
+                self._retry_afters[chat_id] = self._retry_afters.get(chat_id, 0) + 1
+                logging.warning(
+                    f"Rate limited by Telegram for {e.retry_after}s in {chat_id}, "
+                    f"slowing to {rate:.1f} messages/minute"
+                )
+                await self.save_pacing(chat_id)
+                if max_wait is not None and e.retry_after + 1 > max_wait:
+                    logging.warning(f"Not waiting {e.retry_after}s in {chat_id}: longer than the {max_wait:.0f}s lease")
+                    return False
                 
             except TelegramError as e:
-                logging.error(f"Telegram error (attempt {attempt + 1}): {e}")
+                logging.error(f"Telegram error in {chat_id} (attempt {attempt + 1}): {e}")
                 if attempt == retries - 1:
                     return False
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
@@ -140,61 +261,232 @@ class TelegramBot:
             logging.error(f"Bot connection test failed: {e}")
             return False
     
-    async def post_hackathons(self, max_posts: int = 5) -> Dict:
-        """Post unposted hackathons to the channel."""
+    async def post_hackathons(self, max_posts: int = 5, flush_every: int = 10, digest: Optional[bool] = None,
+                              digest_threshold: Optional[int] = None,
+                              hackathon_ids: Optional[Iterable[int]] = None) -> Dict:
+        """Post unposted hackathons to every configured chat, up to `max_posts` per chat.
+        
+        Each chat drains its own outbox rows in its own task, so a slow or
+        failing chat does not hold up the others. Rows are leased in batches of
+        `flush_every`, so several poster processes can run at once without
+        sending the same hackathon to a chat twice. Each batch is completed or
+        released in one transaction after it is sent. The leases still held are
+        renewed before every send, and a chat whose next send is further away
+        than a lease (a long RetryAfter) gives its rows back and stops. A
+        worker that dies mid-batch loses its lease and the rows go back to the
+        queue once it expires. A hackathon counts as posted once every chat has it.
+        
+        With `digest` True, hackathons are packed into as few messages as fit
+        (see format_digest); left as None, a chat gets digests when more than
+        `digest_threshold` (TELEGRAM_DIGEST_THRESHOLD) of its rows are pending.
+        
+        Given `hackathon_ids`, only those hackathons are posted (oldest first,
+        still up to `max_posts` per chat); other queued rows are left alone.
+        """
         logging.info("Starting to post hackathons...")
+        if digest_threshold is None:
+            digest_threshold = env("TELEGRAM_DIGEST_THRESHOLD", 10, int)
         
-        unposted_hackathons = self.db.get_unposted_hackathons()
+        if not self._channels_synced:
+            await self.adb.sync_channels(self.channel_ids)
+            self._channels_synced = True
         
-        if not unposted_hackathons:
-            logging.info("No new hackathons to post")
-            return {"posted": 0, "failed": 0, "total": 0}
+        if hackathon_ids is not None:
+            hackathon_ids = list(hackathon_ids)
         
-        posted_count = 0
-        failed_count = 0
-        total_count = min(len(unposted_hackathons), max_posts)
+        if digest is None and hackathon_ids is not None:
+            modes = {chat_id: len(hackathon_ids) > digest_threshold for chat_id in self.channel_ids}
+        elif digest is None:
+            pending = await self.adb.get_outbox_stats(by_chat=True)
+            modes = {chat_id: pending.get(chat_id, {}).get('pending', 0) > digest_threshold
+                     for chat_id in self.channel_ids}
+        else:
+            modes = {chat_id: digest for chat_id in self.channel_ids}
         
-        for i, hackathon in enumerate(unposted_hackathons[:max_posts]):
-            try:
-                logging.info(f"Posting hackathon {i+1}/{total_count}: {hackathon['title']}")
-                
-                message = self.format_hackathon_message(hackathon)
-                success = await self.send_message(message)
-                
-                if success:
-                    self.db.mark_as_posted(hackathon['id'])
-                    posted_count += 1
-                    logging.info(f"Successfully posted: {hackathon['title']}")
-                    
-                    # Add delay between posts to be respectful
-                    if i < total_count - 1:  # Don't wait after the last post
-                        await asyncio.sleep(2)
-                else:
-                    failed_count += 1
-                    logging.error(f"Failed to post: {hackathon['title']}")
-                
-            except Exception as e:
-                failed_count += 1
-                logging.error(f"Error posting hackathon {hackathon['title']}: {e}")
+        outcomes = await asyncio.gather(
+            *(self._post_digests(chat_id, max_posts, hackathon_ids) if modes[chat_id]
+              else self._post_to_chat(chat_id, max_posts, flush_every, hackathon_ids)
+              for chat_id in self.channel_ids),
+            return_exceptions=True
+        )
+        by_chat = {}
+        for chat_id, outcome in zip(self.channel_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logging.error(f"Posting to {chat_id} stopped: {outcome}")
+                outcome = {"posted": 0, "failed": 0, "total": 0, "messages": 0, "error": str(outcome)}
+            by_chat[chat_id] = outcome
+        
+        posted_count = sum(outcome["posted"] for outcome in by_chat.values())
+        failed_count = sum(outcome["failed"] for outcome in by_chat.values())
+        total_count = sum(outcome["total"] for outcome in by_chat.values())
+        
+        if total_count == 0:
+            logging.info("No new hackathons to post")
+            return {"posted": 0, "failed": 0, "total": 0, "by_chat": by_chat}
         
         result = {
             "posted": posted_count,
             "failed": failed_count,
-            "total": total_count
+            "total": total_count,
+            "by_chat": by_chat
         }
         
         logging.info(f"Posting completed: {posted_count} posted, {failed_count} failed, {total_count} total")
         return result
     
+    async def _renew_leases(self, chat_id: str, hackathons: List[Hackathon]) -> Optional[set]:
+        """Renew this poster's leases on a claimed batch before a send; return the ids still held.
+        
+        Returns None without renewing when the chat's next send slot is a lease
+        or more away, since the rows would be claimable again before it.
+        """
+        if self.rate_limiter.delay(chat_id) >= self.lease_seconds:
+            return None
+        return set(await self.adb.extend_claims([hackathon.id for hackathon in hackathons], self.worker_id,
+                                                self.lease_seconds, chat_id=chat_id))
+    
+    async def _post_to_chat(self, chat_id: str, max_posts: int, flush_every: int,
+                            hackathon_ids: Optional[List[int]] = None) -> Dict:
+        """Drain up to `max_posts` of one chat's outbox rows."""
+        posted_count = 0
+        failed_count = 0
+        total_count = 0
+        messages = 0
+        stalled = False
+        
+        while total_count < max_posts and not stalled:
+            # Only lease the rows this run will actually send
+            batch = await self.adb.claim_batch(min(flush_every, max_posts - total_count), self.worker_id,
+                                               self.lease_seconds, chat_id=chat_id, hackathon_ids=hackathon_ids)
+            if not batch:
+                break
+            
+            sent = []
+            failed = []
+            unsent = []
+            try:
+                for index, hackathon in enumerate(batch):
+                    # Sent rows are completed with the batch, so their leases are renewed too
+                    held = await self._renew_leases(chat_id, batch)
+                    if held is None:
+                        logging.warning(f"Next send to {chat_id} is past the lease; returning {len(batch) - index} rows")
+                        unsent = batch[index:]
+                        stalled = True
+                        break
+                    if hackathon.id not in held:
+                        logging.warning(f"Lease on {hackathon.title} in {chat_id} ran out; leaving it to its new holder")
+                        continue
+                    total_count += 1
+                    try:
+                        logging.info(f"Posting hackathon {total_count}/{max_posts} to {chat_id}: {hackathon.title}")
+                        
+                        message = self.format_hackathon_message(hackathon)
+                        messages += 1
+                        success = await self.send_message(message, chat_id=chat_id, max_wait=self.lease_seconds)
+                        
+                        if success:
+                            sent.append((hackathon.id, utc_timestamp()))
+                            posted_count += 1
+                            logging.info(f"Successfully posted to {chat_id}: {hackathon.title}")
+                        else:
+                            failed.append(hackathon.id)
+                            failed_count += 1
+                            logging.error(f"Failed to post to {chat_id}: {hackathon.title}")
+                        
+                    except Exception as e:
+                        failed.append(hackathon.id)
+                        failed_count += 1
+                        logging.error(f"Error posting hackathon {hackathon.title} to {chat_id}: {e}")
+            finally:
+                if sent:
+                    await self.adb.complete_claims(sent, self.worker_id, chat_id=chat_id)
+                if failed:
+                    await self.adb.fail_claims(failed, self.worker_id, "send failed", chat_id=chat_id)
+                if unsent:
+                    await self.adb.fail_claims([hackathon.id for hackathon in unsent], self.worker_id,
+                                               "paused past the lease", chat_id=chat_id)
+        
+        if posted_count:
+            await self.save_pacing(chat_id)
+        
+        return {"posted": posted_count, "failed": failed_count, "total": total_count, "messages": messages}
+    
+    async def _post_digests(self, chat_id: str, max_posts: int, hackathon_ids: Optional[List[int]] = None) -> Dict:
+        """Drain up to `max_posts` of one chat's outbox rows packed into digest messages.
+        
+        The rows of each digest are completed together in one transaction once
+        Telegram accepts it, or released together if it fails.
+        """
+        posted_count = 0
+        failed_count = 0
+        total_count = 0
+        messages = 0
+        stalled = False
+        
+        while total_count < max_posts:
+            batch = await self.adb.claim_batch(min(DIGEST_CLAIM_SIZE, max_posts - total_count), self.worker_id,
+                                               self.lease_seconds, chat_id=chat_id, hackathon_ids=hackathon_ids)
+            if not batch:
+                break
+            
+            remaining = batch
+            try:
+                while remaining:
+                    held = await self._renew_leases(chat_id, remaining)
+                    if held is None:
+                        logging.warning(f"Next send to {chat_id} is past the lease; returning {len(remaining)} rows")
+                        stalled = True
+                        break
+                    remaining = [hackathon for hackathon in remaining if hackathon.id in held]
+                    if not remaining:
+                        break
+                    message, included = format_digest(remaining)
+                    ids = [hackathon.id for hackathon in included]
+                    total_count += len(included)
+                    messages += 1
+                    logging.info(f"Posting a digest of {len(included)} hackathons to {chat_id}")
+                    
+                    try:
+                        success = await self.send_message(message, chat_id=chat_id, max_wait=self.lease_seconds)
+                    except Exception as e:
+                        logging.error(f"Error posting digest to {chat_id}: {e}")
+                        success = False
+                    
+                    # Drop the digest's rows first, so the finally block never releases them a second time
+                    remaining = remaining[len(included):]
+                    if success:
+                        posted_at = utc_timestamp()
+                        await self.adb.complete_claims([(hackathon_id, posted_at) for hackathon_id in ids],
+                                                       self.worker_id, chat_id=chat_id)
+                        posted_count += len(included)
+                    else:
+                        await self.adb.fail_claims(ids, self.worker_id, "digest send failed", chat_id=chat_id)
+                        failed_count += len(included)
+                        break
+            finally:
+                if remaining:
+                    await self.adb.fail_claims([hackathon.id for hackathon in remaining], self.worker_id,
+                                               "digest not sent", chat_id=chat_id)
+            if failed_count or stalled:
+                # send_message already retried; released rows would only be claimed again right away
+                break
+        
+        if posted_count:
+            await self.save_pacing(chat_id)
+        
+        return {"posted": posted_count, "failed": failed_count, "total": total_count, "messages": messages,
+                "digest": True}
+    
     async def send_status_update(self) -> bool:
         """Send a status update with bot statistics."""
         try:
-            stats = self.db.get_stats()
+            stats = await self.adb.get_stats()
             
             message = f"📊 *Hackathon Bot Status Update*\n\n"
             message += f"📈 *Total Hackathons:* {stats.get('total_hackathons', 0)}\n"
             message += f"✅ *Posted:* {stats.get('posted_hackathons', 0)}\n"
-            message += f"⏳ *Pending:* {stats.get('pending_hackathons', 0)}\n\n"
+            message += f"⏳ *Pending:* {stats.get('pending_hackathons', 0)}\n"
+            message += f"⚡ *Send rate:* {self.rate_limiter.chat_rate_per_minute(self.channel_id):.1f}/min\n\n"
             
             if stats.get('recent_sessions'):
                 message += f"🕐 *Recent Activity:*\n"